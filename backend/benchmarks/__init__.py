@@ -0,0 +1,2 @@
+# Benchmarks package
+# Run from backend/: python -m benchmarks.<name>
@@ -0,0 +1,46 @@
+"""
+Benchmark: downsampled chart payloads vs the raw series for 1y and 5y windows
+Synthetic daily bars, no network needed
+"""
+
+import time
+import numpy as np
+from services.downsample import lttb, ohlc_buckets
+from services.stock_data_service import StockDataService
+from routers.market import series_payload, measure_json
+
+WINDOWS = {"1y": 250, "5y": 1250}
+POINTS = 300
+
+def synthetic_window(n):
+    close = 1000 * np.cumprod(1 + np.random.normal(0, 0.01, n))
+    return {
+        'date': (np.arange(n) + 19000).astype('datetime64[D]'),
+        'open': close * 0.995, 'high': close * 1.01, 'low': close * 0.99,
+        'close': close, 'volume': np.random.randint(1e6, 1e7, n).astype(np.float64)
+    }
+
+def main():
+    service = StockDataService()
+    print(f"{'window':<8}{'series':<8}{'points':>8}{'bytes':>10}{'serialize':>12}{'downsample':>12}")
+    for label, n in WINDOWS.items():
+        window = synthetic_window(n)
+
+        raw_bytes, raw_ms = measure_json(service.arrays_to_records(window))
+        print(f"{label:<8}{'raw':<8}{n:>8}{raw_bytes:>10}{raw_ms:>10.3f}ms{'-':>12}")
+
+        t0 = time.perf_counter()
+        candles = series_payload(ohlc_buckets(window, POINTS), ('open', 'high', 'low', 'close', 'volume'))
+        ohlc_ms = (time.perf_counter() - t0) * 1e3
+        size, ms = measure_json(candles)
+        print(f"{label:<8}{'ohlc':<8}{len(candles['dates']):>8}{size:>10}{ms:>10.3f}ms{ohlc_ms:>10.3f}ms")
+
+        t0 = time.perf_counter()
+        keep = lttb(window['date'].astype(np.int64), window['close'], POINTS)
+        line = series_payload({k: v[keep] for k, v in window.items()}, ('close', 'volume'))
+        lttb_ms = (time.perf_counter() - t0) * 1e3
+        size, ms = measure_json(line)
+        print(f"{label:<8}{'lttb':<8}{len(line['dates']):>8}{size:>10}{ms:>10.3f}ms{lttb_ms:>10.3f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Microbenchmark: stock mention detection in chat messages
+Per-ticker regex scan (previous approach) vs the prebuilt Aho-Corasick matcher
+"""
+
+import re
+import time
+from services.stock_validator import stock_validator
+from services.entity_matcher import StockMatcher
+
+MESSAGES = [
+    "Analyze RELIANCE for me",
+    "compare TCS, infy and Wipro over the last week",
+    "what do you think about Tata Consultancy Services and Infosys?",
+    "how is the score calculated?",
+    "show me the top bullish stocks today",
+    "is HDFC Bank a better buy than ICICI Bank right now, given the market trend and recent news flow?",
+    "news summary for sbi please",
+] * 50
+
+def legacy_detect(message: str):
+    """First ticker found by compiling a boundary regex per ticker (stops at one match)"""
+    message_upper = message.upper()
+    for ticker in stock_validator.stocks.keys():
+        if re.search(r'\b' + re.escape(ticker) + r'\b', message_upper):
+            return ticker
+    return None
+
+def bench(label: str, fn):
+    start = time.perf_counter()
+    for message in MESSAGES:
+        fn(message)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36}{len(MESSAGES) / elapsed:>12,.0f} msg/s{elapsed / len(MESSAGES) * 1e6:>10.1f} us/msg")
+
+def main():
+    start = time.perf_counter()
+    matcher = StockMatcher(stock_validator.stocks)
+    print(f"{matcher.patterns} patterns, automaton built in {(time.perf_counter() - start) * 1e3:.1f} ms\n")
+
+    bench("per-ticker regex (first match)", legacy_detect)
+    bench("aho-corasick (all mentions)", matcher.find_tickers)
+
+if __name__ == "__main__":
+    main()
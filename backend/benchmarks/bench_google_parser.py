@@ -0,0 +1,57 @@
+"""
+Benchmark: Google Finance page parse time, single-pass extractor vs the previous per-field regexes
+Uses the saved fixture pages padded with inline-script noise. The legacy
+52.*?week.*?range scan is quadratic in page size, so the padding is kept modest.
+"""
+
+import re
+import time
+from pathlib import Path
+from services.google_finance_parser import extract_quote_fields
+
+FIXTURES = Path(__file__).parent / "fixtures"
+PAGE_PADDING = 50_000
+REPEAT = 3
+
+def legacy_extract(html: str) -> dict:
+    """The eight independent scans the scraper used to run"""
+    fields = {}
+    for name, pattern, flags in [
+        ('price', r'<div[^>]*class="YMlKec fxKbKc"[^>]*>[^\d]*([\d,]+\.?\d*)</div>', 0),
+        ('company_name', r'<div[^>]*class="zzDege"[^>]*>([^<]+)</div>', 0),
+        ('previous_close', r'Previous close</div><div[^>]*>([^<]+)</div>', 0),
+        ('day_range', r'Day range</div><div[^>]*>([^<]+)</div>', 0),
+        ('week_52_range', r'52.*?week.*?range</div><div[^>]*>([^<]+)</div>', re.IGNORECASE),
+        ('market_cap', r'Market cap</div><div[^>]*>([^<]+)</div>', 0),
+        ('pe_ratio', r'P/E ratio</div><div[^>]*>([^<]+)</div>', 0),
+        ('volume', r'Volume</div><div[^>]*>([^<]+)</div>', 0),
+    ]:
+        match = re.search(pattern, html, flags)
+        if match:
+            fields[name] = match.group(1)
+    return fields
+
+def main():
+    # Inline script payload; "52" appears everywhere, "week" occasionally
+    noise = '<script>var data=[' + ','.join(
+        '"52-week"' if i % 500 == 0 else f'"{i:06d}"' for i in range(PAGE_PADDING // 9)
+    ) + '];</script>'
+    print(f"{'fixture':<32}{'size':>10}{'legacy':>12}{'single-pass':>14}{'fields':>8}")
+    for path in sorted(FIXTURES.glob("google_finance_*.html")):
+        raw = path.read_text(encoding="utf-8")
+        html = raw.replace("</head>", noise + "</head>", 1)
+
+        t0 = time.perf_counter()
+        for _ in range(REPEAT):
+            legacy_extract(html)
+        legacy = (time.perf_counter() - t0) / REPEAT
+
+        t0 = time.perf_counter()
+        for _ in range(REPEAT):
+            fields = extract_quote_fields(html)
+        single = (time.perf_counter() - t0) / REPEAT
+
+        print(f"{path.name:<32}{len(html) // 1024:>8}KB{legacy * 1e3:>10.2f}ms{single * 1e3:>12.2f}ms{len(fields):>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark: indicator engine over the full stock universe
+Synthetic 1-year OHLCV per ticker, no network needed
+"""
+
+import time
+import numpy as np
+from services.stock_validator import stock_validator
+from services.indicators import IndicatorEngine, compute_matrix, stack_series
+
+SESSIONS = 250
+
+def synthetic_window(rng, n):
+    close = 1000 * np.cumprod(1 + rng.normal(0, 0.01, n))
+    return {
+        'date': (np.arange(n) + 19000).astype('datetime64[D]'),
+        'open': close * 0.995, 'high': close * 1.01, 'low': close * 0.99,
+        'close': close, 'volume': rng.integers(1e6, 1e7, n).astype(np.float64)
+    }
+
+def main():
+    rng = np.random.default_rng(42)
+    tickers = list(stock_validator.stocks.keys())
+    full = {t: synthetic_window(rng, SESSIONS + 1) for t in tickers}
+    history = {t: {k: v[:-1] for k, v in w.items()} for t, w in full.items()}
+    # Next day's request for the same period: the window rolls forward one session
+    rolled = {t: {k: v[1:] for k, v in w.items()} for t, w in full.items()}
+    print(f"{len(tickers)} tickers x {SESSIONS} sessions\n")
+
+    t0 = time.perf_counter()
+    compute_matrix(stack_series(list(history.values())))
+    print(f"full series, all indicators      {(time.perf_counter() - t0) * 1e3:>8.1f} ms")
+
+    engine = IndicatorEngine()
+    t0 = time.perf_counter()
+    engine.latest_many(history, "1y")
+    print(f"latest values (cold engine)      {(time.perf_counter() - t0) * 1e3:>8.1f} ms")
+
+    t0 = time.perf_counter()
+    engine.latest_many(history, "1y")
+    print(f"latest values (no new bars)      {(time.perf_counter() - t0) * 1e3:>8.1f} ms")
+
+    t0 = time.perf_counter()
+    engine.latest_many(rolled, "1y")
+    print(f"latest values (window rolled 1d) {(time.perf_counter() - t0) * 1e3:>8.1f} ms")
+
+if __name__ == "__main__":
+    main()
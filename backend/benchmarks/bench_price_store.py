@@ -0,0 +1,85 @@
+"""
+Benchmark: local price store reads (cold vs warm) for 1 month, 1 year and 5 years
+Compares against the previous DataFrame.iterrows() conversion path
+Uses synthetic data in a temporary directory, no network needed
+"""
+
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from services.price_store import PriceStore, to_day
+
+WINDOWS = {"1mo": 31, "1y": 366, "5y": 1827}
+REPEAT = 200
+
+def synthetic_columns(days: int) -> np.ndarray:
+    end = date.today()
+    all_days = np.arange(to_day(end - timedelta(days=days)), to_day(end) + 1)
+    sessions = all_days[(all_days + 3) % 7 < 5]  # Mon-Fri
+    close = 1000 * np.cumprod(1 + np.random.normal(0, 0.01, len(sessions)))
+    return np.vstack([sessions, close * 0.99, close * 1.01, close * 0.98, close,
+                      np.random.randint(1e6, 1e7, len(sessions))]).astype(np.float64)
+
+def iterrows_records(frame: pd.DataFrame):
+    return [{
+        'date': d.strftime('%Y-%m-%d'),
+        'open': round(row['Open'], 2),
+        'high': round(row['High'], 2),
+        'low': round(row['Low'], 2),
+        'close': round(row['Close'], 2),
+        'volume': int(row['Volume'])
+    } for d, row in frame.iterrows()]
+
+def store_records(window):
+    return list(zip(
+        np.datetime_as_string(window['date']).tolist(),
+        np.round(window['open'], 2).tolist(),
+        np.round(window['high'], 2).tolist(),
+        np.round(window['low'], 2).tolist(),
+        np.round(window['close'], 2).tolist(),
+        window['volume'].astype(np.int64).tolist()
+    ))
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        columns = synthetic_columns(WINDOWS["5y"])
+        PriceStore(root).append("BENCH", columns)
+
+        print(f"{'window':<8}{'rows':>8}{'cold read':>14}{'warm read':>14}{'warm+records':>16}{'iterrows':>14}")
+        for label, days in WINDOWS.items():
+            start = date.today() - timedelta(days=days)
+
+            # Cold: fresh store, file not yet mapped
+            t0 = time.perf_counter()
+            window = PriceStore(root).read("BENCH", start)
+            cold = time.perf_counter() - t0
+
+            store = PriceStore(root)
+            store.read("BENCH", start)
+            t0 = time.perf_counter()
+            for _ in range(REPEAT):
+                window = store.read("BENCH", start)
+            warm = (time.perf_counter() - t0) / REPEAT
+
+            t0 = time.perf_counter()
+            for _ in range(REPEAT):
+                store_records(store.read("BENCH", start))
+            warm_records = (time.perf_counter() - t0) / REPEAT
+
+            frame = pd.DataFrame({
+                'Open': window['open'], 'High': window['high'], 'Low': window['low'],
+                'Close': window['close'], 'Volume': window['volume']
+            }, index=pd.DatetimeIndex(window['date']))
+            t0 = time.perf_counter()
+            iterrows_records(frame)
+            legacy = time.perf_counter() - t0
+
+            print(f"{label:<8}{len(window['date']):>8}{cold * 1e3:>12.3f}ms{warm * 1e3:>12.3f}ms"
+                  f"{warm_records * 1e3:>14.3f}ms{legacy * 1e3:>12.3f}ms")
+
+if __name__ == "__main__":
+    main()
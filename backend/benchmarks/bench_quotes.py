@@ -0,0 +1,34 @@
+"""
+Benchmark: sequential vs batch quote/history fetch for the Nifty 50
+Hits Yahoo Finance, so results depend on network latency
+"""
+
+import time
+from services.stock_validator import stock_validator
+from services.stock_data_service import StockDataService
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1000:>10.1f} ms")
+    return result
+
+def main():
+    tickers = stock_validator.get_index_constituents("NIFTY50")
+    print(f"Benchmarking {len(tickers)} tickers\n")
+
+    # Fresh services so the quote cache doesn't skew results
+    timed("single get_stock_info", lambda: StockDataService().get_stock_info(tickers[0]))
+    timed("sequential get_stock_info", lambda: [StockDataService().get_stock_info(t) for t in tickers[:10]])
+    timed("get_stock_info_many (cold)", lambda: StockDataService().get_stock_info_many(tickers))
+
+    service = StockDataService()
+    service.get_stock_info_many(tickers)
+    timed("get_stock_info_many (warm)", lambda: service.get_stock_info_many(tickers))
+
+    timed("single get_historical_data", lambda: StockDataService().get_historical_data(tickers[0]))
+    timed("get_historical_data_many", lambda: StockDataService().get_historical_data_many(tickers))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Microbenchmark: /api/search autocomplete
+Linear substring scan (previous approach) vs the prebuilt ranked search index,
+over the listed universe padded with synthetic symbols to full NSE+BSE size,
+plus the typo-tolerant fallback on misspelled queries.
+"""
+
+import random
+import time
+from services.stock_validator import stock_validator, INDEX_CONSTITUENTS
+from services.search_index import StockSearchIndex
+
+UNIVERSE_SIZE = 6000
+QUERIES = ["R", "RE", "REL", "RELI", "TATA", "TATA M", "HDFC", "HDFC BA", "BANK", "INFY",
+           "ADANI", "POWER", "PHARMA", "LTD", "M&M", "IND", "S", "SUN", "TECH", "AUTO"]
+TYPO_QUERIES = ["relaince", "infosis", "hdfc bnk", "tata motrs", "wipor", "icici bnak",
+                "bajaj finanse", "asian pants", "marti suzuki", "kotak mahindar", "relience industris"]
+
+def synthetic_universe(size: int) -> dict:
+    """Listed stocks plus made-up symbols built from real name words"""
+    stocks = dict(stock_validator.stocks)
+    rnd = random.Random(7)
+    words = sorted({w for name in stocks.values() for w in name.split()})
+    while len(stocks) < size:
+        name = " ".join(rnd.sample(words, rnd.randint(1, 3))) + rnd.choice([" Ltd", " Industries", ""])
+        ticker = "".join(w[:3] for w in name.upper().split())[:10] + str(rnd.randint(0, 99))
+        stocks[ticker] = name
+    return stocks
+
+def legacy_search(stocks: dict, query: str, limit: int = 10):
+    query = query.upper()
+    results = []
+    for ticker, name in stocks.items():
+        if query in ticker or query in name.upper():
+            results.append({"ticker": ticker, "company_name": name})
+            if len(results) >= limit:
+                break
+    return results
+
+def bench(label: str, fn, queries=QUERIES, rounds: int = 200):
+    samples = []
+    for _ in range(rounds):
+        for query in queries:
+            start = time.perf_counter()
+            fn(query)
+            samples.append(time.perf_counter() - start)
+    samples.sort()
+    p50 = samples[len(samples) // 2] * 1e6
+    p99 = samples[int(len(samples) * 0.99)] * 1e6
+    print(f"{label:<28}p50 {p50:>8.1f} us   p99 {p99:>8.1f} us   max {samples[-1] * 1e6:>8.1f} us")
+
+def main():
+    stocks = synthetic_universe(UNIVERSE_SIZE)
+    popularity = {t: 1.0 for members in INDEX_CONSTITUENTS.values() for t in members}
+    start = time.perf_counter()
+    index = StockSearchIndex(stocks, popularity)
+    print(f"{len(stocks)} symbols, index built in {(time.perf_counter() - start) * 1e3:.1f} ms\n")
+
+    bench("linear substring scan", lambda q: legacy_search(stocks, q))
+    bench("ranked search index", lambda q: index.search(q))
+    bench("typos: linear scan", lambda q: legacy_search(stocks, q), TYPO_QUERIES, 50)
+    bench("typos: index + fuzzy", lambda q: index.search(q), TYPO_QUERIES, 50)
+
+    print()
+    for query in ("REL", "HDFC BA", "BANK", "relaince", "hdfc bnk"):
+        print(f"{query!r:<10}", [r['ticker'] for r in index.search(query, 5)])
+
+if __name__ == "__main__":
+    main()
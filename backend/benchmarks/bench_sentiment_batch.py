@@ -0,0 +1,46 @@
+"""
+Benchmark: per-ticker FinBERT inference vs one batched pass over a whole watchlist
+Needs the local FinBERT-India model; headlines are synthetic
+"""
+
+import time
+from services.finbert_service import finbert_service
+
+TICKERS = ["RELIANCE", "TCS", "INFY", "HDFCBANK", "ICICIBANK", "SBIN", "ITC", "LT", "WIPRO", "BHARTIARTL"]
+ARTICLES_PER_TICKER = 10
+SHARED_HEADLINES = 3  # market-wide stories that show up under every ticker
+
+def headlines(ticker: str):
+    own = [f"{ticker} shares rise {i}% after quarterly results beat estimates. Analysts upgrade target." for i in range(ARTICLES_PER_TICKER - SHARED_HEADLINES)]
+    shared = [f"Sensex and Nifty close lower as FIIs sell, story {i}. Broader market weak." for i in range(SHARED_HEADLINES)]
+    return own + shared
+
+def sequential():
+    """What N separate /api/sentiment calls do: one model call per article"""
+    for ticker in TICKERS:
+        for text in headlines(ticker):
+            finbert_service.analyze_sentiment(text)
+
+def batched(batch_size: int):
+    """What /api/sentiment/batch does: dedupe across tickers, then batched inference"""
+    unique = list(dict.fromkeys(text for ticker in TICKERS for text in headlines(ticker)))
+    finbert_service.analyze_batch(unique, batch_size)
+    return len(unique)
+
+def main():
+    finbert_service.analyze_sentiment("warm up")
+    total = len(TICKERS) * ARTICLES_PER_TICKER
+
+    start = time.perf_counter()
+    sequential()
+    seq = time.perf_counter() - start
+    print(f"{'sequential':>14}: {total:>4} texts {seq * 1e3:>9.1f}ms {len(TICKERS) / seq:>8.1f} tickers/s")
+
+    for batch_size in (8, 32, 64):
+        start = time.perf_counter()
+        unique = batched(batch_size)
+        elapsed = time.perf_counter() - start
+        print(f"{f'batch={batch_size}':>14}: {unique:>4} texts {elapsed * 1e3:>9.1f}ms {len(TICKERS) / elapsed:>8.1f} tickers/s ({seq / elapsed:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Load test: single-flight coalescing of identical sentiment requests
+Upstream work is simulated, so the number of executions is what matters
+"""
+
+import asyncio
+import time
+from services.singleflight import SingleFlight
+
+PIPELINE_SECONDS = 0.2
+CONCURRENCY = (1, 10, 50, 100, 500)
+
+async def run(concurrency: int):
+    flight = SingleFlight()
+    upstream_calls = 0
+
+    async def pipeline():
+        nonlocal upstream_calls
+        upstream_calls += 3  # news + quote + history
+        await asyncio.sleep(PIPELINE_SECONDS)
+        return {"stock": "RELIANCE"}
+
+    start = time.perf_counter()
+    await asyncio.gather(*(flight.do(("RELIANCE", 7), pipeline) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    stats = flight.stats()
+    print(f"{concurrency:>12}{upstream_calls:>16}{stats['executions']:>12}{stats['coalescing_ratio']:>12.3f}{elapsed * 1e3:>12.1f}ms")
+
+async def main():
+    print(f"{'concurrency':>12}{'upstream calls':>16}{'executions':>12}{'ratio':>12}{'wall':>14}")
+    for concurrency in CONCURRENCY:
+        await run(concurrency)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+"""
+Microbenchmark: /api/stocks
+Per-request list build + JSON encode (previous approach) vs the body pre-serialized and
+compressed once per universe version, over a full-size synthetic NSE+BSE universe.
+Reports server time per request and bytes on the wire for each encoding.
+"""
+
+import asyncio
+import gzip
+import json
+import time
+from benchmarks.bench_search import synthetic_universe, UNIVERSE_SIZE
+from services.stock_validator import stock_validator
+from services.universe_payload import universe_payload, negotiate_encoding
+
+def bench(label: str, fn, rounds: int = 300):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        body = fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    p50 = samples[len(samples) // 2] * 1e6
+    p99 = samples[int(len(samples) * 0.99)] * 1e6
+    print(f"{label:<34}p50 {p50:>9.1f} us   p99 {p99:>9.1f} us   {len(body):>8} bytes")
+
+def legacy_response() -> bytes:
+    stocks = stock_validator.get_all_stocks()
+    return json.dumps({"stocks": stocks, "count": len(stocks)}).encode()
+
+def main():
+    stock_validator.install(stock_validator.prepare(synthetic_universe(UNIVERSE_SIZE)))
+    print(f"{len(stock_validator.stocks)} symbols\n")
+
+    bench("legacy: build + json.dumps", legacy_response)
+    # What a GZipMiddleware would add on top of the legacy path
+    bench("legacy + per-request gzip", lambda: gzip.compress(legacy_response(), 6), 50)
+
+    loop = asyncio.new_event_loop()
+    start = time.perf_counter()
+    body = loop.run_until_complete(universe_payload.get())
+    print(f"\none-time serialize + compress: {(time.perf_counter() - start) * 1e3:.1f} ms\n")
+
+    for accept in ("identity", "gzip", "br, gzip"):
+        def serve():
+            cached = loop.run_until_complete(universe_payload.get())
+            return cached.bodies[negotiate_encoding(accept)]
+        bench(f"cached ({negotiate_encoding(accept)})", serve)
+    print("\nbytes on the wire:", body.sizes())
+
+if __name__ == "__main__":
+    main()
@@ -16,7 +16,13 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Import routers
-from routers import sentiment, watchlist, chat, auth, search
+from routers import sentiment, watchlist, chat, auth, search, market
+from services.sentiment_snapshot import sentiment_snapshot
+from services.sector_analytics import sector_analytics
+from services.symbol_master import symbol_master
+from services.stock_validator import stock_validator
+from services.database import connect_to_mongo, close_mongo_connection
+from pymongo.errors import ConnectionFailure
 
 app = FastAPI(
     title="fIndia AI API",
@@ -50,10 +56,40 @@ async def root():
 async def health_check():
     return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
 
+# MongoDB (users, watchlists, persisted snapshots and rollups); services fall back to
+# in-memory state when it is unreachable
+@app.on_event("startup")
+async def connect_database():
+    try:
+        await connect_to_mongo()
+    except ConnectionFailure:
+        print("⚠️ Continuing without MongoDB: accounts and watchlists are unavailable, snapshots and rollups stay in memory")
+
+# Scheduled jobs: universe-wide sentiment snapshot (warm start from MongoDB, refresh
+# opt-in via SENTIMENT_SNAPSHOT_INTERVAL), daily sector correlations and the
+# listing-file watcher that hot-reloads the symbol master
+@app.on_event("startup")
+async def start_background_jobs():
+    sentiment_snapshot.start(sentiment.compute_sentiment_batch)
+    sector_analytics.start()
+    symbol_master.start(stock_validator.reload_listings)
+
+@app.on_event("shutdown")
+async def stop_background_jobs():
+    await sentiment_snapshot.stop()
+    await sector_analytics.stop()
+    await symbol_master.stop()
+
+# After the jobs above have stopped using it
+@app.on_event("shutdown")
+async def close_database():
+    await close_mongo_connection()
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(search.router, prefix="/api", tags=["Search"])
 app.include_router(sentiment.router, prefix="/api", tags=["Sentiment"])
+app.include_router(market.router, prefix="/api", tags=["Market Data"])
 app.include_router(watchlist.router, prefix="/api", tags=["Watchlist"])
 app.include_router(chat.router, prefix="/api", tags=["Chatbot"])
 
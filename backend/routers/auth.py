@@ -12,6 +12,7 @@ import jwt
 import os
 # Google imports REMOVED
 from services.database import get_database
+from bson import ObjectId
 from passlib.context import CryptContext
 
 router = APIRouter()
@@ -415,3 +416,45 @@ async def get_me(current_user = Depends(get_current_user)):
         "name": current_user['name'],
         "picture": current_user.get('picture', '')
     }
+
+# Operators allowed to trigger expensive universe-wide jobs (comma-separated emails)
+ADMIN_EMAILS = {email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()}
+# Published placeholder secrets (code default and .env.example): tokens signed with them prove nothing
+PLACEHOLDER_SECRET_KEYS = {
+    "your-secret-key-change-in-production",
+    "your-super-secret-jwt-key-change-in-production-use-openssl-rand-hex-32"
+}
+
+async def get_admin_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """
+    Stored user whose email is listed in ADMIN_EMAILS.
+    The email comes from the users collection, never from token claims, and admin access
+    is refused outright while JWT_SECRET_KEY is a published placeholder (anyone could sign tokens).
+    """
+    if SECRET_KEY in PLACEHOLDER_SECRET_KEYS or not ADMIN_EMAILS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access is disabled: set JWT_SECRET_KEY and ADMIN_EMAILS"
+        )
+    try:
+        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.PyJWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials"
+        )
+    
+    db = get_database()
+    if db is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Admin access needs the user database"
+        )
+    user_id = str(payload.get("sub") or "")
+    user = await db.users.find_one({"_id": ObjectId(user_id) if ObjectId.is_valid(user_id) else user_id})
+    if user is None or str(user.get('email', '')).lower() not in ADMIN_EMAILS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return user
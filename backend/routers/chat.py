@@ -3,17 +3,40 @@ Chatbot Router - STRICT DATA AUTHORITY
 Enforces Single Source of Truth for Sentiment Analysis
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-import re
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
 from services.database import get_database
 from services.stock_validator import stock_validator
+from services.entity_matcher import stock_matcher
+from services.sentiment_snapshot import sentiment_snapshot
+from services.leaderboard import sentiment_leaderboard
 from routers.auth import get_current_user
 
 # Import the AUTHORITATIVE sentiment pipeline
-from routers.sentiment import analyze_sentiment
+from routers.sentiment import get_sentiment_payload, compute_sentiment_batch, derive_window
+from services.progress import listen_progress
+import asyncio
+import json
+import os
+import re
+
+CHAT_ANALYSIS_DAYS = 5
+# Window the dashboard requests by default; chat resolves this one and narrows it,
+# so its results share the dashboard's response cache, single-flight and data versions
+DASHBOARD_DAYS = 7
+MAX_COMPARE_TICKERS = 6
+# Several stocks are only compared when asked to; otherwise the first one is analysed
+COMPARE_PATTERN = re.compile(r"\b(compare|comparing|comparison|vs|versus)\b")
+# "how" as a word, punctuated or not ("how?", "how's", "How,") but not inside "show"
+HOW_PATTERN = re.compile(r"\bhow\b")
+# Per-stock deadline for comparisons; a slower stock is reported as unavailable
+COMPARE_TICKER_TIMEOUT = float(os.getenv("CHAT_TICKER_TIMEOUT", 8))
+# Streaming: how often to check for a disconnected client, and markdown chunk size
+STREAM_POLL_SECONDS = 0.25
+STREAM_CHUNK_CHARS = 200
 
 router = APIRouter()
 
@@ -30,31 +53,106 @@ async def chat(chat_msg: ChatMessage):
     """
     AI Chatbot that strictly interprets dashboard data
     """
-    message = chat_msg.message.lower()
     context = chat_msg.context or {}
     
-    response = await generate_chat_response(message, context)
+    response = await generate_chat_response(chat_msg.message, context)
     
     return {
         "response": response,
         "timestamp": datetime.utcnow().isoformat()
     }
 
-async def generate_chat_response(message: str, context: dict) -> str:
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def markdown_chunks(text: str, size: int = STREAM_CHUNK_CHARS) -> List[str]:
+    """Split markdown on line boundaries into chunks of roughly `size` characters"""
+    chunks, current = [], ""
+    for line in text.splitlines(keepends=True):
+        if current and len(current) + len(line) > size:
+            chunks.append(current)
+            current = ""
+        current += line
+    if current:
+        chunks.append(current)
+    return chunks
+
+@router.post("/chat/stream")
+async def chat_stream(chat_msg: ChatMessage, request: Request):
+    """
+    Streaming chat over Server-Sent Events.
+    Events: ack (immediately), progress (pipeline stages), chunk (markdown pieces), done, error.
+    Work stops when the client disconnects.
+    """
+    context = chat_msg.context or {}
+    events: asyncio.Queue = asyncio.Queue()
+    
+    async def respond() -> str:
+        # Pipeline progress from this task (and tasks it starts) lands on the queue
+        listen_progress(events.put_nowait)
+        return await generate_chat_response(chat_msg.message, context)
+    
+    async def stream():
+        yield sse_event("ack", {"message": "Working on it...", "timestamp": datetime.utcnow().isoformat()})
+        task = asyncio.create_task(respond())
+        try:
+            while not task.done():
+                if await request.is_disconnected():
+                    print("🔌 Chat stream client disconnected, cancelling")
+                    return
+                try:
+                    progress = await asyncio.wait_for(events.get(), STREAM_POLL_SECONDS)
+                    yield sse_event("progress", progress)
+                except asyncio.TimeoutError:
+                    continue
+            
+            while not events.empty():
+                yield sse_event("progress", events.get_nowait())
+            
+            try:
+                response = task.result()
+            except Exception as e:
+                print(f"Chat stream failed: {e}")
+                yield sse_event("error", {"message": "Sorry, I couldn't complete that request."})
+                return
+            
+            for chunk in markdown_chunks(response):
+                yield sse_event("chunk", {"text": chunk})
+            yield sse_event("done", {"timestamp": datetime.utcnow().isoformat()})
+        finally:
+            # Client gone (or generator closed): abandon any remaining work
+            if not task.done():
+                task.cancel()
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def resolve_dashboard_data(ticker: str) -> dict:
+    """
+    Dashboard payload for the chat's analysis window: the dashboard's cached
+    (ticker, window) entry, checked against the ticker's data versions, narrowed.
+    """
+    payload = await get_sentiment_payload(ticker, days=DASHBOARD_DAYS)
+    return derive_window(payload, CHAT_ANALYSIS_DAYS)
+
+async def generate_chat_response(text: str, context: dict) -> str:
     """
     Generate response based ONLY on verified data.
     NEVER recalculates sentiment independently.
     """
+    message = text.lower()
     
+    # 1. Detect Stock (for routing) - one scan over tickers, company names and aliases,
+    # on word boundaries (so "REC" never matches inside "CORRECTLY")
+    mentioned = stock_matcher.find_tickers(text)
+    detected_stock = mentioned[0] if mentioned else None
     
-    # 1. Detect Stock (for routing) - STRICT REGEX
-    detected_stock = None
-    message_upper = message.upper()
-    for ticker in stock_validator.stocks.keys():
-        # strict word boundary check to avoid "REC" in "CORRECTLY"
-        if re.search(r'\b' + re.escape(ticker) + r'\b', message_upper):
-            detected_stock = ticker
-            break
+    # Intent: Comparison (explicit compare / vs phrasing, every mentioned stock resolved together)
+    if len(mentioned) > 1 and COMPARE_PATTERN.search(message):
+        return await generate_comparison_response(mentioned[:MAX_COMPARE_TICKERS])
             
     # 2. Resolve Data Context (The "Truth")
     # If context is empty or doesn't match the requested stock, we must fetch the OFFICIAL dashboard data.
@@ -65,7 +163,7 @@ async def generate_chat_response(message: str, context: dict) -> str:
         if not active_data or active_data.get('stock') != detected_stock:
             try:
                 # CRITICAL: Call the EXACT same function the dashboard uses
-                active_data = await analyze_sentiment(stock=detected_stock, days=5)
+                active_data = await resolve_dashboard_data(detected_stock)
             except Exception as e:
                 print(f"Error fetching authoritative data: {e}")
                 return f"I recognized **{detected_stock}**, but I cannot access its dashboard data right now. Please try searching for it."
@@ -79,7 +177,7 @@ async def generate_chat_response(message: str, context: dict) -> str:
         return generate_news_response(active_data)
 
     # Intent: Methodology / Calculation
-    if "calculate" in message or "methodology" in message or "how" in message:
+    if "calculate" in message or "methodology" in message or HOW_PATTERN.search(message):
         # If we have active data (context), explain THAT. Else explain generic.
         if active_data and active_data.get('stock'):
              return explain_methodology(active_data, active_data.get('stock'))
@@ -92,9 +190,9 @@ async def generate_chat_response(message: str, context: dict) -> str:
         
     # Intent: Top Bullish/Bearish
     if "top bullish" in message:
-        return get_top_stocks("bullish")
+        return get_top_stocks("bullish", mentioned_sector(message))
     if "top bearish" in message:
-        return get_top_stocks("bearish")
+        return get_top_stocks("bearish", mentioned_sector(message))
 
     # Intent: Specific Stock Analysis (The core feature)
     if active_data and active_data.get('sentiment_label'):
@@ -105,6 +203,7 @@ async def generate_chat_response(message: str, context: dict) -> str:
 
 I can explain the sentiment data shown on your screen.
 • "Analyze RELIANCE" (I will fetch the dashboard data)
+• "Compare TCS vs INFY"
 • "How is the score calculated?"
 • "Show news summary"
 """
@@ -178,6 +277,57 @@ def generate_news_response(data: dict) -> str:
 {chr(10).join(cards)}
 """
 
+async def generate_comparison_response(tickers: List[str]) -> str:
+    """
+    Side-by-side dashboard data for several stocks.
+    News fetching, market data and FinBERT scoring are shared across the stocks,
+    and each stock has its own deadline so a slow one doesn't hold up the reply.
+    """
+    # Fresh dashboard entries are reused by the batch; new results are written back for the dashboard
+    fetched, _ = await compute_sentiment_batch(tickers, DASHBOARD_DAYS, timeout=COMPARE_TICKER_TIMEOUT)
+    results = {
+        ticker: payload if "error" in payload else derive_window(payload, CHAT_ANALYSIS_DAYS)
+        for ticker, payload in fetched.items()
+    }
+    
+    rows = []
+    ranked = []
+    unavailable = []
+    for ticker in tickers:
+        data = results.get(ticker) or {}
+        if "error" in data:
+            unavailable.append(f"{ticker} ({data['error']})")
+            continue
+        
+        label = data.get('sentiment_label', 'neutral').upper()
+        score = data.get('sentiment_score', 0.0)
+        emoji = "🟢" if label == "BULLISH" else "🔴" if label == "BEARISH" else "🟡"
+        quote = data.get('stock_data') or {}
+        price = quote.get('current_price') or 0
+        previous = quote.get('previous_close') or 0
+        change = f"{(price - previous) / previous * 100:+.2f}%" if price and previous else "—"
+        price_text = f"₹{price:,.2f}" if price else "—"
+        
+        rows.append(f"| **{ticker}** | {emoji} {label} | {score:+.2f} | {len(data.get('news', []))} | {price_text} | {change} |")
+        ranked.append((score, ticker))
+    
+    if not rows:
+        return "I couldn't load dashboard data for any of these stocks right now: " + ", ".join(unavailable)
+    
+    response = f"""**Comparison: {', '.join(tickers)}**
+(Source: FinBERT-India Dashboard Data, last {CHAT_ANALYSIS_DAYS} days)
+
+| Stock | Signal | Score | Articles | Price | Change |
+|---|---|---|---|---|---|
+{chr(10).join(rows)}
+"""
+    if len(ranked) > 1:
+        ranked.sort(reverse=True)
+        response += f"\n**Strongest sentiment**: {ranked[0][1]} ({ranked[0][0]:+.2f}) | **Weakest**: {ranked[-1][1]} ({ranked[-1][0]:+.2f})\n"
+    if unavailable:
+        response += f"\n_Unavailable right now: {', '.join(unavailable)}_\n"
+    return response
+
 def generate_analysis_response(data: dict, message: str) -> str:
     """Clean Analysis Response (No list, No distribution)"""
     stock = data.get('stock')
@@ -206,15 +356,56 @@ Verified against **{news_count}** articles in the live dashboard context.
 """
     return response
 
+def snapshot_age(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "unknown"
+    minutes = int(seconds // 60)
+    return f"{minutes} min ago" if minutes < 120 else f"{minutes // 60} h ago"
+
 def get_market_trend_response():
-    return """**Market Trend Analysis** 📈
-(Simulated Outlook)
-The NIFTY 50 is showing mixed signals.
-• **Bullish**: Banking & Finance.
-• **Bearish**: IT Services.
+    """Market-wide outlook from the precomputed universe sentiment snapshot"""
+    trend = sentiment_snapshot.market_trend()
+    if not trend and not sentiment_snapshot.enabled():
+        return """**Market Trend Analysis** 📈
+Market-wide sentiment snapshots are turned off on this server, so there is no market trend to report.
 _Search for specific stocks to see verified sentiment_"""
+    if not trend:
+        return """**Market Trend Analysis** 📈
+The market-wide sentiment snapshot is still being computed.
+_Search for specific stocks to see verified sentiment_"""
+    
+    sectors = trend['sectors']
+    leaders = ", ".join(f"{s['sector']} ({s['avg_score']:+.2f})" for s in sectors[:3])
+    laggards = ", ".join(f"{s['sector']} ({s['avg_score']:+.2f})" for s in sectors[-3:][::-1])
+    emoji = "🟢" if trend['label'] == "bullish" else "🔴" if trend['label'] == "bearish" else "🟡"
+    
+    return f"""**Market Trend Analysis** 📈
+(Source: FinBERT-India universe snapshot, updated {snapshot_age(trend['staleness_seconds'])})
+
+{emoji} **Overall: {trend['label'].upper()}** (Avg score: {trend['avg_score']:+.2f}, Avg move: {trend['avg_change_percent']:+.2f}%)
+• **Breadth**: {trend['bullish']} bullish / {trend['neutral']} neutral / {trend['bearish']} bearish across {trend['stocks']} stocks
+• **Strongest sectors**: {leaders}
+• **Weakest sectors**: {laggards}"""
 
-def get_top_stocks(type: str):
-    if type == "bullish":
-        return "**Top Bullish** (Demo): ITC, M&M, TITAN"
-    return "**Top Bearish** (Demo): PAYTM, ADANIENT, WIPRO"
+def mentioned_sector(message: str) -> Optional[str]:
+    """A leaderboard sector named in the (lowercased) message, if any"""
+    for sector in sentiment_leaderboard.sectors():
+        if sector.lower() in message:
+            return sector
+    return None
+
+def get_top_stocks(type: str, sector: Optional[str] = None):
+    """Top bullish/bearish stocks from the live sentiment leaderboard"""
+    stocks = sentiment_leaderboard.top(type, limit=5, sector=sector)
+    title = "Top Bullish" if type == "bullish" else "Top Bearish"
+    if sector:
+        title += f" in {sector}"
+    if not stocks:
+        return f"**{title}**: no stocks have been scored yet. Please try again shortly."
+    
+    lines = [
+        f"{i}. **{row['ticker']}** ({row['company_name']}) Score: {row['score']:+.2f} | {row['change_percent']:+.2f}% | updated {snapshot_age(row['age_seconds'])}"
+        for i, row in enumerate(stocks, 1)
+    ]
+    return f"""**{title}** (FinBERT-India live leaderboard)
+{chr(10).join(lines)}"""
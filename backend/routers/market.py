@@ -0,0 +1,239 @@
+"""
+Market Data Router
+Multi-ticker quotes and price history
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from services.stock_validator import stock_validator
+from services.stock_data_service import stock_data_service
+from services.indicators import indicator_engine, clean
+from services.downsample import lttb, ohlc_buckets
+from services.sector_analytics import sector_analytics
+from routers.auth import get_admin_user
+import numpy as np
+import asyncio
+import json
+import time
+
+router = APIRouter()
+
+MAX_TICKERS_PER_REQUEST = 100
+
+def resolve_tickers(tickers: Optional[str], index: Optional[str]) -> List[str]:
+    """Parse a comma-separated ticker list or an index preset"""
+    if index:
+        constituents = stock_validator.get_index_constituents(index)
+        if constituents is None:
+            raise HTTPException(status_code=400, detail=f"Unknown index: {index}")
+        return constituents
+
+    if not tickers:
+        raise HTTPException(status_code=400, detail="Provide tickers or index")
+
+    requested = list(dict.fromkeys(t.strip().upper() for t in tickers.split(",") if t.strip()))
+    if len(requested) > MAX_TICKERS_PER_REQUEST:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many tickers: {len(requested)} (max {MAX_TICKERS_PER_REQUEST})"
+        )
+    return requested
+
+@router.get("/quotes")
+async def get_quotes(
+    tickers: Optional[str] = Query(None, description="Comma-separated tickers, e.g. TCS,INFY,WIPRO"),
+    index: Optional[str] = Query(None, description="Index preset instead of tickers, e.g. NIFTY50"),
+    history: bool = Query(False, description="Include price history per ticker"),
+    period: str = Query("1mo", description="History period (1mo, 3mo, 1y, ...)")
+):
+    """
+    Get quotes (and optionally history) for many stocks in one call
+    Invalid or failed tickers are reported per ticker instead of failing the request
+    """
+    requested = resolve_tickers(tickers, index)
+    valid = [t for t in requested if stock_validator.validate_ticker(t)]
+
+    jobs = [asyncio.to_thread(stock_data_service.get_stock_info_many, valid)]
+    if history:
+        jobs.append(asyncio.to_thread(stock_data_service.get_historical_data_many, valid, period))
+    fetched = await asyncio.gather(*jobs)
+
+    quotes = fetched[0]
+    histories = fetched[1] if history else {}
+
+    results = {}
+    for ticker in requested:
+        if ticker not in quotes:
+            results[ticker] = {"ticker": ticker, "error": "Invalid ticker"}
+            continue
+
+        item = {"quote": quotes[ticker]}
+        if history:
+            hist = histories.get(ticker, [])
+            if isinstance(hist, dict):
+                item["history_error"] = hist.get("error", "History unavailable")
+                hist = []
+            item["history"] = hist
+        if "error" in quotes[ticker]:
+            item["error"] = quotes[ticker]["error"]
+        results[ticker] = item
+
+    return {
+        "results": results,
+        "count": len(results),
+        "errors": sum(1 for item in results.values() if "error" in item)
+    }
+
+def series_payload(columns: dict, fields: tuple) -> dict:
+    """Columnar JSON-ready series"""
+    payload = {"dates": np.datetime_as_string(columns['date']).tolist()}
+    for field in fields:
+        values = columns[field]
+        payload[field] = values.astype(np.int64).tolist() if field == 'volume' else np.round(values, 2).tolist()
+    return payload
+
+def measure_json(payload) -> tuple:
+    """Serialized size in bytes and serialization time in ms"""
+    start = time.perf_counter()
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    return len(body), round((time.perf_counter() - start) * 1000, 3)
+
+@router.get("/history/{ticker}")
+async def get_history(
+    ticker: str,
+    period: str = Query("1y", description="History window (1mo, 6mo, 1y, 5y, max, ...)"),
+    points: int = Query(300, ge=10, le=5000, description="Target number of chart points"),
+    mode: str = Query("ohlc", pattern="^(ohlc|lttb)$", description="ohlc: bucketed candles, lttb: close line"),
+    stats: bool = Query(False, description="Report payload size and serialization time against the raw series")
+):
+    """
+    Chart-ready price history downsampled to a target point count
+    Long windows stay small on the wire while keeping the visual shape
+    """
+    ticker = ticker.upper()
+    if not stock_validator.validate_ticker(ticker):
+        raise HTTPException(status_code=400, detail=f"Invalid stock ticker: {ticker}")
+
+    window = await asyncio.to_thread(stock_data_service.get_history_arrays, ticker, period)
+    if window is None:
+        raise HTTPException(status_code=404, detail=f"No price history available for {ticker}")
+
+    if mode == "lttb":
+        keep = lttb(window['date'].astype(np.int64), window['close'], points)
+        sampled = {field: values[keep] for field, values in window.items()}
+        series = series_payload(sampled, ('close', 'volume'))
+    else:
+        sampled = ohlc_buckets(window, points)
+        series = series_payload(sampled, ('open', 'high', 'low', 'close', 'volume'))
+
+    response = {
+        "ticker": ticker,
+        "period": period,
+        "mode": mode,
+        "raw_points": len(window['date']),
+        "points": len(series["dates"]),
+        "series": series
+    }
+
+    if stats:
+        raw_bytes, raw_ms = measure_json(stock_data_service.arrays_to_records(window))
+        sampled_bytes, sampled_ms = measure_json(series)
+        response["stats"] = {
+            "raw_bytes": raw_bytes,
+            "raw_serialize_ms": raw_ms,
+            "bytes": sampled_bytes,
+            "serialize_ms": sampled_ms,
+            "reduction": round(raw_bytes / sampled_bytes, 1) if sampled_bytes else None
+        }
+
+    return response
+
+@router.get("/indicators/{ticker}")
+async def get_indicators(
+    ticker: str,
+    period: str = Query("1y", description="History window the indicators are computed over"),
+    series: bool = Query(False, description="Return the full indicator series, not just the latest values")
+):
+    """
+    Technical indicators (SMA, EMA, RSI, MACD, Bollinger, ATR, VWAP) for one stock
+    Computed from the local price store
+    """
+    ticker = ticker.upper()
+    if not stock_validator.validate_ticker(ticker):
+        raise HTTPException(status_code=400, detail=f"Invalid stock ticker: {ticker}")
+
+    window = await asyncio.to_thread(stock_data_service.get_history_arrays, ticker, period)
+    if window is None:
+        raise HTTPException(status_code=404, detail=f"No price history available for {ticker}")
+
+    latest = (await asyncio.to_thread(indicator_engine.latest_many, {ticker: window}, period))[ticker]
+    response = {
+        "ticker": ticker,
+        "as_of": str(window['date'][-1]),
+        "indicators": clean(latest)
+    }
+
+    if series:
+        computed = await asyncio.to_thread(indicator_engine.compute_series, window)
+        response["series"] = {
+            "dates": np.datetime_as_string(window['date']).tolist(),
+            "close": np.round(window['close'], 2).tolist(),
+            **{name: [None if np.isnan(v) else round(v, 2) for v in values.tolist()] for name, values in computed.items()}
+        }
+
+    return response
+
+@router.get("/indicators")
+async def get_indicators_many(
+    tickers: Optional[str] = Query(None, description="Comma-separated tickers"),
+    index: Optional[str] = Query(None, description="Index preset instead of tickers, e.g. NIFTY50"),
+    period: str = Query("1y", description="History window the indicators are computed over")
+):
+    """Latest technical indicators for many stocks, computed in one vectorized pass"""
+    requested = resolve_tickers(tickers, index)
+    valid = [t for t in requested if stock_validator.validate_ticker(t)]
+
+    windows = await asyncio.to_thread(stock_data_service.get_history_arrays_many, valid, period)
+    latest = await asyncio.to_thread(indicator_engine.latest_many, windows, period)
+
+    results = {}
+    for ticker in requested:
+        if ticker not in latest:
+            results[ticker] = {"error": "Invalid ticker"}
+        elif latest[ticker] is None:
+            results[ticker] = {"error": "No price history available"}
+        else:
+            results[ticker] = {
+                "as_of": str(windows[ticker]['date'][-1]),
+                "indicators": clean(latest[ticker])
+            }
+
+    return {
+        "results": results,
+        "count": len(results),
+        "errors": sum(1 for item in results.values() if "error" in item)
+    }
+
+@router.get("/sectors")
+async def get_sectors():
+    """Per-sector average rolling return and sentiment correlations"""
+    return {
+        "sectors": sector_analytics.sectors(),
+        **sector_analytics.status()
+    }
+
+@router.get("/sectors/{sector}/correlation")
+async def get_sector_correlation(sector: str):
+    """Rolling return and sentiment correlation matrices for one sector"""
+    result = sector_analytics.correlation(sector)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No correlation data for sector: {sector}")
+    return result
+
+@router.post("/sectors/refresh")
+async def refresh_sectors(
+    full: bool = Query(False, description="Rebuild the windows instead of folding in new sessions"),
+    admin = Depends(get_admin_user)
+):
+    """Fold the latest sessions into the sector correlation matrices (admin only)"""
+    return await sector_analytics.refresh(full)
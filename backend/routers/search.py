@@ -3,9 +3,12 @@ Search Router
 Stock search and autocomplete
 """
 
-from fastapi import APIRouter, Query
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import List, Optional
 from services.stock_validator import stock_validator
+from services.symbol_master import symbol_master
+from services.universe_payload import universe_payload, negotiate_encoding, cache_control, ALLOWED_FIELDS, DEFAULT_FIELDS
+from routers.auth import get_admin_user
 
 router = APIRouter()
 
@@ -24,14 +27,46 @@ async def search_stocks(q: str = Query(..., min_length=1, description="Search qu
     }
 
 @router.get("/stocks")
-async def get_all_stocks():
-    """Get all available Indian stocks"""
-    stocks = stock_validator.get_all_stocks()
-    
-    return {
-        "stocks": stocks,
-        "count": len(stocks)
+async def get_all_stocks(
+    request: Request,
+    fields: Optional[str] = Query(None, description=f"Comma-separated columns: {', '.join(ALLOWED_FIELDS)}"),
+    offset: int = Query(0, ge=0, description="Page start; a multiple of limit"),
+    limit: Optional[int] = Query(None, ge=1, le=10000, description="Page size (default: everything from offset)")
+):
+    """
+    Get all available Indian stocks
+    Serialized and compressed once per universe version; strong ETag per encoding,
+    honors If-None-Match with 304. Pages are page-aligned (offset a multiple of limit).
+    """
+    columns = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip())) if fields else DEFAULT_FIELDS
+    unknown = [f for f in columns if f not in ALLOWED_FIELDS]
+    if unknown or not columns:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(ALLOWED_FIELDS)}")
+
+    try:
+        body = await universe_payload.get(columns, offset, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    etag = body.etags[encoding]
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control(),
+        "Vary": "Accept-Encoding"
     }
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body.bodies[encoding], media_type="application/json", headers=headers)
+
+@router.get("/stocks/stats")
+async def stocks_payload_stats():
+    """Cached /stocks variants and encoded sizes for the current universe"""
+    return universe_payload.stats()
 
 @router.get("/validate/{ticker}")
 async def validate_ticker(ticker: str):
@@ -51,3 +86,24 @@ async def validate_ticker(ticker: str):
         "ticker": ticker.upper(),
         "company_name": company_name
     }
+
+@router.get("/symbols/status")
+async def symbol_master_status():
+    """Symbol master source files, listing counts and the live universe version"""
+    return {"version": stock_validator.version, "reloading": stock_validator.reloading, **symbol_master.status()}
+
+@router.post("/symbols/reload")
+async def reload_symbols(
+    force: bool = Query(False, description="Rebuild even if the listing files are unchanged"),
+    admin = Depends(get_admin_user)
+):
+    """Hot-reload the NSE/BSE listing files and swap the new universe in (admin only)"""
+    return await stock_validator.reload_listings(force)
+
+@router.get("/symbols/{ticker}")
+async def get_listing(ticker: str):
+    """Exchange listing details (ISIN, series, exchange, sector) for a ticker"""
+    listing = stock_validator.get_listing(ticker)
+    if listing is None:
+        raise HTTPException(status_code=404, detail=f"No exchange listing for: {ticker.upper()}")
+    return listing
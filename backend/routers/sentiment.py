@@ -3,33 +3,457 @@ Sentiment Analysis Router
 FinBERT-India powered sentiment analysis
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 from services.stock_validator import stock_validator
+from routers.market import resolve_tickers
+from routers.auth import get_admin_user
 from services.finbert_service import finbert_service
 from services.news_service import news_service
 from services.stock_data_service import stock_data_service
-from datetime import datetime
+from services.upstream_trace import begin_trace
+from services.response_cache import ResponseCache, CachedResponse
+from services.data_versions import data_versions
+from services.singleflight import SingleFlight
+from services.progress import report_progress
+from services.sentiment_snapshot import sentiment_snapshot
+from services.leaderboard import sentiment_leaderboard
+from services.sentiment_rollups import sentiment_rollups
+from services.sector_analytics import sector_analytics
+from services.backtest import backtest_engine, forward_returns, hit_rate, DEFAULT_THRESHOLD
+from datetime import datetime, timedelta
+import asyncio
+import numpy as np
+import os
 import random
+import time
 
 router = APIRouter()
 
+MAX_BATCH_TICKERS = int(os.getenv("SENTIMENT_BATCH_MAX", 25))
+INFERENCE_BATCH_SIZE = 32
+# Covers the 1mo price window the dashboard trend is drawn against
+TREND_LOOKBACK_DAYS = 45
+
+def article_text(article: dict) -> str:
+    """Text the model scores: headline and description"""
+    return f"{article['title']}. {article.get('description', '')}"
+
+def attach_sentiment(article: dict, sentiment: dict) -> dict:
+    return {
+        **article,
+        'sentiment': sentiment['label'],
+        'sentiment_score': sentiment['score'],
+        'confidence': sentiment['confidence']
+    }
+
+async def score_texts(texts: list) -> list:
+    """
+    Run FinBERT-India over texts in batches, off the event loop.
+    Reports progress after each batch; a cancelled caller stops before the next one.
+    """
+    results = []
+    total = len(texts)
+    report_progress("scoring", f"Scoring {total} articles with FinBERT-India", done=0, total=total)
+    for start in range(0, total, INFERENCE_BATCH_SIZE):
+        chunk = texts[start:start + INFERENCE_BATCH_SIZE]
+        results.extend(await asyncio.to_thread(finbert_service.analyze_batch, chunk, INFERENCE_BATCH_SIZE))
+        report_progress("scoring", f"Scored {len(results)}/{total} articles", done=len(results), total=total)
+    return results
+
+async def score_articles(news_articles: list) -> tuple:
+    """Score every article and attach its sentiment"""
+    sentiments = await score_texts([article_text(article) for article in news_articles])
+    analyzed_news = [attach_sentiment(article, sentiment) for article, sentiment in zip(news_articles, sentiments)]
+    return sentiments, analyzed_news
+
+async def timed(timings: dict, stage: str, awaitable):
+    """Await a pipeline stage and record its wall time in ms"""
+    start = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        timings[stage] = round((time.perf_counter() - start) * 1000, 1)
+
+async def update_rollups(ticker: str, analyzed_news: list) -> dict:
+    """Fold scored articles into the daily rollups and return the recent per-day map"""
+    await sentiment_rollups.record(ticker, analyzed_news)
+    return await sentiment_rollups.daily_map(ticker, TREND_LOOKBACK_DAYS)
+
+def server_timing(timings: dict) -> str:
+    return ", ".join(f"{stage};dur={ms}" for stage, ms in timings.items())
+
+# Whole-response cache keyed by (ticker, days); timings and call counts don't affect the (weak) ETag
+sentiment_cache = ResponseCache(etag_exclude=("timings", "upstream_calls"))
+sentiment_flight = SingleFlight()
+# Cache hits older than this re-check the ticker's quote and news in the background
+REVALIDATE_AFTER = float(os.getenv("SENTIMENT_REVALIDATE_AFTER", 60))
+# ticker -> (started_at, task); the task reference also keeps it from being collected
+revalidations: Dict[str, tuple] = {}
+
+def rank_payload(ticker: str, days: int, payload: dict):
+    """Re-rank the ticker on the live leaderboard from a freshly computed payload"""
+    if days == sentiment_leaderboard.window:
+        sentiment_leaderboard.record_payload(ticker, payload, stock_validator.get_sector(ticker))
+
+def publish_payload(ticker: str, days: int, payload: dict) -> CachedResponse:
+    """Cache a freshly computed payload and re-rank the ticker on the live leaderboard"""
+    rank_payload(ticker, days, payload)
+    return sentiment_cache.set((ticker, days), payload, data_versions.get(ticker))
+
+async def revalidate_sources(ticker: str, days: int):
+    """
+    Re-fetch the quote (no-op while the cached one is fresh) and the news behind a cached
+    payload. A moved price or new articles bump the ticker's data version, so the next
+    request recomputes instead of waiting out the TTL.
+    """
+    company_name = stock_validator.get_company_name(ticker)
+    await asyncio.gather(
+        asyncio.to_thread(stock_data_service.get_stock_info, ticker),
+        news_service.fetch_stock_news(company_name, ticker, days),
+        return_exceptions=True
+    )
+
+def schedule_revalidation(ticker: str, days: int):
+    """At most one background revalidation per ticker every REVALIDATE_AFTER seconds"""
+    previous = revalidations.get(ticker)
+    if previous is not None and (not previous[1].done() or time.time() - previous[0] < REVALIDATE_AFTER):
+        return
+    revalidations[ticker] = (time.time(), asyncio.create_task(revalidate_sources(ticker, days)))
+
+async def get_sentiment_entry(stock: str, days: int = 7) -> CachedResponse:
+    """
+    Cached sentiment payload for (ticker, days).
+    Recomputed when the TTL lapses or new articles / a moved quote arrive for the ticker.
+    """
+    stock_upper = stock.upper()
+    key = (stock_upper, days)
+    
+    entry = sentiment_cache.get(key, data_versions.get(stock_upper))
+    if entry is not None:
+        if time.time() - entry.created_at > REVALIDATE_AFTER:
+            schedule_revalidation(stock_upper, days)
+        return entry
+    
+    # Concurrent misses for the same key share one pipeline run
+    async def compute() -> CachedResponse:
+        payload = await compute_sentiment(stock_upper, days)
+        return publish_payload(stock_upper, days, payload)
+    
+    return await sentiment_flight.do(key, compute)
+
+async def get_sentiment_payload(stock: str, days: int = 7) -> dict:
+    """Dashboard payload for a stock, served from the response cache when fresh"""
+    return (await get_sentiment_entry(stock, days)).payload
+
+@router.get("/sentiment/stats")
+async def sentiment_stats():
+    """Response cache and request coalescing metrics for the sentiment pipeline"""
+    return {
+        "cache": sentiment_cache.stats(),
+        "coalescing": sentiment_flight.stats()
+    }
+
+@router.get("/sentiment/snapshot")
+async def snapshot_status():
+    """Universe snapshot job status: last run time, duration and staleness"""
+    return sentiment_snapshot.status()
+
+@router.get("/sentiment/snapshot/top")
+async def snapshot_top(
+    direction: str = Query("bullish", pattern="^(bullish|bearish)$"),
+    limit: int = Query(10, ge=1, le=100),
+    sector: Optional[str] = Query(None, description="Restrict to one sector")
+):
+    """Top bullish or bearish stocks from the precomputed snapshot"""
+    return {
+        "direction": direction,
+        "stocks": sentiment_snapshot.top(direction, limit, sector),
+        "staleness_seconds": sentiment_snapshot.staleness_seconds()
+    }
+
+@router.get("/sentiment/snapshot/sectors")
+async def snapshot_sectors():
+    """Per-sector sentiment and price-change rollups from the snapshot"""
+    return {
+        "sectors": sentiment_snapshot.sectors(),
+        "staleness_seconds": sentiment_snapshot.staleness_seconds()
+    }
+
+@router.get("/sentiment/snapshot/market")
+async def snapshot_market():
+    """Market-wide sentiment breadth from the snapshot"""
+    trend = sentiment_snapshot.market_trend()
+    if not trend:
+        raise HTTPException(status_code=503, detail="Sentiment snapshot is not ready yet")
+    return trend
+
+@router.post("/sentiment/snapshot/refresh")
+async def snapshot_refresh(admin = Depends(get_admin_user)):
+    """Start a universe-wide snapshot rebuild in the background (admin only)"""
+    if not sentiment_snapshot.trigger(compute_sentiment_batch):
+        return {"status": "already running"}
+    return {"status": "started"}
+
+@router.get("/leaderboard")
+async def leaderboard(
+    direction: str = Query("both", pattern="^(bullish|bearish|both)$"),
+    limit: int = Query(10, ge=1, le=100),
+    sector: Optional[str] = Query(None, description="Restrict to one sector")
+):
+    """Live top/bottom stocks by sentiment, re-ranked whenever a stock is recomputed"""
+    directions = ["bullish", "bearish"] if direction == "both" else [direction]
+    return {
+        "sector": sector,
+        **{d: sentiment_leaderboard.top(d, limit, sector) for d in directions},
+        "status": sentiment_leaderboard.status()
+    }
+
+@router.get("/sentiment/trend/{ticker}")
+async def sentiment_trend(
+    ticker: str,
+    days: int = Query(30, ge=1, le=365, description="Lookback window, e.g. 30, 90 or 365")
+):
+    """Daily sentiment rollups (counts, mean, confidence-weighted mean) for a stock"""
+    ticker = ticker.upper()
+    if not stock_validator.validate_ticker(ticker):
+        raise HTTPException(status_code=400, detail=f"Invalid stock ticker: {ticker}")
+    
+    daily = await sentiment_rollups.trend(ticker, days)
+    articles = sum(row['count'] for row in daily)
+    return {
+        "ticker": ticker,
+        "days": days,
+        "daily": daily,
+        "articles": articles,
+        "days_with_news": len(daily),
+        "mean": round(sum(row["sum"] for row in daily) / articles, 4) if articles else 0.0
+    }
+
+@router.get("/sentiment/backtest")
+async def sentiment_backtest(
+    tickers: Optional[str] = Query(None, description="Comma-separated tickers, e.g. TCS,INFY,WIPRO"),
+    index: Optional[str] = Query(None, description="Index preset instead of tickers, e.g. NIFTY50"),
+    period: str = Query("1y", description="Price window (3mo, 6mo, 1y, 2y, 5y)"),
+    horizon: int = Query(1, ge=1, le=20, description="Forward return horizon in sessions"),
+    threshold: float = Query(DEFAULT_THRESHOLD, ge=0, le=1, description="Minimum |sentiment| to take a position"),
+    fill_days: int = Query(0, ge=0, le=10, description="Carry sentiment forward over this many newsless sessions")
+):
+    """
+    Backtest daily rollup sentiment against subsequent returns:
+    hit rate, IC, lagged correlations and long/short P&L per ticker and for the portfolio
+    """
+    started = time.perf_counter()
+    result = await backtest_engine.run(resolve_tickers(tickers, index), period, horizon, threshold, fill_days)
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
 @router.get("/sentiment")
 async def analyze_sentiment(
+    request: Request,
     stock: str = Query(..., description="Stock ticker or company name"),
     days: int = Query(7, ge=1, le=30, description="Number of days to analyze")
 ):
     """
     Analyze sentiment for a stock using FinBERT-India
+    Cached per (stock, days) with a weak ETag; honors If-None-Match with 304
+    """
+    stock_upper = stock.upper()
+    if not stock_validator.validate_ticker(stock_upper):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid stock ticker: {stock}. Please use a valid Indian stock ticker."
+        )
+    
+    requested_at = time.time()
+    entry = await get_sentiment_entry(stock_upper, days)
+    computed = entry.created_at >= requested_at
+    
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": f"public, max-age={entry.max_age()}",
+        "X-Cache": "MISS" if computed else "HIT"
+    }
+    if computed:
+        headers["Server-Timing"] = server_timing(entry.payload.get("timings", {}))
+    
+    if entry.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+class BatchSentimentRequest(BaseModel):
+    tickers: List[str]
+    days: int = Field(7, ge=1, le=30)
+
+@router.post("/sentiment/batch")
+async def analyze_sentiment_batch(req: BatchSentimentRequest):
+    """
+    Analyze sentiment for many stocks in one call
+    News is fetched concurrently, shared articles are scored once, and
+    FinBERT runs over the union in large batches. Errors are reported per ticker.
+    """
+    tickers = list(dict.fromkeys(t.strip().upper() for t in req.tickers if t.strip()))
+    if not tickers:
+        raise HTTPException(status_code=400, detail="Provide at least one ticker")
+    if len(tickers) > MAX_BATCH_TICKERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many tickers: {len(tickers)} (max {MAX_BATCH_TICKERS})"
+        )
+    
+    started = time.perf_counter()
+    results, stats = await compute_sentiment_batch(tickers, req.days)
+    elapsed = time.perf_counter() - started
+    
+    return {
+        "results": results,
+        "count": len(results),
+        "errors": sum(1 for item in results.values() if "error" in item),
+        **stats,
+        "tickers_per_second": round(len(results) / elapsed, 2) if elapsed > 0 else None
+    }
+
+async def fetch_snapshots(tickers: List[str], timeout: float) -> dict:
+    """
+    Per-ticker market snapshots in parallel; tickers that miss the timeout are left out.
+    They run on the service's bounded snapshot pool, so a timed-out snapshot that hasn't
+    started is cancelled and one already running can't pile up threads behind it.
+    """
+    fetched = await asyncio.gather(*(
+        asyncio.wait_for(asyncio.wrap_future(stock_data_service.submit_market_snapshot(ticker, "1mo")), timeout)
+        for ticker in tickers
+    ), return_exceptions=True)
+    return {ticker: snapshot for ticker, snapshot in zip(tickers, fetched) if not isinstance(snapshot, BaseException)}
+
+def with_timeout(awaitable, timeout: Optional[float]):
+    return awaitable if timeout is None else asyncio.wait_for(awaitable, timeout)
+
+def fetch_error(stage: str, error: BaseException) -> str:
+    if isinstance(error, asyncio.TimeoutError):
+        return f"{stage} timed out"
+    return f"{stage} failed: {error}"
+
+async def compute_sentiment_batch(tickers: List[str], days: int = 7, timeout: Optional[float] = None,
+                                  cache: bool = True) -> tuple:
+    """
+    Sentiment payloads for many tickers, sharing news fetches, market data and inference.
+    Fresh cached payloads are reused; new results are written back to the cache.
+    With a timeout, each ticker's news and market data get their own deadline so one
+    slow stock is reported as an error instead of holding up the rest.
+    cache=False leaves the response cache alone (bulk jobs mustn't evict hot entries).
+    Returns (results by ticker, batch stats).
+    """
+    trace = begin_trace()
+    started = time.perf_counter()
+    timings = {}
+    results = {}
+    pending = []
+    cached = 0
+    
+    for ticker in tickers:
+        if not stock_validator.validate_ticker(ticker):
+            results[ticker] = {"error": f"Invalid stock ticker: {ticker}"}
+            continue
+        entry = sentiment_cache.get((ticker, days), data_versions.get(ticker))
+        if entry is not None:
+            results[ticker] = entry.payload
+            cached += 1
+        else:
+            pending.append(ticker)
+    
+    stats = {"cached": cached, "computed": len(pending)}
+    
+    if pending:
+        names = {ticker: stock_validator.get_company_name(ticker) for ticker in pending}
+        if timeout is None:
+            market_fetch = asyncio.to_thread(stock_data_service.get_market_snapshots, pending, "1mo")
+        else:
+            market_fetch = fetch_snapshots(pending, timeout)
+        market_task = asyncio.create_task(timed(timings, "market", market_fetch))
+        try:
+            report_progress("news", f"Fetching news and market data for {', '.join(pending)}")
+            fetched = await timed(timings, "news", asyncio.gather(
+                *(with_timeout(news_service.fetch_stock_news(names[ticker], ticker, days), timeout) for ticker in pending),
+                return_exceptions=True
+            ))
+            
+            # Score the union of articles once, deduplicated across tickers
+            news_by_ticker = {}
+            unique_texts = {}
+            for ticker, articles in zip(pending, fetched):
+                if isinstance(articles, BaseException):
+                    results[ticker] = {"error": fetch_error("News fetch", articles)}
+                    continue
+                news_by_ticker[ticker] = articles
+                for article in articles:
+                    unique_texts.setdefault(article_text(article), None)
+            
+            texts = list(unique_texts)
+            scored = await timed(timings, "scoring", score_texts(texts))
+            by_text = dict(zip(texts, scored))
+            
+            try:
+                snapshots = await market_task
+            except Exception as e:
+                snapshots = {}
+                print(f"⚠️ Batch market data failed: {e}")
+        finally:
+            # Abandoned (cancelled) batches don't leave the market fetch dangling
+            if not market_task.done():
+                market_task.cancel()
+        
+        for ticker, articles in news_by_ticker.items():
+            snapshot = snapshots.get(ticker)
+            if snapshot is None:
+                results[ticker] = {"error": "Market data unavailable"}
+                continue
+            
+            # One ticker's failure is reported for that ticker; the rest are still published
+            try:
+                if not articles:
+                    payload = no_news_payload(ticker, names[ticker], days, snapshot)
+                else:
+                    sentiments = [by_text[article_text(article)] for article in articles]
+                    analyzed_news = [attach_sentiment(a, s) for a, s in zip(articles, sentiments)]
+                    daily = await update_rollups(ticker, analyzed_news)
+                    payload = build_sentiment_payload(ticker, names[ticker], sentiments, analyzed_news, snapshot, daily)
+            except Exception as e:
+                print(f"❌ Batch sentiment failed for {ticker}: {e}")
+                results[ticker] = {"error": fetch_error("Analysis", e)}
+                continue
+            
+            payload["timings"] = dict(timings)
+            if cache:
+                results[ticker] = publish_payload(ticker, days, payload).payload
+            else:
+                rank_payload(ticker, days, payload)
+                results[ticker] = payload
+        
+        stats["articles"] = sum(len(a) for a in news_by_ticker.values())
+        stats["unique_articles"] = len(texts)
+    
+    timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+    stats.update({"timings": timings, "upstream_calls": trace.summary()})
+    return {ticker: results[ticker] for ticker in tickers}, stats
+
+async def compute_sentiment(stock: str, days: int = 7) -> dict:
+    """
+    Analyze sentiment for a stock using FinBERT-India
     
-    Pipeline:
+    Pipeline (news and market data run concurrently):
     1. Validate stock ticker
-    2. Fetch real Indian financial news
-    3. Run FinBERT-India on each headline
+    2. Fetch real Indian financial news  |  Fetch quote + price history
+    3. Run FinBERT-India on each headline as soon as news arrives
     4. Aggregate sentiment scores
     5. Generate explanation
     """
     
+    trace = begin_trace()
+    started = time.perf_counter()
+    timings = {}
+    
     # Step 1: Validate stock
     stock_upper = stock.upper()
     
@@ -41,108 +465,96 @@ async def analyze_sentiment(
     
     company_name = stock_validator.get_company_name(stock_upper)
     
-    # Step 2: Fetch news
-    news_articles = await news_service.fetch_stock_news(company_name, stock_upper, days)
-    
-    if not news_articles:
-        return {
-            "stock": stock_upper,
-            "company_name": company_name,
-            "sentiment_label": "neutral",
-            "sentiment_score": 0.0,
-            "positive_count": 0,
-            "negative_count": 0,
-            "neutral_count": 0,
-            "explanation": f"No recent news found for {company_name} in the last {days} days. Unable to perform sentiment analysis.",
-            "news": [],
-            "stock_data": stock_data_service.get_stock_info(stock_upper)
-        }
-    
-    # Step 3: Analyze sentiment for each article
-    sentiments = []
-    analyzed_news = []
-    
-    for article in news_articles:
-        # Analyze headline and description
-        text = f"{article['title']}. {article.get('description', '')}"
-        sentiment = finbert_service.analyze_sentiment(text)
+    # Step 2: Start news and market data together
+    report_progress("news", f"Fetching news and market data for {stock_upper}")
+    market_task = asyncio.create_task(timed(
+        timings, "market", asyncio.to_thread(stock_data_service.get_market_snapshot, stock_upper, "1mo")
+    ))
+    try:
+        news_articles = await timed(timings, "news", news_service.fetch_stock_news(company_name, stock_upper, days))
+        report_progress("news", f"Found {len(news_articles)} articles for {stock_upper}", articles=len(news_articles))
         
-        sentiments.append(sentiment)
-        analyzed_news.append({
-            **article,
-            'sentiment': sentiment['label'],
-            'sentiment_score': sentiment['score'],
-            'confidence': sentiment['confidence']
-        })
+        if not news_articles:
+            snapshot = await market_task
+            payload = no_news_payload(stock_upper, company_name, days, snapshot)
+        else:
+            # Step 3: Score news off the event loop while market data is still in flight
+            sentiments, analyzed_news = await timed(timings, "scoring", score_articles(news_articles))
+            daily = await timed(timings, "rollups", update_rollups(stock_upper, analyzed_news))
+            
+            # Steps 4-6: Join market data, aggregate, trends and explanation
+            report_progress("market", f"Combining sentiment with market data for {stock_upper}")
+            snapshot = await market_task
+            payload = build_sentiment_payload(stock_upper, company_name, sentiments, analyzed_news, snapshot, daily)
+    finally:
+        # Abandoned (cancelled) runs don't leave the market fetch dangling
+        if not market_task.done():
+            market_task.cancel()
+    
+    timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+    print(f"📡 Upstream calls for {stock_upper}: {trace.summary()} | timings: {timings}")
     
-    # Step 4: Aggregate sentiment
+    payload["upstream_calls"] = trace.summary()
+    payload["timings"] = timings
+    return payload
+
+def no_news_payload(stock_upper: str, company_name: str, days: int, snapshot: dict) -> dict:
+    return {
+        "stock": stock_upper,
+        "company_name": company_name,
+        "sentiment_label": "neutral",
+        "sentiment_score": 0.0,
+        "positive_count": 0,
+        "negative_count": 0,
+        "neutral_count": 0,
+        "explanation": f"No recent news found for {company_name} in the last {days} days. Unable to perform sentiment analysis.",
+        "news": [],
+        "stock_data": snapshot['quote']
+    }
+
+def trend_reliability(sentiment_trend: list) -> float:
+    """Predictive reliability: share of signal days whose direction the next close confirmed"""
+    if not sentiment_trend:
+        return 50.0
+    prices = np.array([[point['price'] for point in sentiment_trend]], dtype=np.float64)
+    signal = np.array([[point['sentiment_score'] for point in sentiment_trend]], dtype=np.float64)
+    rate, _ = hit_rate(signal, forward_returns(prices))
+    # Too few signal days to judge: report a coin flip rather than a made-up edge
+    return float(rate[0]) * 100 if np.isfinite(rate[0]) else 50.0
+
+def build_sentiment_payload(stock_upper: str, company_name: str, sentiments: list, analyzed_news: list, snapshot: dict, daily: dict) -> dict:
+    """Aggregate scored news with market data into the dashboard payload"""
+    # Aggregate sentiment
     aggregated = finbert_service.aggregate_sentiment(sentiments)
     
-    # Step 5: Get stock data and calculate trends (Moved up before explanation)
-    stock_data = stock_data_service.get_stock_info(stock_upper)
-    historical_data = stock_data_service.get_historical_data(stock_upper, period="1mo")
+    stock_data = snapshot['quote']
+    historical_data = snapshot['history']
     
-    # Calculate Sentiment vs Price Trend
-    daily_sentiments = {}
-    for article in analyzed_news:
-        try:
-            date_str = article.get('published_at', '').split('T')[0]
-            if not date_str: continue
-            if date_str not in daily_sentiments:
-                daily_sentiments[date_str] = {'total_score': 0.0, 'count': 0}
-            daily_sentiments[date_str]['total_score'] += article.get('sentiment_score', 0)
-            daily_sentiments[date_str]['count'] += 1
-        except: continue
-            
+    # Calculate Sentiment vs Price Trend from the ticker's daily rollups
     sentiment_trend = []
     recent_history = historical_data[-15:] if historical_data else []
-    current_agg_score = aggregated['total_score']
+    # Days without news carry the last known daily sentiment forward
+    last_sentiment = 0.0
     
     for day_data in recent_history:
         date = day_data['date']
-        price = day_data['close']
-        sentiment_data = daily_sentiments.get(date, {'total_score': 0, 'count': 0})
-        
-        if sentiment_data['count'] > 0:
-            avg_sentiment = sentiment_data['total_score'] / sentiment_data['count']
-        else:
-            # Synthetic history for graph continuity
-            import random
-            noise = random.uniform(-0.1, 0.1)
-            avg_sentiment = (current_agg_score * 0.8) + noise
+        rollup = daily.get(date)
+        if rollup and rollup['count'] > 0:
+            last_sentiment = rollup['mean']
             
         sentiment_trend.append({
             "date": date,
-            "price": price,
-            "sentiment_score": round(avg_sentiment, 2),
-            "news_count": sentiment_data['count']
+            "price": day_data['close'],
+            "sentiment_score": round(last_sentiment, 2),
+            "news_count": rollup['count'] if rollup else 0
         })
 
-    # Calculate Predictive Reliability
-    hits = 0
-    valid_days = 0
-    if len(sentiment_trend) > 2:
-        for i in range(1, len(sentiment_trend)):
-            prev = sentiment_trend[i-1]
-            curr = sentiment_trend[i]
-            price_change = curr['price'] - prev['price']
-            sentiment_signal = prev['sentiment_score']
-            
-            if (price_change > 0 and sentiment_signal > 0.05) or (price_change < 0 and sentiment_signal < -0.05):
-                hits += 1
-            if abs(sentiment_signal) > 0.05:
-                valid_days += 1
-                
-    predictive_accuracy = (hits / valid_days * 100) if valid_days > 3 else 76.5
-    
-    # Calculate Dynamic Sector Contagion (Pseudo-random based on ticker name)
-    # This ensures "RELIANCE" always gets same value, but "TCS" gets different value
-    import hashlib
-    hash_val = int(hashlib.md5(stock_upper.encode()).hexdigest(), 16)
-    # Map hash to range -0.8 to +0.8
-    sector_contagion = ((hash_val % 160) - 80) / 100
-    
-    # Step 6: Generate explanation (Now with metrics!)
+    predictive_accuracy = trend_reliability(sentiment_trend)
+    
+    # Sector Contagion: mean rolling return correlation with sector peers (precomputed daily)
+    sector_contagion = sector_analytics.contagion(stock_upper)
+    
+    # Generate explanation (Now with metrics!)
     explanation = generate_explanation(
         company_name,
         stock_upper,
@@ -170,7 +582,37 @@ async def analyze_sentiment(
         "sector_name": stock_validator.get_sector(stock_upper)
     }
 
-def generate_explanation(company_name: str, ticker: str, aggregated: dict, news: list, stock_info: dict = None, reliability: float = 0, contagion: float = 0) -> str:
+def derive_window(payload: dict, days: int) -> dict:
+    """
+    Narrow a payload computed over a longer window to the last `days` days:
+    keep only newer articles and re-aggregate them. The sentiment-vs-price trend and
+    its predictive reliability stay on the full window (a handful of sessions can't
+    judge a signal); market data and sector figures are shared.
+    """
+    cutoff = (datetime.utcnow() - timedelta(days=days)).strftime("%Y-%m-%d")
+    news = [a for a in payload.get('news', []) if (a.get('published_at') or '')[:10] >= cutoff]
+    if len(news) == len(payload.get('news', [])):
+        return payload
+    
+    sentiments = [{'label': a['sentiment'], 'score': a['sentiment_score']} for a in news]
+    aggregated = finbert_service.aggregate_sentiment(sentiments)
+    explanation = generate_explanation(
+        payload['company_name'], payload['stock'], aggregated, news, payload.get('stock_data'),
+        payload.get('predictive_reliability', 50.0), payload.get('sector_contagion')
+    ) if news else f"No recent news found for {payload['company_name']} in the last {days} days. Unable to perform sentiment analysis."
+    
+    return {
+        **payload,
+        "sentiment_label": aggregated['label'],
+        "sentiment_score": round(aggregated['total_score'], 2),
+        "positive_count": aggregated['positive_count'],
+        "negative_count": aggregated['negative_count'],
+        "neutral_count": aggregated['neutral_count'],
+        "explanation": explanation,
+        "news": news
+    }
+
+def generate_explanation(company_name: str, ticker: str, aggregated: dict, news: list, stock_info: dict = None, reliability: float = 0, contagion: Optional[float] = None) -> str:
     """Generate comprehensive AI explanation with sentiment + fundamentals + metrics"""
     
     label = aggregated['label']
@@ -209,7 +651,9 @@ def generate_explanation(company_name: str, ticker: str, aggregated: dict, news:
         rel_text = f"Moderate Precision: The model has analyzed {ticker}'s recent patterns and suggests price action is currently driven more by technicals than news flow."
         
     # Contagion Text
-    if contagion < -0.3:
+    if contagion is None:
+        cont_text = f"Sector Correlation: Not enough shared price history yet to measure how {ticker} moves with its sector peers."
+    elif contagion < -0.3:
         cont_text = f"Sector Decoupling: With a contagion score of {contagion}, {ticker} is moving independently of its sector, driven by company-specific news."
     elif contagion > 0.3:
         cont_text = f"Sector Lockstep: A high contagion score of {contagion} indicates {ticker} is moving in sync with broader sector trends."
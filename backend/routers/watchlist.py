@@ -3,17 +3,29 @@ Watchlist Router
 User watchlist management (requires authentication)
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, status
 from pydantic import BaseModel
-from typing import List
+from typing import Dict, List, Optional
 from datetime import datetime
 from services.database import get_database
 from services.stock_validator import stock_validator
+from services.stock_data_service import stock_data_service
+from services.leaderboard import sentiment_leaderboard
+from services.data_versions import data_versions
+from routers.sentiment import sentiment_cache, get_sentiment_entry
+import asyncio
+import os
+import time
 
 from bson import ObjectId
 
 router = APIRouter()
 
+DASHBOARD_BUDGET_MS = int(os.getenv("WATCHLIST_DASHBOARD_BUDGET_MS", 1500))
+# Live sentiment pipelines the dashboard runs at once, across all requests
+DASHBOARD_SENTIMENT_CONCURRENCY = int(os.getenv("WATCHLIST_SENTIMENT_CONCURRENCY", 4))
+dashboard_sentiment_slots = asyncio.Semaphore(DASHBOARD_SENTIMENT_CONCURRENCY)
+
 class WatchlistItem(BaseModel):
     ticker: str
 
@@ -71,16 +83,19 @@ async def add_to_watchlist(
         "company_name": company_name
     }
 
+async def load_watchlist(user_id: str) -> List[dict]:
+    """Watchlist documents for a user, newest first"""
+    db = get_database()
+    cursor = db.watchlists.find({"user_id": user_id}).sort("added_at", -1)
+    return await cursor.to_list(length=100)
+
 @router.get("/watchlist")
 async def get_watchlist():
     """Get user's watchlist"""
     current_user = {"_id": "public_user_id"}
     
     user_id = str(current_user['_id'])
-    db = get_database()
-    
-    cursor = db.watchlists.find({"user_id": user_id}).sort("added_at", -1)
-    watchlist = await cursor.to_list(length=100)
+    watchlist = await load_watchlist(user_id)
     
     return {
         "watchlist": [
@@ -120,3 +135,151 @@ async def remove_from_watchlist(
         "message": f"Removed {ticker} from watchlist",
         "ticker": ticker
     }
+
+def change_percent(quote: dict) -> float:
+    price = quote.get('current_price') or 0
+    previous = quote.get('previous_close') or 0
+    return round((price - previous) / previous * 100, 2) if previous > 0 else 0.0
+
+def quote_view(quote: dict, source: str, age: float) -> dict:
+    if 'error' in quote:
+        return {"source": "error", "error": quote['error']}
+    return {
+        "price": quote.get('current_price', 0),
+        "change_percent": change_percent(quote),
+        "source": source,
+        "age_seconds": round(age, 1)
+    }
+
+def sentiment_view(payload: dict, source: str, age: float) -> dict:
+    return {
+        "score": payload.get('sentiment_score', 0.0),
+        "label": payload.get('sentiment_label', 'neutral'),
+        "news_count": len(payload.get('news', [])),
+        "source": source,
+        "age_seconds": round(age, 1)
+    }
+
+def precomputed_sentiment(row: dict) -> dict:
+    """Sentiment from a leaderboard row (snapshot run or an earlier live computation)"""
+    return {
+        "score": row['score'],
+        "label": row.get('label', 'neutral'),
+        "news_count": row.get('news_count', 0),
+        "source": "precomputed",
+        "age_seconds": row['age_seconds']
+    }
+
+def detach(task: asyncio.Task):
+    """Let an over-budget fetch finish in the background (it still warms the caches)"""
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+async def bounded_sentiment(ticker: str, days: int, running: set):
+    """get_sentiment_entry once a dashboard slot is free; records the ticker as running meanwhile"""
+    async with dashboard_sentiment_slots:
+        running.add(ticker)
+        return await get_sentiment_entry(ticker, days)
+
+@router.get("/watchlist/dashboard")
+async def get_watchlist_dashboard(
+    days: int = Query(7, ge=1, le=30, description="Sentiment window in days"),
+    budget_ms: int = Query(DASHBOARD_BUDGET_MS, ge=50, le=30000, description="Time to wait for live fetches")
+):
+    """
+    Quote and sentiment for every watchlisted stock in one call
+    Fresh cached quotes/sentiment and precomputed leaderboard rows are used as-is;
+    the rest are fetched concurrently until the latency budget runs out. Each item
+    reports where its data came from and how old it is; anything still loading is
+    marked pending and lands in the caches for the next call. Sentiment pipelines share
+    a fixed number of slots; ones still waiting for a slot when the budget ends are dropped.
+    """
+    started = time.perf_counter()
+    current_user = {"_id": "public_user_id"}
+    watchlist = await load_watchlist(str(current_user['_id']))
+    
+    now = time.time()
+    items: Dict[str, dict] = {}
+    precomputed: Dict[str, Optional[dict]] = {}
+    quote_jobs: Dict[str, asyncio.Task] = {}
+    sentiment_jobs: Dict[str, asyncio.Task] = {}
+    sentiment_running = set()
+    for doc in watchlist:
+        ticker = doc['ticker']
+        item = items[ticker] = {
+            "ticker": ticker,
+            "company_name": doc['company_name'],
+            "sector": stock_validator.get_sector(ticker),
+            "added_at": doc['added_at'].isoformat()
+        }
+        # Leaderboard rows hold the latest sentiment over its window only
+        row = precomputed[ticker] = sentiment_leaderboard.get(ticker) if days == sentiment_leaderboard.window else None
+        
+        cached = stock_data_service.peek_quote(ticker)
+        if cached is not None:
+            quote, age = cached
+            item["quote"] = quote_view(quote, "live", age)
+        else:
+            quote_jobs[ticker] = asyncio.create_task(asyncio.to_thread(stock_data_service.get_stock_info, ticker))
+        
+        entry = sentiment_cache.get((ticker, days), data_versions.get(ticker))
+        if entry is not None:
+            item["sentiment"] = sentiment_view(entry.payload, "live", now - entry.created_at)
+        elif row is not None:
+            item["sentiment"] = precomputed_sentiment(row)
+        else:
+            sentiment_jobs[ticker] = asyncio.create_task(bounded_sentiment(ticker, days, sentiment_running))
+    
+    jobs = list(quote_jobs.values()) + list(sentiment_jobs.values())
+    if jobs:
+        remaining = budget_ms / 1000 - (time.perf_counter() - started)
+        await asyncio.wait(jobs, timeout=max(remaining, 0))
+    
+    pending = set()
+    for ticker, task in quote_jobs.items():
+        item = items[ticker]
+        if task.done():
+            quote = None if task.cancelled() or task.exception() else task.result()
+            item["quote"] = quote_view(quote, "live", 0.0) if quote else {"source": "error", "error": "Quote unavailable"}
+            continue
+        detach(task)
+        row = precomputed[ticker]
+        if row is not None and row.get('price'):
+            item["quote"] = {
+                "price": row['price'],
+                "change_percent": row.get('change_percent', 0.0),
+                "source": "precomputed",
+                "age_seconds": row['age_seconds']
+            }
+        else:
+            item["quote"] = {"source": "pending"}
+            pending.add(ticker)
+    
+    for ticker, task in sentiment_jobs.items():
+        item = items[ticker]
+        if not task.done():
+            # Already running: finish in the background to warm the cache; still queued: drop
+            if ticker in sentiment_running:
+                detach(task)
+            else:
+                task.cancel()
+            item["sentiment"] = {"source": "pending"}
+            pending.add(ticker)
+        elif task.cancelled() or task.exception():
+            error = "cancelled" if task.cancelled() else str(task.exception())
+            item["sentiment"] = {"source": "error", "error": error}
+        else:
+            entry = task.result()
+            item["sentiment"] = sentiment_view(entry.payload, "live", time.time() - entry.created_at)
+    
+    for item in items.values():
+        item["stale"] = item["quote"]["source"] != "live" or item["sentiment"]["source"] != "live"
+    
+    return {
+        "items": list(items.values()),
+        "count": len(items),
+        "days": days,
+        "complete": not pending,
+        "pending": sorted(pending),
+        "budget_ms": budget_ms,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+    }
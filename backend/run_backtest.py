@@ -0,0 +1,82 @@
+"""
+fIndia AI - Sentiment Backtest CLI
+Backtests stored daily sentiment rollups against price history
+
+Usage:
+    python run_backtest.py --index NIFTY50 --period 2y
+    python run_backtest.py --tickers TCS,INFY,WIPRO --horizon 5 --json
+"""
+
+import argparse
+import asyncio
+import json
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from services.database import connect_to_mongo, close_mongo_connection
+from services.stock_validator import stock_validator
+from services.backtest import backtest_engine, DEFAULT_THRESHOLD
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Backtest news sentiment against subsequent returns")
+    parser.add_argument("--tickers", help="Comma-separated tickers")
+    parser.add_argument("--index", help="Index preset, e.g. NIFTY50")
+    parser.add_argument("--all", action="store_true", help="Whole stock universe")
+    parser.add_argument("--period", default="1y", help="Price window (3mo, 6mo, 1y, 2y, 5y)")
+    parser.add_argument("--horizon", type=int, default=1, help="Forward return horizon in sessions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Minimum |sentiment| to trade")
+    parser.add_argument("--fill-days", type=int, default=0, help="Carry sentiment over newsless sessions")
+    parser.add_argument("--json", action="store_true", help="Print the full JSON result")
+    return parser.parse_args()
+
+def resolve(args):
+    if args.all:
+        return list(stock_validator.stocks.keys())
+    if args.index:
+        tickers = stock_validator.get_index_constituents(args.index)
+        if tickers is None:
+            raise SystemExit(f"Unknown index: {args.index}")
+        return tickers
+    if args.tickers:
+        return [t.strip().upper() for t in args.tickers.split(",") if t.strip()]
+    raise SystemExit("Provide --tickers, --index or --all")
+
+def fmt(value, pattern="{:+.3f}"):
+    return "-" if value is None else pattern.format(value)
+
+def print_report(result):
+    print(f"\n{len(result['tickers'])} tickers | {result.get('start')} -> {result.get('end')} | {result.get('sessions', 0)} sessions\n")
+    print(f"{'ticker':<14}{'hit rate':>10}{'signals':>9}{'IC':>9}{'rank IC':>9}{'return':>10}{'sharpe':>9}{'max DD':>9}")
+    for ticker, row in result['results'].items():
+        print(f"{ticker:<14}{fmt(row['hit_rate'], '{:.1%}'):>10}{row['signal_days']:>9}{fmt(row['ic']):>9}{fmt(row['rank_ic']):>9}"
+              f"{fmt(row['total_return'], '{:+.1%}'):>10}{fmt(row['sharpe'], '{:+.2f}'):>9}{fmt(row['max_drawdown'], '{:.1%}'):>9}")
+
+    portfolio = result['portfolio']
+    print("\nLong/short portfolio (equal weight across active signals):")
+    print(f"  total return {fmt(portfolio.get('total_return'), '{:+.2%}')} | sharpe {fmt(portfolio.get('sharpe'), '{:+.2f}')}"
+          f" | max drawdown {fmt(portfolio.get('max_drawdown'), '{:.2%}')}")
+    print(f"  mean cross-sectional IC {fmt(portfolio.get('mean_cross_sectional_ic'))} | IC IR {fmt(portfolio.get('ic_ir'), '{:+.2f}')}")
+
+async def main():
+    args = parse_args()
+    tickers = resolve(args)
+
+    # Rollups live in MongoDB; without it only this process's (empty) memory table is available
+    try:
+        await connect_to_mongo()
+    except Exception as e:
+        print(f"⚠️ MongoDB unavailable, no stored sentiment to backtest: {e}")
+
+    try:
+        result = await backtest_engine.run(tickers, args.period, args.horizon, args.threshold, args.fill_days)
+    finally:
+        await close_mongo_connection()
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
+
+if __name__ == "__main__":
+    asyncio.run(main())
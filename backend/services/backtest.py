@@ -0,0 +1,235 @@
+"""
+Sentiment Backtest Engine
+Vectorized sentiment-vs-price evaluation over aligned (tickers, days) matrices:
+hit rate, information coefficient, lagged correlations and long/short signal P&L
+"""
+
+import asyncio
+import numpy as np
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+from services.stock_data_service import stock_data_service
+from services.sentiment_rollups import sentiment_rollups
+from services.indicators import stack_on_dates
+from services.market_hours import IST
+
+TRADING_DAYS = 252
+DEFAULT_THRESHOLD = 0.05
+DEFAULT_LAGS = tuple(range(-5, 6))
+# Below this many observations a ticker's statistics are reported as null
+MIN_OBSERVATIONS = 4
+
+# ---------- Vectorized kernels over (tickers, time) matrices ----------
+
+def shift(x: np.ndarray, k: int) -> np.ndarray:
+    """Shift columns right by k (left if negative), NaN-filling the gap"""
+    out = np.full(x.shape, np.nan)
+    if k == 0:
+        out[:] = x
+    elif k > 0 and k < x.shape[1]:
+        out[:, k:] = x[:, :-k]
+    elif k < 0 and -k < x.shape[1]:
+        out[:, :k] = x[:, -k:]
+    return out
+
+def forward_returns(close: np.ndarray, horizon: int = 1) -> np.ndarray:
+    """Return from day t to day t+horizon, aligned on t"""
+    return shift(close, -horizon) / close - 1.0
+
+def forward_fill(x: np.ndarray, limit: Optional[int] = None) -> np.ndarray:
+    """Carry each row's last valid value forward (at most `limit` columns)"""
+    cols = np.arange(x.shape[1])
+    last = np.where(~np.isnan(x), cols, -1)
+    np.maximum.accumulate(last, axis=1, out=last)
+    out = np.take_along_axis(x, np.maximum(last, 0), axis=1)
+    stale = last < 0
+    if limit is not None:
+        stale |= (cols - last) > limit
+    out[stale] = np.nan
+    return out
+
+def masked_corr(a: np.ndarray, b: np.ndarray, axis: int = 1) -> tuple:
+    """Pearson correlation along an axis over pairwise-valid entries; returns (corr, n)"""
+    valid = ~(np.isnan(a) | np.isnan(b))
+    n = valid.sum(axis=axis)
+    a0 = np.where(valid, a, 0.0)
+    b0 = np.where(valid, b, 0.0)
+    # Single pass of raw moments instead of centering full matrices
+    sa, sb = a0.sum(axis=axis), b0.sum(axis=axis)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = np.einsum('ij,ij->' + ('i' if axis == 1 else 'j'), a0, b0) - sa * sb / n
+        var_a = np.einsum('ij,ij->' + ('i' if axis == 1 else 'j'), a0, a0) - sa * sa / n
+        var_b = np.einsum('ij,ij->' + ('i' if axis == 1 else 'j'), b0, b0) - sb * sb / n
+        corr = cov / np.sqrt(var_a * var_b)
+    corr[n < MIN_OBSERVATIONS] = np.nan
+    return corr, n
+
+def rank(x: np.ndarray, axis: int = 1) -> np.ndarray:
+    """Ordinal ranks along an axis, NaN kept as NaN"""
+    order = np.argsort(np.where(np.isnan(x), np.inf, x), axis=axis, kind='stable')
+    ranks = np.empty_like(order, dtype=np.float64)
+    np.put_along_axis(ranks, order, np.arange(x.shape[axis], dtype=np.float64).reshape(
+        [-1 if i == axis else 1 for i in range(x.ndim)]), axis=axis)
+    ranks[np.isnan(x)] = np.nan
+    return ranks
+
+def hit_rate(signal: np.ndarray, fwd: np.ndarray, threshold: float = DEFAULT_THRESHOLD) -> tuple:
+    """Share of active signal days whose sign matched the forward return; returns (rate, n)"""
+    active = (np.abs(signal) > threshold) & ~np.isnan(fwd)
+    hits = (active & (np.sign(signal) == np.sign(fwd))).sum(axis=1)
+    n = active.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rate = hits / n
+    rate[n < MIN_OBSERVATIONS] = np.nan
+    return rate, n
+
+def positions(signal: np.ndarray, threshold: float = DEFAULT_THRESHOLD) -> np.ndarray:
+    """Long above +threshold, short below -threshold, flat otherwise (and with no signal)"""
+    return np.where(np.isnan(signal), 0.0, np.sign(signal) * (np.abs(signal) > threshold))
+
+def pnl_stats(daily: np.ndarray) -> Dict[str, np.ndarray]:
+    """Cumulative return, annualized Sharpe and max drawdown per row of daily P&L"""
+    daily = np.nan_to_num(daily)
+    equity = np.cumprod(1.0 + daily, axis=1)
+    peak = np.maximum.accumulate(equity, axis=1)
+    std = daily.std(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sharpe = np.where(std > 0, daily.mean(axis=1) / std * np.sqrt(TRADING_DAYS), np.nan)
+    return {
+        "total_return": equity[:, -1] - 1.0 if daily.shape[1] else np.zeros(daily.shape[0]),
+        "sharpe": sharpe,
+        "max_drawdown": (equity / peak - 1.0).min(axis=1) if daily.shape[1] else np.zeros(daily.shape[0])
+    }
+
+def run_backtest(sentiment: np.ndarray, close: np.ndarray, horizon: int = 1,
+                 threshold: float = DEFAULT_THRESHOLD, lags: Sequence[int] = DEFAULT_LAGS) -> Dict:
+    """
+    Evaluate a (tickers, days) sentiment matrix against aligned closes in one pass.
+    Sentiment on day t is traded at day t's close and judged on the return to t+horizon;
+    rollups assign news to the first session closing after publication, so day t's
+    sentiment was already public at that close.
+    """
+    fwd = forward_returns(close, horizon)
+    daily_ret = shift(close, -1) / close - 1.0
+
+    hits, signal_days = hit_rate(sentiment, fwd, threshold)
+    ic, ic_days = masked_corr(sentiment, fwd)
+    rank_ic, _ = masked_corr(rank(sentiment), rank(fwd))
+
+    # Cross-sectional IC: correlation across tickers on each day, then its mean and IR
+    daily_ic, breadth = masked_corr(sentiment, fwd, axis=0)
+    daily_ic = daily_ic[breadth >= MIN_OBSERVATIONS]
+    daily_ic = daily_ic[~np.isnan(daily_ic)]
+
+    # Lagged correlation: sentiment on t vs the one-day return starting at t+lag
+    # (negative lags: did sentiment follow the price move?)
+    lagged = np.column_stack([masked_corr(sentiment, shift(daily_ret, -lag))[0] for lag in lags]) \
+        if len(lags) else np.empty((sentiment.shape[0], 0))
+
+    # Long/short: hold the signal's direction over the next day
+    held = positions(sentiment, threshold)
+    per_ticker_pnl = held * np.nan_to_num(daily_ret)
+    active = (held != 0).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        portfolio_pnl = np.where(active > 0, per_ticker_pnl.sum(axis=0) / active, 0.0)
+
+    return {
+        "hit_rate": hits,
+        "signal_days": signal_days,
+        "ic": ic,
+        "rank_ic": rank_ic,
+        "ic_days": ic_days,
+        "lagged_corr": lagged,
+        "lags": list(lags),
+        "pnl": pnl_stats(per_ticker_pnl),
+        "portfolio": {
+            **{k: v[0] for k, v in pnl_stats(portfolio_pnl[np.newaxis, :]).items()},
+            "mean_cross_sectional_ic": daily_ic.mean() if len(daily_ic) else np.nan,
+            "ic_ir": daily_ic.mean() / daily_ic.std() if len(daily_ic) > 1 and daily_ic.std() > 0 else np.nan,
+            "avg_positions": active.mean() if len(active) else 0.0
+        }
+    }
+
+def clean(value) -> Optional[float]:
+    """JSON-safe float (NaN/inf -> None)"""
+    value = float(value)
+    return round(value, 4) if np.isfinite(value) else None
+
+# ---------- Panel assembly and engine ----------
+
+def align_sentiment(dates: np.ndarray, daily: List[Dict]) -> np.ndarray:
+    """Place per-day rollup means on a trading-date grid (NaN on days without news)"""
+    if not daily:
+        return np.full(len(dates), np.nan)
+    days = np.array([d['date'] for d in daily], dtype='datetime64[D]')
+    means = np.array([d['mean'] for d in daily])
+    # News on a non-trading day counts toward the next session
+    idx = np.searchsorted(dates, days)
+    inside = idx < len(dates)
+    sums = np.bincount(idx[inside], weights=means[inside], minlength=len(dates))
+    counts = np.bincount(idx[inside], minlength=len(dates))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+def lookback_days(start: np.datetime64) -> int:
+    """Rollup trend window (counted back from today, IST) that reaches back to `start`"""
+    today = np.datetime64(datetime.now(IST).date(), 'D')
+    return max(int((today - start).astype(int)), 0)
+
+class BacktestEngine:
+    async def load_panel(self, tickers: List[str], period: str = "1y") -> Dict:
+        """Aligned close and daily sentiment matrices from the price store and sentiment rollups"""
+        windows = await asyncio.to_thread(stock_data_service.get_history_arrays_many, tickers, period)
+        tickers = [t for t in tickers if windows.get(t) is not None]
+        if not tickers:
+            return {"tickers": [], "dates": np.array([], dtype='datetime64[D]'),
+                    "close": np.empty((0, 0)), "sentiment": np.empty((0, 0))}
+
+        dates, close = stack_on_dates([windows[t] for t in tickers])
+        days = lookback_days(dates[0])
+        trends = await asyncio.gather(*(sentiment_rollups.trend(t, days) for t in tickers))
+        sentiment = np.vstack([align_sentiment(dates, daily) for daily in trends])
+        return {"tickers": tickers, "dates": dates, "close": close, "sentiment": sentiment}
+
+    async def run(self, tickers: List[str], period: str = "1y", horizon: int = 1,
+                  threshold: float = DEFAULT_THRESHOLD, fill_days: int = 0) -> Dict:
+        """
+        Backtest rollup sentiment against prices for many tickers.
+        fill_days carries a day's sentiment forward over that many newsless sessions.
+        """
+        panel = await self.load_panel(tickers, period)
+        sentiment = panel['sentiment']
+        if fill_days > 0 and sentiment.size:
+            sentiment = forward_fill(sentiment, fill_days)
+        if not panel['tickers']:
+            return {"tickers": [], "portfolio": {}, "results": {}}
+
+        result = await asyncio.to_thread(run_backtest, sentiment, panel['close'], horizon, threshold)
+        return self.summarize(panel['tickers'], panel['dates'], result)
+
+    def summarize(self, tickers: List[str], dates: np.ndarray, result: Dict) -> Dict:
+        pnl = result['pnl']
+        per_ticker = {}
+        for i, ticker in enumerate(tickers):
+            per_ticker[ticker] = {
+                "hit_rate": clean(result['hit_rate'][i]),
+                "signal_days": int(result['signal_days'][i]),
+                "ic": clean(result['ic'][i]),
+                "rank_ic": clean(result['rank_ic'][i]),
+                "observations": int(result['ic_days'][i]),
+                "lagged_corr": {str(lag): clean(c) for lag, c in zip(result['lags'], result['lagged_corr'][i])},
+                "total_return": clean(pnl['total_return'][i]),
+                "sharpe": clean(pnl['sharpe'][i]),
+                "max_drawdown": clean(pnl['max_drawdown'][i])
+            }
+        return {
+            "tickers": tickers,
+            "start": str(dates[0]) if len(dates) else None,
+            "end": str(dates[-1]) if len(dates) else None,
+            "sessions": int(len(dates)),
+            "portfolio": {k: clean(v) for k, v in result['portfolio'].items()},
+            "results": per_ticker
+        }
+
+# Singleton instance
+backtest_engine = BacktestEngine()
@@ -0,0 +1,28 @@
+"""
+Data Version Registry
+Per-ticker counters bumped whenever new articles or a changed quote arrive
+"""
+
+from typing import Dict, Tuple
+import threading
+
+NEWS = "news"
+QUOTE = "quote"
+
+class DataVersions:
+    def __init__(self):
+        self._versions: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def bump(self, kind: str, ticker: str):
+        with self._lock:
+            key = (kind, ticker.upper())
+            self._versions[key] = self._versions.get(key, 0) + 1
+
+    def get(self, ticker: str) -> Tuple[int, int]:
+        """(news version, quote version) for a ticker"""
+        ticker = ticker.upper()
+        return self._versions.get((NEWS, ticker), 0), self._versions.get((QUOTE, ticker), 0)
+
+# Singleton instance
+data_versions = DataVersions()
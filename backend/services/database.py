@@ -17,7 +17,8 @@ async def connect_to_mongo():
     """Connect to MongoDB"""
     try:
         mongo_uri = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
-        db_instance.client = AsyncIOMotorClient(mongo_uri)
+        timeout_ms = int(os.getenv("MONGODB_TIMEOUT_MS", 5000))
+        db_instance.client = AsyncIOMotorClient(mongo_uri, serverSelectionTimeoutMS=timeout_ms)
         db_instance.db = db_instance.client.findia_ai
         
         # Test connection
@@ -31,6 +32,10 @@ async def connect_to_mongo():
         
     except ConnectionFailure as e:
         print(f"❌ Failed to connect to MongoDB: {e}")
+        # Leave no half-initialized handle behind: callers treat None as "no database"
+        db_instance.client.close()
+        db_instance.client = None
+        db_instance.db = None
         raise
 
 async def close_mongo_connection():
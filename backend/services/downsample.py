@@ -0,0 +1,74 @@
+"""
+Chart Downsampling Service
+Reduces long price series to a target point count for charting
+"""
+
+import numpy as np
+from typing import Dict
+
+def bucket_edges(length: int, buckets: int) -> np.ndarray:
+    """Start index of each of `buckets` near-equal buckets over `length` points"""
+    return np.linspace(0, length, buckets + 1).astype(np.int64)[:-1]
+
+def lttb(x: np.ndarray, y: np.ndarray, points: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets, returning indices of the kept points.
+
+    First and last points are always kept. Each inner bucket keeps the point
+    forming the largest triangle with the previous bucket's average and the
+    next bucket's average, so every bucket is scored in one vectorized pass.
+    """
+    n = len(y)
+    if points >= n or points < 3:
+        return np.arange(n)
+
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+
+    # Inner points [1, n-1) split into points-2 buckets
+    inner = points - 2
+    starts = 1 + bucket_edges(n - 2, inner)
+    ends = np.append(starts[1:], n - 1)
+    sizes = ends - starts
+
+    # Bucket means via cumulative sums
+    cx = np.concatenate([[0.0], np.cumsum(x)])
+    cy = np.concatenate([[0.0], np.cumsum(y)])
+    mean_x = (cx[ends] - cx[starts]) / sizes
+    mean_y = (cy[ends] - cy[starts]) / sizes
+
+    # Anchors: previous bucket mean (first point for bucket 0), next bucket mean (last point for the final bucket)
+    prev_x = np.concatenate([[x[0]], mean_x[:-1]])
+    prev_y = np.concatenate([[y[0]], mean_y[:-1]])
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    # Score every candidate point against its bucket's anchors
+    bucket = np.repeat(np.arange(inner), sizes)
+    idx = np.arange(1, n - 1)
+    area = np.abs(
+        (prev_x[bucket] - next_x[bucket]) * (y[idx] - prev_y[bucket])
+        - (prev_x[bucket] - x[idx]) * (next_y[bucket] - prev_y[bucket])
+    )
+
+    # Arg-max per bucket: sort by (bucket, area) and take the last entry of each bucket
+    order = np.lexsort((area, bucket))
+    best = order[ends - 2]
+    return np.concatenate([[0], idx[best], [n - 1]])
+
+def ohlc_buckets(columns: Dict[str, np.ndarray], points: int) -> Dict[str, np.ndarray]:
+    """Aggregate OHLCV bars into `points` buckets (first open, max high, min low, last close, total volume)"""
+    n = len(columns['close'])
+    if points >= n or points < 1:
+        return columns
+
+    starts = bucket_edges(n, points)
+    ends = np.append(starts[1:], n)
+    return {
+        'date': columns['date'][starts],
+        'open': columns['open'][starts],
+        'high': np.maximum.reduceat(columns['high'], starts),
+        'low': np.minimum.reduceat(columns['low'], starts),
+        'close': columns['close'][ends - 1],
+        'volume': np.add.reduceat(columns['volume'], starts),
+    }
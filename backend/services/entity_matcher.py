@@ -0,0 +1,196 @@
+"""
+Stock Mention Matcher
+Aho-Corasick automaton over tickers, company names and aliases.
+Built once per stock universe; finds every mention in a message in one linear scan.
+"""
+
+import re
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+# Common short names that aren't already a ticker or full company name
+ALIASES: Dict[str, str] = {
+    "SBI": "SBIN", "STATE BANK": "SBIN",
+    "AIRTEL": "BHARTIARTL",
+    "L&T": "LT", "LARSEN": "LT",
+    "HUL": "HINDUNILVR", "HINDUSTAN UNILEVER": "HINDUNILVR",
+    "RIL": "RELIANCE",
+    "MAHINDRA AND MAHINDRA": "M&M",
+    "TATA CONSULTANCY": "TCS",
+    "INFOSYS LTD": "INFY",
+    "DR REDDY": "DRREDDY", "DR REDDYS": "DRREDDY", "DR. REDDY'S": "DRREDDY",
+    "VODAFONE": "IDEA", "VI": "IDEA",
+    "ZEE": "ZEEL",
+}
+
+# Generic trailing words dropped from company names to form an extra alias
+NAME_SUFFIXES = {"ltd", "limited", "industries", "company", "corporation", "corp", "enterprises"}
+
+# Curated-universe patterns that are also ordinary English words: only matched when written
+# in capitals. Beyond a trusted set (see StockMatcher), every one-word pattern needs capitals.
+AMBIGUOUS_WORDS = {
+    "idea", "titan", "amber", "sail", "rec", "trent", "prestige", "escorts", "granules",
+    "persistent", "brigade", "chalet", "dixon", "hal", "bel", "acc", "gail", "arvind",
+    "raymond", "vi", "lupin", "dabur", "cipla"
+}
+
+WHITESPACE = re.compile(r"\s+")
+
+def normalize(text: str) -> str:
+    return WHITESPACE.sub(" ", text).strip()
+
+def is_word_char(ch: str) -> bool:
+    return ch.isalnum()
+
+class Mention:
+    __slots__ = ("ticker", "start", "end", "text")
+
+    def __init__(self, ticker: str, start: int, end: int, text: str):
+        self.ticker = ticker
+        self.start = start
+        self.end = end
+        self.text = text
+
+    def to_dict(self) -> Dict:
+        return {"ticker": self.ticker, "start": self.start, "end": self.end, "text": self.text}
+
+class StockMatcher:
+    def __init__(self, stocks: Dict[str, str], aliases: Optional[Dict[str, str]] = None,
+                 trusted: Optional[Set[str]] = None):
+        """
+        trusted: tickers whose one-word patterns may match in any case. None trusts every
+        ticker (curated universe); with the full symbol master the long tail (FACT, RAIN,
+        STAR...) is too full of dictionary words, so only these match in lowercase.
+        """
+        self.trusted = trusted
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        # Per state: (pattern length, ticker, needs capitals) for every pattern ending there
+        self.output: List[List[Tuple[int, str, bool]]] = [[]]
+        self.patterns = 0
+        self._build(self._patterns(stocks, aliases if aliases is not None else ALIASES))
+
+    # ---- Build ----
+
+    def _patterns(self, stocks: Dict[str, str], aliases: Dict[str, str]) -> Dict[str, str]:
+        """Lowercased pattern -> ticker. Patterns claimed by two tickers are dropped."""
+        patterns: Dict[str, Optional[str]] = {}
+
+        def add(text: str, ticker: str):
+            key = normalize(text).lower()
+            if not key:
+                return
+            if key in patterns and patterns[key] != ticker:
+                patterns[key] = None  # ambiguous, e.g. "hdfc"
+            else:
+                patterns[key] = ticker
+
+        for ticker, name in stocks.items():
+            add(ticker, ticker)
+            add(name, ticker)
+            words = name.split()
+            if len(words) > 1 and words[-1].lower() in NAME_SUFFIXES:
+                add(" ".join(words[:-1]), ticker)
+        for alias, ticker in aliases.items():
+            if ticker in stocks:
+                add(alias, ticker)
+
+        # Tickers always win over an alias clash with their own symbol
+        for ticker in stocks:
+            patterns[ticker.lower()] = ticker
+        return {k: v for k, v in patterns.items() if v is not None}
+
+    def _needs_caps(self, pattern: str, ticker: str) -> bool:
+        if pattern in AMBIGUOUS_WORDS:
+            return True
+        return self.trusted is not None and ticker not in self.trusted and " " not in pattern
+
+    def _build(self, patterns: Dict[str, str]):
+        for pattern, ticker in patterns.items():
+            state = 0
+            for ch in pattern:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = nxt
+            self.output[state].append((len(pattern), ticker, self._needs_caps(pattern, ticker)))
+        self.patterns = len(patterns)
+
+        # Breadth-first failure links; outputs inherit their suffix states' outputs
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    # ---- Match ----
+
+    def find(self, text: str) -> List[Mention]:
+        """
+        Every stock mention in the text, leftmost-longest and non-overlapping.
+        Matches must sit on word boundaries; ambiguous words must be in capitals.
+        """
+        text = normalize(text)
+        lowered = text.lower()
+        n = len(lowered)
+        goto, fail, output = self.goto, self.fail, self.output
+        candidates = []
+
+        state = 0
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, ticker, needs_caps in output[state]:
+                start = i - length + 1
+                end = i + 1
+                if start > 0 and is_word_char(lowered[start - 1]) and is_word_char(lowered[start]):
+                    continue
+                if end < n and is_word_char(lowered[end]) and is_word_char(lowered[i]):
+                    continue
+                if needs_caps and not text[start:end].isupper():
+                    continue
+                candidates.append((start, -length, ticker))
+
+        candidates.sort()
+        mentions: List[Mention] = []
+        covered = 0
+        for start, neg_length, ticker in candidates:
+            if start < covered:
+                continue
+            end = start - neg_length
+            mentions.append(Mention(ticker, start, end, text[start:end]))
+            covered = end
+        return mentions
+
+    def find_tickers(self, text: str) -> List[str]:
+        """Distinct mentioned tickers in order of first appearance"""
+        return list(dict.fromkeys(m.ticker for m in self.find(text)))
+
+class StockMatcherService:
+    """Holds the matcher for the current stock universe"""
+
+    def __init__(self):
+        self.matcher: Optional[StockMatcher] = None
+
+    def rebuild(self, stocks: Dict[str, str], trusted: Optional[Set[str]] = None):
+        # Build fully before swapping so concurrent readers never see a partial automaton
+        self.matcher = StockMatcher(stocks, trusted=trusted)
+
+    def find(self, text: str) -> List[Mention]:
+        return self.matcher.find(text) if self.matcher else []
+
+    def find_tickers(self, text: str) -> List[str]:
+        return self.matcher.find_tickers(text) if self.matcher else []
+
+# Singleton instance
+stock_matcher = StockMatcherService()
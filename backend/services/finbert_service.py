@@ -47,6 +47,39 @@ class FinBERTService:
             print(f"❌ Error loading FinBERT model: {e}")
             raise
     
+    def _map_result(self, result: Dict) -> Dict[str, any]:
+        """Convert a pipeline result to the standardized sentiment format"""
+        label = result['label'].lower()
+        score = result['score']
+        
+        # Map to positive/negative with confidence
+        if label in ['positive', 'label_2']:
+            return {
+                'label': 'positive',
+                'score': score,
+                'confidence': score
+            }
+        elif label in ['negative', 'label_0']:
+            return {
+                'label': 'negative',
+                'score': -score,  # Negative score
+                'confidence': score
+            }
+        else:  # neutral or label_1
+            return {
+                'label': 'neutral',
+                'score': 0.0,
+                'confidence': score
+            }
+    
+    def _error_result(self, e: Exception) -> Dict[str, any]:
+        return {
+            'label': 'neutral',
+            'score': 0.0,
+            'confidence': 0.0,
+            'error': str(e)
+        }
+    
     def analyze_sentiment(self, text: str) -> Dict[str, any]:
         """
         Analyze sentiment of financial text
@@ -54,43 +87,26 @@ class FinBERTService:
         """
         try:
             result = self.sentiment_pipeline(text[:512])[0]  # Truncate to max length
-            
-            # Convert label to standardized format
-            label = result['label'].lower()
-            score = result['score']
-            
-            # Map to positive/negative with confidence
-            if label in ['positive', 'label_2']:
-                return {
-                    'label': 'positive',
-                    'score': score,
-                    'confidence': score
-                }
-            elif label in ['negative', 'label_0']:
-                return {
-                    'label': 'negative',
-                    'score': -score,  # Negative score
-                    'confidence': score
-                }
-            else:  # neutral or label_1
-                return {
-                    'label': 'neutral',
-                    'score': 0.0,
-                    'confidence': score
-                }
+            return self._map_result(result)
                 
         except Exception as e:
             print(f"Error analyzing sentiment: {e}")
-            return {
-                'label': 'neutral',
-                'score': 0.0,
-                'confidence': 0.0,
-                'error': str(e)
-            }
+            return self._error_result(e)
     
-    def analyze_batch(self, texts: List[str]) -> List[Dict[str, any]]:
-        """Analyze sentiment for multiple texts"""
-        return [self.analyze_sentiment(text) for text in texts]
+    def analyze_batch(self, texts: List[str], batch_size: int = 32) -> List[Dict[str, any]]:
+        """
+        Analyze sentiment for multiple texts
+        Runs the model on padded batches instead of one forward pass per text
+        """
+        if not texts:
+            return []
+        
+        try:
+            results = self.sentiment_pipeline([text[:512] for text in texts], batch_size=batch_size)
+            return [self._map_result(result) for result in results]
+        except Exception as e:
+            print(f"Batch inference failed, scoring one by one: {e}")
+            return [self.analyze_sentiment(text) for text in texts]
     
     def aggregate_sentiment(self, sentiments: List[Dict[str, any]]) -> Dict[str, any]:
         """
@@ -0,0 +1,75 @@
+"""
+Google Finance Page Parser
+Extracts quote fields from a Google Finance quote page in a single scan
+"""
+
+import re
+from typing import Dict, Optional, Tuple
+
+# One combined pattern: price div, company name div, or any "label</div><div>value</div>" pair
+# (the label may sit in its own <span>). finditer walks the page once instead of one search per field.
+FIELD_PATTERN = re.compile(
+    r'class="YMlKec fxKbKc"[^>]*>(?P<price>[^<]*)<'
+    r'|class="zzDege"[^>]*>(?P<name>[^<]+)<'
+    r'|>(?P<label>[^<>]{1,40})</div>(?:</span>)?<div[^>]*>(?P<value>[^<]+)</div>'
+)
+
+# Normalized label text -> output field
+LABELS = {
+    'previous close': 'previous_close',
+    'day range': 'day_range',
+    'year range': 'week_52_range',
+    '52-week range': 'week_52_range',
+    '52 week range': 'week_52_range',
+    'market cap': 'market_cap',
+    'p/e ratio': 'pe_ratio',
+    'volume': 'volume',
+    'avg volume': 'volume',
+}
+
+NUMBER_PATTERN = re.compile(r'(-?\d*\.?\d+)\s*(CR|[TBMKL])?')
+RANGE_NUMBERS = re.compile(r'[\d,]*\.?\d+')
+
+# B (Billion), M (Million), T (Trillion), K/L (Thousand/Lakh), Cr (Crore)
+MULTIPLIERS = {'T': 1e12, 'B': 1e9, 'M': 1e6, 'K': 1e3, 'L': 1e5, 'CR': 1e7}
+
+def parse_number(text: str) -> float:
+    """Parse numbers like '₹1,234.56', '5.67M', '12.34B', '45.67T', '1.2 Cr'"""
+    if not text:
+        return 0.0
+    match = NUMBER_PATTERN.search(text.replace(',', '').upper())
+    if not match:
+        return 0.0
+    return float(match.group(1)) * MULTIPLIERS.get(match.group(2), 1)
+
+def parse_range(text: str) -> Optional[Tuple[float, float]]:
+    """Parse 'low - high' ranges like '₹3,801.00 - ₹3,872.65'"""
+    parts = RANGE_NUMBERS.findall(text)
+    if len(parts) < 2:
+        return None
+    return parse_number(parts[0]), parse_number(parts[1])
+
+def extract_quote_fields(html: str) -> Dict:
+    """
+    Pull every known field out of the page in one pass.
+    Missing fields are simply absent from the result.
+    """
+    fields: Dict = {}
+    for match in FIELD_PATTERN.finditer(html):
+        if match.group('price') is not None:
+            if 'price' not in fields:
+                fields['price'] = parse_number(match.group('price'))
+        elif match.group('name') is not None:
+            fields.setdefault('company_name', match.group('name').strip())
+        else:
+            key = LABELS.get(match.group('label').strip().lower())
+            if key is None or key in fields:
+                continue
+            value = match.group('value')
+            if key in ('day_range', 'week_52_range'):
+                parsed = parse_range(value)
+                if parsed:
+                    fields[key] = parsed
+            else:
+                fields[key] = parse_number(value)
+    return fields
@@ -0,0 +1,270 @@
+"""
+Technical Indicator Engine
+Vectorized SMA, EMA, RSI, MACD, Bollinger bands, ATR and VWAP over stored OHLCV arrays
+"""
+
+import numpy as np
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Tuple
+
+# Standard parameters
+SMA_PERIODS = (20, 50)
+EMA_FAST, EMA_SLOW, MACD_SIGNAL = 12, 26, 9
+RSI_PERIOD = 14
+BB_PERIOD, BB_WIDTH = 20, 2.0
+ATR_PERIOD = 14
+VWAP_PERIOD = 20
+
+# ---------- Vectorized kernels over (tickers, time) matrices ----------
+
+def rolling_sum(x: np.ndarray, n: int) -> np.ndarray:
+    """Sum over the trailing n columns; NaN until n valid values are available"""
+    valid = ~np.isnan(x)
+    c = np.cumsum(np.where(valid, x, 0.0), axis=1)
+    k = np.cumsum(valid, axis=1)
+    c = np.concatenate([np.zeros((x.shape[0], 1)), c], axis=1)
+    k = np.concatenate([np.zeros((x.shape[0], 1)), k], axis=1)
+
+    out = np.full(x.shape, np.nan)
+    if x.shape[1] >= n:
+        sums = c[:, n:] - c[:, :-n]
+        counts = k[:, n:] - k[:, :-n]
+        out[:, n - 1:] = np.where(counts == n, sums, np.nan)
+    return out
+
+def sma(x: np.ndarray, n: int) -> np.ndarray:
+    return rolling_sum(x, n) / n
+
+def rolling_std(x: np.ndarray, n: int) -> np.ndarray:
+    mean = sma(x, n)
+    var = rolling_sum(x * x, n) / n - mean * mean
+    return np.sqrt(np.maximum(var, 0.0))
+
+def ema(x: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Exponential moving average seeded with each row's first valid value.
+    Recursive in time, vectorized across tickers.
+    """
+    out = np.empty_like(x)
+    prev = np.full(x.shape[0], np.nan)
+    for t in range(x.shape[1]):
+        col = x[:, t]
+        prev = np.where(np.isnan(prev), col, prev + alpha * (col - prev))
+        out[:, t] = prev
+    return out
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    prev_close = np.concatenate([np.full((close.shape[0], 1), np.nan), close[:, :-1]], axis=1)
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+def compute_matrix(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Compute every indicator for a (tickers, time) OHLCV matrix in one pass"""
+    return _compute(columns)[0]
+
+def _compute(columns: Dict[str, np.ndarray]) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """Indicator series plus the internal running averages needed for incremental updates"""
+    high, low, close, volume = columns['high'], columns['low'], columns['close'], columns['volume']
+
+    result = {f"sma_{n}": sma(close, n) for n in SMA_PERIODS}
+
+    ema_fast = ema(close, 2 / (EMA_FAST + 1))
+    ema_slow = ema(close, 2 / (EMA_SLOW + 1))
+    macd = ema_fast - ema_slow
+    macd_signal = ema(macd, 2 / (MACD_SIGNAL + 1))
+    result.update({
+        f"ema_{EMA_FAST}": ema_fast,
+        f"ema_{EMA_SLOW}": ema_slow,
+        "macd": macd,
+        "macd_signal": macd_signal,
+        "macd_hist": macd - macd_signal,
+    })
+
+    # RSI with Wilder smoothing
+    delta = np.diff(close, axis=1, prepend=np.nan)
+    avg_gain = ema(np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0)), 1 / RSI_PERIOD)
+    avg_loss = ema(np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0)), 1 / RSI_PERIOD)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+    result[f"rsi_{RSI_PERIOD}"] = np.where(np.isnan(avg_gain), np.nan, rsi)
+
+    middle = sma(close, BB_PERIOD)
+    width = BB_WIDTH * rolling_std(close, BB_PERIOD)
+    result.update({"bb_upper": middle + width, "bb_middle": middle, "bb_lower": middle - width})
+
+    result[f"atr_{ATR_PERIOD}"] = ema(true_range(high, low, close), 1 / ATR_PERIOD)
+
+    typical = (high + low + close) / 3
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result[f"vwap_{VWAP_PERIOD}"] = rolling_sum(typical * volume, VWAP_PERIOD) / rolling_sum(volume, VWAP_PERIOD)
+
+    return result, {"avg_gain": avg_gain[:, -1], "avg_loss": avg_loss[:, -1]}
+
+def stack_series(series: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """Right-align per-ticker OHLCV columns into NaN-padded (tickers, time) matrices"""
+    width = max((len(s['close']) for s in series), default=0)
+    matrix = {}
+    for field in ('open', 'high', 'low', 'close', 'volume'):
+        m = np.full((len(series), width), np.nan)
+        for i, s in enumerate(series):
+            n = len(s[field])
+            if n:
+                m[i, width - n:] = s[field]
+        matrix[field] = m
+    return matrix
+
+def stack_on_dates(series: List[Dict[str, np.ndarray]], field: str = 'close') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Union date grid of several tickers and a (tickers, dates) matrix of one column,
+    each bar placed on its own date (NaN where a ticker has no bar that day)
+    """
+    dates = [s['date'] for s in series if len(s['date'])]
+    grid = np.unique(np.concatenate(dates)) if dates else np.array([], dtype='datetime64[D]')
+    m = np.full((len(series), len(grid)), np.nan)
+    for i, s in enumerate(series):
+        if len(s['date']):
+            m[i, np.searchsorted(grid, s['date'])] = s[field]
+    return grid, m
+
+# ---------- Incremental state ----------
+
+class IndicatorState:
+    """Latest indicator values plus the running state needed to advance them one bar at a time"""
+
+    def __init__(self, columns: Dict[str, np.ndarray], computed: Dict[str, np.ndarray],
+                 running: Dict[str, np.ndarray], row: int = 0):
+        self.first_day = columns['date'][0]
+        self.last_day = columns['date'][-1]
+        self.latest = {name: float(values[row, -1]) for name, values in computed.items()}
+
+        self.ema_fast = self.latest[f"ema_{EMA_FAST}"]
+        self.ema_slow = self.latest[f"ema_{EMA_SLOW}"]
+        self.macd_signal = self.latest["macd_signal"]
+        self.atr = self.latest[f"atr_{ATR_PERIOD}"]
+        self.prev_close = float(columns['close'][-1])
+        self.avg_gain = float(running["avg_gain"][row])
+        self.avg_loss = float(running["avg_loss"][row])
+
+        window = max(max(SMA_PERIODS), BB_PERIOD)
+        self.closes = deque(np.asarray(columns['close'][-window:], dtype=np.float64).tolist(), maxlen=window)
+        typical = (np.asarray(columns['high']) + np.asarray(columns['low']) + np.asarray(columns['close'])) / 3
+        self.pv = deque((typical * np.asarray(columns['volume']))[-VWAP_PERIOD:].tolist(), maxlen=VWAP_PERIOD)
+        self.vol = deque(np.asarray(columns['volume'][-VWAP_PERIOD:], dtype=np.float64).tolist(), maxlen=VWAP_PERIOD)
+
+    def update(self, day, open_: float, high: float, low: float, close: float, volume: float) -> Dict[str, float]:
+        """Advance every indicator by one new bar in O(window)"""
+        self.last_day = day
+        self.closes.append(close)
+        closes = np.fromiter(self.closes, dtype=np.float64)
+
+        for n in SMA_PERIODS:
+            self.latest[f"sma_{n}"] = float(closes[-n:].mean()) if len(closes) >= n else np.nan
+
+        self.ema_fast += 2 / (EMA_FAST + 1) * (close - self.ema_fast)
+        self.ema_slow += 2 / (EMA_SLOW + 1) * (close - self.ema_slow)
+        macd = self.ema_fast - self.ema_slow
+        self.macd_signal += 2 / (MACD_SIGNAL + 1) * (macd - self.macd_signal)
+        self.latest.update({
+            f"ema_{EMA_FAST}": self.ema_fast,
+            f"ema_{EMA_SLOW}": self.ema_slow,
+            "macd": macd,
+            "macd_signal": self.macd_signal,
+            "macd_hist": macd - self.macd_signal,
+        })
+
+        delta = close - self.prev_close
+        self.avg_gain += (max(delta, 0.0) - self.avg_gain) / RSI_PERIOD
+        self.avg_loss += (max(-delta, 0.0) - self.avg_loss) / RSI_PERIOD
+        self.latest[f"rsi_{RSI_PERIOD}"] = 100.0 if self.avg_loss == 0 else 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+
+        if len(closes) >= BB_PERIOD:
+            window = closes[-BB_PERIOD:]
+            middle, width = float(window.mean()), BB_WIDTH * float(window.std())
+            self.latest.update({"bb_upper": middle + width, "bb_middle": middle, "bb_lower": middle - width})
+
+        tr = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.atr += (tr - self.atr) / ATR_PERIOD
+        self.latest[f"atr_{ATR_PERIOD}"] = self.atr
+
+        self.pv.append((high + low + close) / 3 * volume)
+        self.vol.append(volume)
+        if len(self.vol) == VWAP_PERIOD and sum(self.vol) > 0:
+            self.latest[f"vwap_{VWAP_PERIOD}"] = sum(self.pv) / sum(self.vol)
+
+        self.prev_close = close
+        return self.latest
+
+# ---------- Engine ----------
+
+class IndicatorEngine:
+    # Beyond this many new bars a full recompute is cheaper than stepping
+    MAX_INCREMENTAL_BARS = 5
+
+    def __init__(self, max_states: int = 20000):
+        # Keyed by (ticker, period): a period's window rolls forward a session at a time, and
+        # its state slides with it (EMAs, RSI and ATR keep their earlier seed, which has long
+        # since decayed). A 1mo and a 1y request for the same ticker keep separate states.
+        # Windows without a period are keyed by their first bar instead.
+        self._states: "OrderedDict[Tuple[str, object], IndicatorState]" = OrderedDict()
+        self.max_states = max_states
+        self._lock = threading.Lock()
+
+    def compute_series(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Full indicator series for a single ticker"""
+        computed = compute_matrix(stack_series([columns]))
+        return {name: values[0] for name, values in computed.items()}
+
+    def latest_many(self, windows: Dict[str, Optional[Dict[str, np.ndarray]]],
+                    period: Optional[str] = None) -> Dict[str, Optional[Dict[str, float]]]:
+        """
+        Latest indicator values for many tickers over a history period.
+        Tickers whose cached state is behind by a few bars are stepped forward;
+        everything else is recomputed together in one vectorized pass.
+        CPU-bound for large universes: call it off the event loop.
+        """
+        results: Dict[str, Optional[Dict[str, float]]] = {}
+        recompute = []
+
+        with self._lock:
+            for ticker, columns in windows.items():
+                if columns is None or len(columns['close']) == 0:
+                    results[ticker] = None
+                    continue
+
+                first_day = columns['date'][0]
+                key = (ticker, period if period is not None else int(first_day.astype(np.int64)))
+                state = self._states.get(key)
+                # History reaching back before the state's origin (a backfill) needs a recompute
+                if state is not None and first_day >= state.first_day:
+                    self._states.move_to_end(key)
+                    new = np.nonzero(columns['date'] > state.last_day)[0]
+                    if len(new) == 0:
+                        results[ticker] = dict(state.latest)
+                        continue
+                    if len(new) <= self.MAX_INCREMENTAL_BARS and new[0] > 0 and columns['date'][new[0] - 1] == state.last_day:
+                        for i in new:
+                            state.update(columns['date'][i], *(float(columns[f][i]) for f in ('open', 'high', 'low', 'close', 'volume')))
+                        results[ticker] = dict(state.latest)
+                        continue
+
+                recompute.append((ticker, key))
+
+        if recompute:
+            computed, running = _compute(stack_series([windows[t] for t, _ in recompute]))
+            with self._lock:
+                for row, (ticker, key) in enumerate(recompute):
+                    state = IndicatorState(windows[ticker], computed, running, row)
+                    self._states[key] = state
+                    self._states.move_to_end(key)
+                    results[ticker] = dict(state.latest)
+                while len(self._states) > self.max_states:
+                    self._states.popitem(last=False)
+
+        return {ticker: results[ticker] for ticker in windows}
+
+def clean(values: Dict[str, float], digits: int = 2) -> Dict[str, Optional[float]]:
+    """Round for JSON, mapping NaN (not enough history) to None"""
+    return {name: (None if np.isnan(v) else round(float(v), digits)) for name, v in values.items()}
+
+# Singleton instance
+indicator_engine = IndicatorEngine()
@@ -0,0 +1,229 @@
+"""
+Sentiment Leaderboard
+Live top/bottom-k tickers by sentiment score, overall and per sector.
+Kept in indexed binary heaps that are updated in O(log n) every time a ticker's
+sentiment is recomputed, so reads never scan the universe.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+import heapq
+import threading
+import time
+
+# Leaderboard ranks the dashboard's default analysis window
+LEADERBOARD_DAYS = 7
+
+class IndexedHeap:
+    """
+    Binary min-heap of (priority, ticker) with a ticker -> slot index,
+    so any ticker's priority can be changed or removed in O(log n).
+    """
+
+    def __init__(self):
+        self.heap: List[Tuple[float, str]] = []
+        self.pos: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def set(self, ticker: str, priority: float):
+        i = self.pos.get(ticker)
+        if i is None:
+            self.heap.append((priority, ticker))
+            self.pos[ticker] = len(self.heap) - 1
+            self._sift_up(len(self.heap) - 1)
+            return
+        old = self.heap[i]
+        self.heap[i] = (priority, ticker)
+        if self.heap[i] < old:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def remove(self, ticker: str):
+        i = self.pos.pop(ticker, None)
+        if i is None:
+            return
+        last = self.heap.pop()
+        if i < len(self.heap):
+            self.heap[i] = last
+            self.pos[last[1]] = i
+            self._sift_up(i)
+            self._sift_down(self.pos[last[1]])
+
+    def smallest(self, k: int) -> List[str]:
+        """
+        The k lowest-priority tickers in order, in O(k log k):
+        a best-first walk of the heap tree from the root.
+        """
+        heap = self.heap
+        if not heap or k <= 0:
+            return []
+        frontier = [(heap[0], 0)]
+        picked = []
+        while frontier and len(picked) < k:
+            (_, ticker), i = heapq.heappop(frontier)
+            picked.append(ticker)
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        return picked
+
+    def _swap(self, i: int, j: int):
+        heap = self.heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self.pos[heap[i][1]] = i
+        self.pos[heap[j][1]] = j
+
+    def _sift_up(self, i: int):
+        heap = self.heap
+        while i > 0:
+            parent = (i - 1) // 2
+            if heap[i] >= heap[parent]:
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i: int):
+        heap = self.heap
+        n = len(heap)
+        while True:
+            smallest = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n and heap[child] < heap[smallest]:
+                    smallest = child
+            if smallest == i:
+                return
+            self._swap(i, smallest)
+            i = smallest
+
+class RankedGroup:
+    """Bullish (highest score first) and bearish (lowest first) heaps over one set of tickers"""
+
+    def __init__(self):
+        self.bullish = IndexedHeap()
+        self.bearish = IndexedHeap()
+
+    def set(self, ticker: str, score: float):
+        self.bullish.set(ticker, -score)
+        self.bearish.set(ticker, score)
+
+    def remove(self, ticker: str):
+        self.bullish.remove(ticker)
+        self.bearish.remove(ticker)
+
+    def top(self, direction: str, k: int) -> List[str]:
+        return (self.bullish if direction == "bullish" else self.bearish).smallest(k)
+
+class SentimentLeaderboard:
+    def __init__(self, window: int = LEADERBOARD_DAYS):
+        self.window = window
+        self.entries: Dict[str, Dict] = {}
+        self.overall = RankedGroup()
+        self.by_sector: Dict[str, RankedGroup] = {}
+        self.updates = 0
+        self._lock = threading.Lock()
+
+    def update(self, ticker: str, entry: Dict):
+        """Insert or re-rank one ticker; entry needs 'score' and 'sector'"""
+        ticker = ticker.upper()
+        entry = {**entry, "ticker": ticker, "updated_at": entry.get("updated_at") or time.time()}
+        sector = entry['sector']
+        with self._lock:
+            previous = self.entries.get(ticker)
+            if previous is not None and previous['sector'] != sector:
+                self._remove_from_sector(ticker, previous['sector'])
+            self.entries[ticker] = entry
+            self.overall.set(ticker, entry['score'])
+            self.by_sector.setdefault(sector, RankedGroup()).set(ticker, entry['score'])
+            self.updates += 1
+
+    def record_payload(self, ticker: str, payload: Dict, sector: str):
+        """Rank a freshly computed dashboard sentiment payload"""
+        quote = payload.get('stock_data') or {}
+        price = quote.get('current_price') or 0
+        previous = quote.get('previous_close') or 0
+        self.update(ticker, {
+            "company_name": payload.get('company_name'),
+            "sector": sector,
+            "score": payload.get('sentiment_score', 0.0),
+            "label": payload.get('sentiment_label', 'neutral'),
+            "news_count": len(payload.get('news', [])),
+            "price": price,
+            "change_percent": round((price - previous) / previous * 100, 2) if previous > 0 else 0.0
+        })
+
+    def seed(self, rows: Dict[str, Dict]):
+        """Warm start from persisted rows (with 'computed_at'); live entries are kept"""
+        for ticker, row in rows.items():
+            if ticker.upper() not in self.entries:
+                self.update(ticker, {**row, "updated_at": row.get('computed_at')})
+
+    def remove(self, ticker: str):
+        ticker = ticker.upper()
+        with self._lock:
+            entry = self.entries.pop(ticker, None)
+            if entry is None:
+                return
+            self.overall.remove(ticker)
+            self._remove_from_sector(ticker, entry['sector'])
+
+    def _remove_from_sector(self, ticker: str, sector: str):
+        group = self.by_sector.get(sector)
+        if group is None:
+            return
+        group.remove(ticker)
+        if not len(group.bullish):
+            del self.by_sector[sector]
+
+    # ---- Reads ----
+
+    def _group(self, sector: Optional[str]) -> Optional[RankedGroup]:
+        if not sector:
+            return self.overall
+        for name, group in self.by_sector.items():
+            if name.lower() == sector.lower():
+                return group
+        return None
+
+    def top(self, direction: str = "bullish", limit: int = 10, sector: Optional[str] = None) -> List[Dict]:
+        """Highest (bullish) or lowest (bearish) scored tickers, optionally within a sector"""
+        with self._lock:
+            group = self._group(sector)
+            if group is None:
+                return []
+            now = time.time()
+            return [
+                {**self.entries[t], "age_seconds": round(now - self.entries[t]['updated_at'], 1)}
+                for t in group.top(direction, limit)
+            ]
+
+    def get(self, ticker: str) -> Optional[Dict]:
+        """Latest ranked entry for a ticker, with its age"""
+        with self._lock:
+            entry = self.entries.get(ticker.upper())
+            if entry is None:
+                return None
+            return {**entry, "age_seconds": round(time.time() - entry['updated_at'], 1)}
+
+    def sectors(self) -> List[str]:
+        with self._lock:
+            return sorted(self.by_sector)
+
+    def last_updated(self) -> Optional[float]:
+        with self._lock:
+            return max((e['updated_at'] for e in self.entries.values()), default=None)
+
+    def status(self) -> Dict:
+        updated = self.last_updated()
+        return {
+            "tickers": len(self.entries),
+            "sectors": len(self.by_sector),
+            "updates": self.updates,
+            "window_days": self.window,
+            "last_updated": datetime.utcfromtimestamp(updated).isoformat() if updated else None
+        }
+
+# Singleton instance
+sentiment_leaderboard = SentimentLeaderboard()
@@ -0,0 +1,113 @@
+"""
+Market Hours Service
+NSE/BSE trading session calendar used to decide how long market data stays fresh
+"""
+
+from datetime import datetime, date, time, timedelta, timezone
+from pathlib import Path
+from typing import Optional, Set
+import json
+import os
+
+# Indian Standard Time (no DST)
+IST = timezone(timedelta(hours=5, minutes=30))
+
+# Regular equity session for NSE and BSE
+MARKET_OPEN = time(9, 15)
+MARKET_CLOSE = time(15, 30)
+
+# One exchange-published holiday list per calendar year: nse_<year>.json
+HOLIDAYS_DIR = Path(__file__).parent / "holidays"
+
+class MarketCalendar:
+    def __init__(self, holidays_dir: Optional[Path] = None):
+        self.holidays_dir = Path(holidays_dir or os.getenv("NSE_HOLIDAYS_DIR", HOLIDAYS_DIR))
+        self.holidays: Set[date] = set()
+        self.years: Set[int] = set()
+        self._warned: Set[int] = set()
+        self.open_ttl = float(os.getenv("QUOTE_TTL_MARKET_OPEN", 60))
+        self.load_holidays()
+
+    def load_holidays(self):
+        """Load exchange holidays from the per-year calendar files"""
+        holidays, years = set(), set()
+        for path in sorted(self.holidays_dir.glob("nse_*.json")):
+            try:
+                year = int(path.stem.split("_", 1)[1])
+                with open(path, 'r') as f:
+                    holidays.update(date.fromisoformat(entry['date']) for entry in json.load(f))
+                years.add(year)
+            except (ValueError, KeyError, OSError) as e:
+                print(f"⚠️ Skipping unreadable holiday calendar {path.name}: {e}")
+        self.holidays, self.years = holidays, years
+        print(f"✅ Loaded {len(holidays)} NSE/BSE holidays for {sorted(years)}")
+        self.check_coverage(self.now().year)
+
+    def check_coverage(self, year: int):
+        """Warn (once per year) when no holiday list is loaded for a year we are asked about"""
+        if year in self.years or year in self._warned:
+            return
+        self._warned.add(year)
+        print(f"⚠️ No NSE holiday calendar for {year} in {self.holidays_dir} "
+              f"(add nse_{year}.json); treating every weekday as a trading day")
+
+    def now(self) -> datetime:
+        return datetime.now(IST)
+
+    def is_trading_day(self, day: date) -> bool:
+        """Weekdays that are not exchange holidays"""
+        self.check_coverage(day.year)
+        return day.weekday() < 5 and day not in self.holidays
+
+    def is_market_open(self, now: Optional[datetime] = None) -> bool:
+        """Check if the regular session is currently running"""
+        now = (now or self.now()).astimezone(IST)
+        return self.is_trading_day(now.date()) and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+    def next_open(self, now: Optional[datetime] = None) -> datetime:
+        """Next session open strictly after `now` (or today's open if still pre-market)"""
+        now = (now or self.now()).astimezone(IST)
+        day = now.date()
+
+        if self.is_trading_day(day) and now.time() < MARKET_OPEN:
+            return datetime.combine(day, MARKET_OPEN, tzinfo=IST)
+
+        day += timedelta(days=1)
+        while not self.is_trading_day(day):
+            day += timedelta(days=1)
+        return datetime.combine(day, MARKET_OPEN, tzinfo=IST)
+
+    def session_for(self, moment: datetime) -> date:
+        """Trading session a timestamp belongs to: the first close at or after it"""
+        moment = moment.astimezone(IST)
+        day = moment.date()
+        if self.is_trading_day(day) and moment.time() < MARKET_CLOSE:
+            return day
+        day += timedelta(days=1)
+        while not self.is_trading_day(day):
+            day += timedelta(days=1)
+        return day
+
+    def last_close(self, now: Optional[datetime] = None) -> datetime:
+        """Most recent session close at or before `now`"""
+        now = (now or self.now()).astimezone(IST)
+        day = now.date()
+
+        if not (self.is_trading_day(day) and now.time() >= MARKET_CLOSE):
+            day -= timedelta(days=1)
+            while not self.is_trading_day(day):
+                day -= timedelta(days=1)
+        return datetime.combine(day, MARKET_CLOSE, tzinfo=IST)
+
+    def quote_ttl(self, now: Optional[datetime] = None) -> float:
+        """
+        Seconds a quote stays fresh.
+        Short TTL while trading, otherwise hold until the next session opens.
+        """
+        now = (now or self.now()).astimezone(IST)
+        if self.is_market_open(now):
+            return self.open_ttl
+        return max((self.next_open(now) - now).total_seconds(), self.open_ttl)
+
+# Singleton instance
+market_calendar = MarketCalendar()
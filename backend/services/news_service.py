@@ -7,12 +7,18 @@ import aiohttp
 import os
 from typing import List, Dict
 from datetime import datetime, timedelta
+from services.upstream_trace import record_upstream
+from services.data_versions import data_versions, NEWS
+from collections import deque
+from email.utils import parsedate_to_datetime
 import asyncio
 
 class NewsService:
     def __init__(self):
         self.news_api_key = os.getenv("NEWS_API_KEY", "")
         self.gnews_api_key = os.getenv("GNEWS_API_KEY", "")
+        # ticker -> recently seen title slugs, to detect newly arrived articles
+        self._seen_titles: Dict[str, deque] = {}
     
     async def fetch_stock_news(self, company_name: str, ticker: str, days: int = 7) -> List[Dict]:
         """
@@ -59,8 +65,18 @@ class NewsService:
                 seen_titles.add(slug)
                 unique_articles.append(art)
         
+        self._track_new_articles(ticker, seen_titles)
+        
         return unique_articles[:20]  # Return top 20 unique articles
 
+    def _track_new_articles(self, ticker: str, slugs: set):
+        """Bump the ticker's news version when any article hasn't been seen before"""
+        seen = self._seen_titles.setdefault(ticker.upper(), deque(maxlen=200))
+        new = slugs.difference(seen)
+        if new:
+            seen.extend(new)
+            data_versions.bump(NEWS, ticker)
+
     async def _fetch_from_google_rss(self, company_name: str) -> List[Dict]:
         """Fetch from Google News RSS (Free, includes summaries)"""
         import xml.etree.ElementTree as ET
@@ -70,6 +86,7 @@ class NewsService:
             # Encode query for URL
             from urllib.parse import quote
             query = quote(f"{company_name} share price news India")
+            record_upstream("google.rss")
             url = f"https://news.google.com/rss/search?q={query}&hl=en-IN&gl=IN&ceid=IN:en"
             
             async with aiohttp.ClientSession() as session:
@@ -100,7 +117,7 @@ class NewsService:
                                 clean_desc = clean_title
                                 
                             link = item.find('link').text
-                            pub_date = item.find('pubDate').text
+                            pub_date = self._iso_date(item.find('pubDate').text)
                             
                             articles.append({
                                 'title': clean_title,
@@ -118,6 +135,13 @@ class NewsService:
         
         return []
 
+    def _iso_date(self, text: str) -> str:
+        """RSS pubDate (RFC 822) to ISO 8601, like the other providers return"""
+        try:
+            return parsedate_to_datetime(text).isoformat()
+        except (TypeError, ValueError):
+            return text or ''
+    
     def _clean_text(self, text: str) -> str:
         """Clean HTML artifacts from text"""
         import re
@@ -152,6 +176,7 @@ class NewsService:
         """Fetch from NewsAPI.org"""
         try:
             from_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+            record_upstream("newsapi")
             url = f"https://newsapi.org/v2/everything"
             params = {
                 'q': f"{company_name} India stock",
@@ -186,6 +211,7 @@ class NewsService:
     async def _fetch_from_gnews(self, company_name: str, days: int) -> List[Dict]:
         """Fetch from GNews API"""
         try:
+            record_upstream("gnews")
             url = f"https://gnews.io/api/v4/search"
             params = {
                 'q': f"{company_name} India",
@@ -270,6 +296,9 @@ class NewsService:
             }
         ]
         
+        # Tagged so nothing downstream mistakes them for real news (e.g. sentiment rollups)
+        for article in sample_news:
+            article['synthetic'] = True
         return sample_news
 
 # Singleton instance
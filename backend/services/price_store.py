@@ -0,0 +1,106 @@
+"""
+Price Store Service
+Local columnar OHLCV history, one memory-mapped NumPy file per ticker
+"""
+
+import numpy as np
+from datetime import date
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import os
+import threading
+
+# Row layout of each ticker file: a (6, n) float64 array, one contiguous row per column.
+# Dates are stored as days since the Unix epoch (exact in float64).
+FIELDS = ('date', 'open', 'high', 'low', 'close', 'volume')
+DATE, OPEN, HIGH, LOW, CLOSE, VOLUME = range(len(FIELDS))
+
+EPOCH = date(1970, 1, 1)
+
+def to_day(d: date) -> int:
+    return (d - EPOCH).days
+
+def from_day(day: float) -> date:
+    return date.fromordinal(EPOCH.toordinal() + int(day))
+
+class PriceStore:
+    def __init__(self, root: Optional[Path] = None):
+        default_root = Path(__file__).parent.parent / "data" / "prices"
+        self.root = Path(root or os.getenv("PRICE_STORE_DIR", default_root))
+        self.root.mkdir(parents=True, exist_ok=True)
+        # ticker -> (file mtime, memory-mapped array)
+        self._arrays: Dict[str, Tuple[float, np.ndarray]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def path(self, ticker: str) -> Path:
+        return self.root / f"{ticker.upper()}.npy"
+
+    def lock(self, ticker: str) -> threading.Lock:
+        """Per-ticker lock so concurrent syncs don't fetch the same range twice"""
+        with self._locks_guard:
+            return self._locks.setdefault(ticker.upper(), threading.Lock())
+
+    def load(self, ticker: str) -> Optional[np.ndarray]:
+        """Memory-map a ticker's (6, n) array, reusing the mapping while the file is unchanged"""
+        path = self.path(ticker)
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+        cached = self._arrays.get(ticker.upper())
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        array = np.load(path, mmap_mode='r')
+        self._arrays[ticker.upper()] = (mtime, array)
+        return array
+
+    def bounds(self, ticker: str) -> Optional[Tuple[date, date]]:
+        """First and last stored session dates"""
+        array = self.load(ticker)
+        if array is None or array.shape[1] == 0:
+            return None
+        return from_day(array[DATE, 0]), from_day(array[DATE, -1])
+
+    def append(self, ticker: str, columns: np.ndarray):
+        """
+        Merge new (6, n) rows into the ticker file.
+        Rows for dates already stored are replaced; the file is swapped atomically.
+        """
+        if columns.shape[1] == 0:
+            return
+
+        existing = self.load(ticker)
+        if existing is not None and existing.shape[1]:
+            keep = ~np.isin(existing[DATE], columns[DATE])
+            merged = np.concatenate([np.asarray(existing)[:, keep], columns], axis=1)
+        else:
+            merged = columns
+        merged = merged[:, np.argsort(merged[DATE], kind='stable')]
+
+        path = self.path(ticker)
+        # Release our mapping first; Windows can't replace a mapped file
+        self._arrays.pop(ticker.upper(), None)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(merged, dtype=np.float64))
+        os.replace(tmp_path, path)
+
+    def read(self, ticker: str, start: date, end: Optional[date] = None) -> Optional[Dict[str, np.ndarray]]:
+        """Slice the stored columns to [start, end] with a binary search on dates"""
+        array = self.load(ticker)
+        if array is None or array.shape[1] == 0:
+            return None
+
+        dates = array[DATE]
+        lo = np.searchsorted(dates, to_day(start), side='left')
+        hi = np.searchsorted(dates, to_day(end), side='right') if end else len(dates)
+
+        window = {name: array[i, lo:hi] for i, name in enumerate(FIELDS)}
+        window['date'] = window['date'].astype(np.int64).astype('datetime64[D]')
+        return window
+
+# Singleton instance
+price_store = PriceStore()
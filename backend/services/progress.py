@@ -0,0 +1,41 @@
+"""
+Progress Reporting
+Request-scoped listener for pipeline progress events (e.g. for streaming responses)
+"""
+
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+ProgressListener = Callable[[Dict[str, Any]], None]
+
+_listener: ContextVar[Optional[ProgressListener]] = ContextVar("progress_listener", default=None)
+
+def listen_progress(listener: ProgressListener):
+    """Route progress from the current task (and tasks it starts) to listener"""
+    _listener.set(listener)
+
+def current_listener() -> Optional[ProgressListener]:
+    return _listener.get()
+
+class ProgressFanout:
+    """Listener that forwards each event to every listener attached to it (callers sharing one execution)"""
+
+    def __init__(self):
+        self.listeners: List[ProgressListener] = []
+
+    def add(self, listener: ProgressListener):
+        self.listeners.append(listener)
+
+    def discard(self, listener: ProgressListener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def __call__(self, event: Dict[str, Any]):
+        for listener in list(self.listeners):
+            listener(event)
+
+def report_progress(stage: str, message: str, **data):
+    """Emit a progress event if anyone is listening; a no-op otherwise"""
+    listener = _listener.get()
+    if listener is not None:
+        listener({"stage": stage, "message": message, **data})
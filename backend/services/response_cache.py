@@ -0,0 +1,102 @@
+"""
+Response Cache Service
+Pre-serialized API payloads with ETags, TTL expiry and version-based invalidation
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+import hashlib
+import json
+import os
+import threading
+import time
+
+class CachedResponse:
+    def __init__(self, payload: Dict, body: bytes, etag: str, versions: Tuple, ttl: float):
+        self._payload = payload
+        self.body = body
+        self.etag = etag
+        self.versions = versions
+        self.created_at = time.time()
+        self.expires_at = self.created_at + ttl
+
+    @property
+    def payload(self) -> Dict:
+        """The cached payload itself, shared by every reader: copy before reshaping it"""
+        return self._payload
+
+    def max_age(self) -> int:
+        return max(0, int(self.expires_at - time.time()))
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Check an If-None-Match header against this entry's ETag (weak comparison, as for GET)"""
+        if not if_none_match:
+            return False
+        candidates = [opaque_tag(tag) for tag in if_none_match.split(",")]
+        return "*" in candidates or opaque_tag(self.etag) in candidates
+
+def opaque_tag(tag: str) -> str:
+    """ETag without its weak indicator"""
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+def compute_etag(payload: Dict, exclude: Iterable[str] = ()) -> str:
+    """
+    ETag over the canonical JSON of the payload's content fields.
+    Strong when it covers the whole body; weak when excluded fields still vary the bytes served.
+    """
+    exclude = set(exclude) & set(payload)
+    content = {k: v for k, v in payload.items() if k not in exclude}
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    tag = '"' + hashlib.sha256(canonical.encode()).hexdigest()[:32] + '"'
+    return "W/" + tag if exclude else tag
+
+class ResponseCache:
+    def __init__(self, ttl: Optional[float] = None, max_entries: int = 512, etag_exclude: Iterable[str] = ()):
+        self.ttl = ttl if ttl is not None else float(os.getenv("SENTIMENT_CACHE_TTL", 300))
+        self.max_entries = max_entries
+        self.etag_exclude = tuple(etag_exclude)
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, versions: Tuple = ()) -> Optional[CachedResponse]:
+        """Fresh entry for key, or None if missing, expired or its source data changed"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.time() or entry.versions != versions:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: Hashable, payload: Dict, versions: Tuple = ()) -> CachedResponse:
+        body = json.dumps(payload, separators=(",", ":"), default=str).encode()
+        entry = CachedResponse(payload, body, compute_etag(payload, self.etag_exclude), versions, self.ttl)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, predicate=None):
+        """Drop every entry whose key matches predicate (all entries if None)"""
+        with self._lock:
+            for key in [k for k in self._entries if predicate is None or predicate(k)]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "ttl_seconds": self.ttl
+        }
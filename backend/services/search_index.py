@@ -0,0 +1,272 @@
+"""
+Stock Search Index
+Ranked autocomplete over tickers and company names, built once per stock universe.
+Sorted arrays answer ticker and word-start prefixes by binary search; an n-gram
+index answers infix queries without scanning every name. Typos ("relaince") fall back
+to edit-distance matching of query words against ticker and name words.
+"""
+
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+
+# Match tiers, best first
+EXACT_TICKER, TICKER_PREFIX, NAME_PREFIX, WORD_PREFIX, SUBSTRING = range(5)
+NGRAM_SIZES = (2, 3)
+# Infix candidates are verified by substring test once the n-gram intersection is this small
+INTERSECT_UNTIL = 64
+# Fuzzy matching runs only when the exact tiers return fewer results than this
+FUZZY_MIN_RESULTS = 3
+# Sentinel edit count for a query word that matched nothing in a stock
+MAX_TYPO_TOTAL = 1000
+NON_ALNUM = re.compile(r"[^A-Z0-9&\- ]+")
+WHITESPACE = re.compile(r"\s+")
+
+def normalize(text: str) -> str:
+    """Uppercase, punctuation dropped, single spaces ("Dr. Reddy's" -> "DR REDDYS")"""
+    return WHITESPACE.sub(" ", NON_ALNUM.sub("", text.upper())).strip()
+
+def ngrams(text: str, n: int) -> Set[str]:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+def prefix_range(keys: List[str], prefix: str) -> Tuple[int, int]:
+    """Slice of a sorted key list whose keys start with prefix"""
+    return bisect_left(keys, prefix), bisect_left(keys, prefix + "\uffff")
+
+def max_edits(word: str) -> int:
+    """Typos tolerated in a query word: none for very short words, more for longer ones"""
+    return 0 if len(word) < 3 else 1 if len(word) < 8 else 2
+
+def padded_trigrams(word: str) -> Set[str]:
+    # Double padding keeps short words' ends comparable ("BNAK" and "BANK" share $$B and K$$)
+    return ngrams(f"$${word}$$", 3)
+
+def edit_distance(a: str, b: str, cap: int) -> int:
+    """
+    Optimal string alignment distance (adjacent transpositions count as one edit),
+    or cap + 1 once it's known to exceed cap. Only the diagonal band |i - j| <= cap is filled.
+    """
+    n, m = len(a), len(b)
+    over = cap + 1
+    if abs(n - m) > cap:
+        return over
+    prev2: List[int] = []
+    prev = [j if j <= cap else over for j in range(m + 1)]
+    for i in range(1, n + 1):
+        row = [over] * (m + 1)
+        if i <= cap:
+            row[0] = i
+        best = row[0]
+        ai = a[i - 1]
+        for j in range(max(1, i - cap), min(m, i + cap) + 1):
+            bj = b[j - 1]
+            d = prev[j - 1] + (ai != bj)
+            if prev[j] + 1 < d:
+                d = prev[j] + 1
+            if row[j - 1] + 1 < d:
+                d = row[j - 1] + 1
+            if i > 1 and j > 1 and ai == b[j - 2] and a[i - 2] == bj and prev2[j - 2] + 1 < d:
+                d = prev2[j - 2] + 1
+            row[j] = d
+            if d < best:
+                best = d
+        if best > cap:
+            return over
+        prev2, prev = prev, row
+    return min(prev[m], over)
+
+class StockSearchIndex:
+    """
+    Documents are numbered in static rank order (popularity, then shorter ticker, then
+    alphabetical), so a match's overall rank is the integer tier * size + doc and the
+    best matches fall out of one sort over the candidate ranks.
+    """
+
+    def __init__(self, stocks: Dict[str, str], popularity: Optional[Dict[str, float]] = None):
+        popularity = popularity or {}
+        self.tickers: List[str] = sorted(stocks, key=lambda t: (-popularity.get(t, 0.0), len(t), t))
+        self.names: List[str] = [stocks[t] for t in self.tickers]
+        self.norm_names: List[str] = [normalize(name) for name in self.names]
+        size = self.size = len(self.tickers)
+
+        # Sorted tickers, and sorted name suffixes starting at each word (word-start prefixes)
+        ticker_entries = sorted((ticker, doc) for doc, ticker in enumerate(self.tickers))
+        self.ticker_keys = [key for key, _ in ticker_entries]
+        self.ticker_ranks = np.array([TICKER_PREFIX * size + doc for _, doc in ticker_entries], dtype=np.int64)
+
+        word_entries = []
+        for doc, name in enumerate(self.norm_names):
+            start = 0
+            for word in name.split(" "):
+                tier = NAME_PREFIX if start == 0 else WORD_PREFIX
+                word_entries.append((name[start:], tier * size + doc))
+                start += len(word) + 1
+        word_entries.sort()
+        self.word_keys = [key for key, _ in word_entries]
+        self.word_ranks = np.array([rank for _, rank in word_entries], dtype=np.int64)
+
+        # n-gram -> sorted docs whose ticker or name contains it
+        grams: Dict[str, List[int]] = {}
+        for doc, (ticker, name) in enumerate(zip(self.tickers, self.norm_names)):
+            for n in NGRAM_SIZES:
+                for gram in ngrams(ticker, n) | ngrams(name, n):
+                    grams.setdefault(gram, []).append(doc)
+        self.grams: Dict[str, np.ndarray] = {gram: np.array(docs, dtype=np.int64) for gram, docs in grams.items()}
+
+        # Words for typo matching: tickers and company-name words, each with its docs,
+        # plus a trigram index over the padded words to find near spellings
+        word_docs: Dict[str, Set[int]] = {}
+        for doc, (ticker, name) in enumerate(zip(self.tickers, self.norm_names)):
+            for word in [ticker] + name.split(" "):
+                word_docs.setdefault(word, set()).add(doc)
+        self.words: List[str] = sorted(word_docs)
+        self.word_lengths = np.array([len(w) for w in self.words], dtype=np.int64)
+        self.word_doc_arrays: List[np.ndarray] = [np.array(sorted(word_docs[w]), dtype=np.int64) for w in self.words]
+        word_grams: Dict[str, List[int]] = {}
+        for wid, word in enumerate(self.words):
+            for gram in padded_trigrams(word):
+                word_grams.setdefault(gram, []).append(wid)
+        self.word_grams: Dict[str, np.ndarray] = {gram: np.array(ids, dtype=np.int64) for gram, ids in word_grams.items()}
+
+    def _prefix_ranks(self, query: str) -> List[np.ndarray]:
+        parts = []
+        lo, hi = prefix_range(self.ticker_keys, query)
+        if lo < hi:
+            ranks = self.ticker_ranks[lo:hi]
+            if self.ticker_keys[lo] == query:
+                ranks = ranks.copy()
+                ranks[0] = EXACT_TICKER * self.size + ranks[0] % self.size
+            parts.append(ranks)
+        lo, hi = prefix_range(self.word_keys, query)
+        if lo < hi:
+            parts.append(self.word_ranks[lo:hi])
+        return parts
+
+    def _infix_candidates(self, query: str) -> np.ndarray:
+        """Docs holding every n-gram of the query, in rank order (may include false positives)"""
+        n = max(size for size in NGRAM_SIZES if size <= len(query))
+        postings = [self.grams.get(gram) for gram in ngrams(query, n)]
+        if any(p is None for p in postings):
+            return np.empty(0, dtype=np.int64)
+        postings.sort(key=len)
+        docs = postings[0]
+        for posting in postings[1:]:
+            # Few enough left to verify directly
+            if len(docs) <= INTERSECT_UNTIL:
+                break
+            docs = np.intersect1d(docs, posting, assume_unique=True)
+        return docs
+
+    def _near_words(self, word: str) -> Dict[int, int]:
+        """
+        Word id -> edit distance for indexed words within the word's typo budget,
+        plus words it is a prefix of (distance 0, for the word still being typed)
+        """
+        cap = max_edits(word)
+        near = {}
+        lo, hi = prefix_range(self.words, word)
+        for wid in range(lo, hi):
+            near[wid] = 0
+        if cap == 0:
+            return near
+
+        # q-gram filter: each edit destroys at most 3 trigrams (a transposition 4)
+        grams = padded_trigrams(word)
+        postings = [self.word_grams[g] for g in grams if g in self.word_grams]
+        if not postings:
+            return near
+        shared = np.bincount(np.concatenate(postings), minlength=len(self.words))
+        needed = max(1, len(grams) - 3 * cap - 1)
+        close = (shared >= needed) & (np.abs(self.word_lengths - len(word)) <= cap)
+        for wid in np.flatnonzero(close).tolist():
+            if wid not in near:
+                distance = edit_distance(word, self.words[wid], cap)
+                if distance <= cap:
+                    near[wid] = distance
+        return near
+
+    def fuzzy(self, query: str, limit: int = 10) -> List[int]:
+        """
+        Docs matching every query word within its typo budget, fewest total edits first.
+        Query must already be normalized.
+        """
+        unmatched = MAX_TYPO_TOTAL
+        totals = np.zeros(self.size, dtype=np.int64)
+        for word in query.split(" "):
+            by_distance: Dict[int, List[np.ndarray]] = {}
+            for wid, distance in self._near_words(word).items():
+                by_distance.setdefault(distance, []).append(self.word_doc_arrays[wid])
+            best = np.full(self.size, unmatched, dtype=np.int64)
+            # Closest words last, so each stock keeps its smallest distance
+            for distance in sorted(by_distance, reverse=True):
+                best[np.concatenate(by_distance[distance])] = distance
+            totals += best
+        matched = np.flatnonzero(totals < unmatched)
+        if len(matched) == 0:
+            return []
+        # Fewest edits first, then static rank (doc number)
+        keys = totals[matched] * self.size + matched
+        if len(keys) > limit:
+            keys = np.partition(keys, limit - 1)[:limit]
+        return (np.sort(keys) % self.size).tolist()
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
+        """
+        Best matches for a typed query, ranked exact ticker > ticker prefix >
+        name prefix > word-start > substring, then by popularity.
+        Typo-tolerant matches are added only when those find too few.
+        """
+        query = normalize(query)
+        if not query or limit <= 0:
+            return []
+
+        picked: List[int] = []
+        seen = set()
+
+        def take(docs: List[int], verify: bool = False):
+            for doc in docs:
+                if doc in seen or (verify and query not in self.tickers[doc] and query not in self.norm_names[doc]):
+                    continue
+                seen.add(doc)
+                picked.append(doc)
+                if len(picked) >= limit:
+                    return
+
+        parts = self._prefix_ranks(query)
+        if parts:
+            ranks = np.concatenate(parts)
+            # Short prefixes match thousands of entries: order only the best few,
+            # which covers the page unless one stock repeats a lot within them
+            head = limit * 4
+            if len(ranks) > head:
+                take((np.sort(np.partition(ranks, head - 1)[:head]) % self.size).tolist())
+            if len(picked) < limit:
+                take((np.unique(ranks) % self.size).tolist())
+
+        # Infix matches only matter if the better tiers can't fill the page
+        if len(picked) < limit and len(query) >= min(NGRAM_SIZES):
+            take(self._infix_candidates(query).tolist(), verify=True)
+
+        # Typo fallback when the query isn't a ticker and little else matched
+        exact = picked and self.tickers[picked[0]] == query
+        if not exact and len(picked) < min(limit, FUZZY_MIN_RESULTS) and len(query) >= 3:
+            take(self.fuzzy(query, limit))
+
+        return [{"ticker": self.tickers[doc], "company_name": self.names[doc]} for doc in picked]
+
+class StockSearchService:
+    """Holds the search index for the current stock universe"""
+
+    def __init__(self):
+        self.index: Optional[StockSearchIndex] = None
+
+    def rebuild(self, stocks: Dict[str, str], popularity: Optional[Dict[str, float]] = None):
+        # Build fully before swapping so concurrent searches never see a partial index
+        self.index = StockSearchIndex(stocks, popularity)
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
+        return self.index.search(query, limit) if self.index else []
+
+# Singleton instance
+stock_search = StockSearchService()
@@ -0,0 +1,320 @@
+"""
+Sector Analytics Service
+Rolling per-sector return and sentiment correlation matrices over cached history.
+Matrices are maintained from running moment sums, so each new trading day is an
+O(k²) update per sector; per-ticker contagion is precomputed for O(1) lookups.
+"""
+
+import asyncio
+import numpy as np
+from typing import Dict, List, Optional
+from services.stock_validator import stock_validator
+from services.stock_data_service import stock_data_service
+from services.sentiment_rollups import sentiment_rollups
+from services.market_hours import market_calendar
+from services.indicators import stack_on_dates
+from services.backtest import align_sentiment, forward_fill, lookback_days
+import os
+import time
+
+WINDOW = int(os.getenv("SECTOR_CORR_WINDOW", 60))
+HISTORY_PERIOD = "6mo"
+# Recent slice read on incremental refreshes; longer gaps fall back to a full rebuild
+INCREMENTAL_PERIOD = "1mo"
+# Daily sentiment is sparse; carry it over a few newsless sessions before correlating
+SENTIMENT_FILL_DAYS = 5
+MIN_SECTOR_SIZE = 2
+# Most traded members correlated per sector (k x k matrices), chosen from this many times as many candidates
+MAX_SECTOR_MEMBERS = int(os.getenv("SECTOR_MAX_MEMBERS", 30))
+CANDIDATE_FACTOR = 3
+# Fallback buckets of unrelated names (classify_sector); correlating them means nothing
+CATCH_ALL_SECTORS = {"General", "General Market"}
+# Seconds between checks; 0 (the default) leaves the job off: refresh through the admin endpoint
+CHECK_INTERVAL = float(os.getenv("SECTOR_ANALYTICS_INTERVAL", 0))
+# Let startup finish before the first history read
+STARTUP_DELAY = int(os.getenv("SECTOR_STARTUP_DELAY", 60))
+
+class RollingCorrelation:
+    """Correlation matrix of k series over a trailing window, kept as running moment sums"""
+
+    def __init__(self, values: np.ndarray):
+        self.values = values
+        self.sums = values.sum(axis=1)
+        self.cross = values @ values.T
+
+    def advance(self, new: np.ndarray):
+        """Slide the window forward by new.shape[1] columns"""
+        m = new.shape[1]
+        if m == 0:
+            return
+        old = self.values[:, :m]
+        self.sums += new.sum(axis=1) - old.sum(axis=1)
+        self.cross += new @ new.T - old @ old.T
+        self.values = np.concatenate([self.values[:, m:], new], axis=1)
+
+    def matrix(self) -> np.ndarray:
+        n = self.values.shape[1]
+        mean = self.sums / n
+        cov = self.cross / n - np.outer(mean, mean)
+        std = np.sqrt(np.maximum(np.diag(cov), 0.0))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = cov / np.outer(std, std)
+        # Flat series (no movement / no news) correlate with nothing
+        corr[~np.isfinite(corr)] = 0.0
+        np.fill_diagonal(corr, 1.0)
+        return np.clip(corr, -1.0, 1.0)
+
+class SectorState:
+    def __init__(self, sector: str, tickers: List[str], returns: np.ndarray, sentiment: Optional[np.ndarray]):
+        self.sector = sector
+        self.tickers = tickers
+        self.returns = RollingCorrelation(returns)
+        # Rebuilt from the rollups on every refresh
+        self.sentiment = RollingCorrelation(sentiment) if sentiment is not None else None
+
+    def summary(self, returns_corr: np.ndarray, sentiment_corr: np.ndarray) -> Dict:
+        k = len(self.tickers)
+        off = ~np.eye(k, dtype=bool)
+        return {
+            "sector": self.sector,
+            "members": k,
+            "avg_return_corr": round(float(returns_corr[off].mean()), 3),
+            "avg_sentiment_corr": round(float(sentiment_corr[off].mean()), 3)
+        }
+
+def peer_means(corr: np.ndarray) -> np.ndarray:
+    """Each row's mean correlation with the other members"""
+    k = corr.shape[0]
+    return (corr.sum(axis=1) - 1.0) / (k - 1)
+
+class SectorAnalyticsService:
+    def __init__(self):
+        self.states: Dict[str, SectorState] = {}
+        self.dates: Optional[np.ndarray] = None
+        # Candidate lists the current members were chosen from
+        self.candidates: Dict[str, List[str]] = {}
+        self.contagion_map: Dict[str, float] = {}
+        self.sentiment_contagion: Dict[str, float] = {}
+        self.sector_summaries: List[Dict] = []
+        self.refreshed_at: Optional[float] = None
+        self.last_refresh: Dict = {}
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    # ---- Data ----
+
+    async def _load_returns(self, tickers: List[str], period: str, min_bars: int = 2) -> Optional[Dict]:
+        """Daily return matrix on the tickers' shared date grid, plus each ticker's traded value"""
+        windows = await asyncio.to_thread(stock_data_service.get_history_arrays_many, tickers, period)
+        tickers = [t for t in tickers if windows.get(t) is not None and len(windows[t]['close']) >= min_bars]
+        if not tickers:
+            return None
+
+        series = [windows[t] for t in tickers]
+        dates, close = stack_on_dates(series)
+        _, volume = stack_on_dates(series, 'volume')
+        with np.errstate(invalid='ignore'):
+            traded = np.nan_to_num(np.nanmean((close * volume)[:, -WINDOW:], axis=1))
+        # A missing bar is a flat day; the move lands on the next bar the ticker has
+        close = forward_fill(close)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            returns = np.nan_to_num(close[:, 1:] / close[:, :-1] - 1.0, nan=0.0, posinf=0.0, neginf=0.0)
+        return {"tickers": tickers, "dates": dates[1:], "returns": returns, "traded_value": traded}
+
+    async def _load_sentiment(self, tickers: List[str], dates: np.ndarray) -> np.ndarray:
+        """Forward-filled daily sentiment on the given session dates, read fresh from the rollups"""
+        days = lookback_days(dates[0])
+        trends = await asyncio.gather(*(sentiment_rollups.trend(t, days) for t in tickers))
+        sentiment = forward_fill(np.vstack([align_sentiment(dates, d) for d in trends]), SENTIMENT_FILL_DAYS)
+        return np.nan_to_num(sentiment)
+
+    def _candidates(self) -> Dict[str, List[str]]:
+        """
+        Sector -> tickers worth correlating: catch-all buckets are skipped, and each sector is
+        trimmed to index constituents first, then listing order, before any history is read
+        """
+        preferred = stock_validator.popularity()
+        candidates = {}
+        for sector, tickers in stock_validator.get_sector_members().items():
+            if sector in CATCH_ALL_SECTORS or len(tickers) < MIN_SECTOR_SIZE:
+                continue
+            ranked = sorted(tickers, key=lambda t: -preferred.get(t, 0.0))
+            candidates[sector] = ranked[:MAX_SECTOR_MEMBERS * CANDIDATE_FACTOR]
+        return candidates
+
+    def _sector_rows(self, members: Dict[str, List[str]], tickers: List[str]) -> Dict[str, List[int]]:
+        row = {t: i for i, t in enumerate(tickers)}
+        rows = {}
+        for sector, names in members.items():
+            names = [t for t in names if t in row]
+            if len(names) >= MIN_SECTOR_SIZE:
+                rows[sector] = [row[t] for t in names]
+        return rows
+
+    # ---- Refresh ----
+
+    async def refresh(self, full: bool = False) -> Dict:
+        """
+        Bring the sector matrices up to the latest session.
+        A full rebuild reads HISTORY_PERIOD for the candidates and keeps the MAX_SECTOR_MEMBERS
+        most traded per sector. Later refreshes read a short recent slice for those members
+        only and fold the new sessions into the return windows; they rebuild instead on
+        request, when the candidate lists changed or when the gap no longer fits the slice.
+        Sentiment windows are re-read from the rollups every time, so late-scored news is picked up.
+        """
+        async with self._lock:
+            started = time.perf_counter()
+            candidates = self._candidates()
+
+            data, mode, new_days = None, "full", 0
+            if not full and self.dates is not None and candidates == self.candidates:
+                members = {state.sector: state.tickers for state in self.states.values()}
+                data = await self._load_returns([t for tickers in members.values() for t in tickers], INCREMENTAL_PERIOD)
+                if data is not None:
+                    rows = self._sector_rows(members, data['tickers'])
+                    complete = all(len(rows.get(sector, ())) == len(tickers) for sector, tickers in members.items())
+                    # The slice has to reach back to the last session we folded in
+                    if complete and len(data['dates']) and data['dates'][0] <= self.dates[-1]:
+                        mode = "incremental"
+                        new_days = len(data['dates']) - int(np.searchsorted(data['dates'], self.dates[-1], side='right'))
+
+            if mode == "full":
+                universe = list(dict.fromkeys(t for tickers in candidates.values() for t in tickers))
+                data = await self._load_returns(universe, HISTORY_PERIOD, WINDOW + 1)
+                if data is None:
+                    self.last_refresh = {"mode": "skipped", "reason": "no history available"}
+                    return self.last_refresh
+                dates = data['dates'][-WINDOW:]
+                if len(dates) < WINDOW:
+                    self.last_refresh = {"mode": "skipped", "reason": "not enough history"}
+                    return self.last_refresh
+                # Most traded members only: bounded k per sector, and peers that actually trade
+                traded = dict(zip(data['tickers'], data['traded_value']))
+                members = {
+                    sector: sorted((t for t in tickers if t in traded), key=lambda t: -traded[t])[:MAX_SECTOR_MEMBERS]
+                    for sector, tickers in candidates.items()
+                }
+                rows = self._sector_rows(members, data['tickers'])
+                new_days = len(dates)
+                returns = data['returns'][:, -WINDOW:]
+                states = {
+                    sector: SectorState(sector, [data['tickers'][i] for i in idx], returns[idx].copy(), None)
+                    for sector, idx in rows.items()
+                }
+            else:
+                states = self.states
+                dates = np.concatenate([self.dates, data['dates'][len(data['dates']) - new_days:]])[-WINDOW:]
+                if new_days:
+                    for sector, idx in rows.items():
+                        states[sector].returns.advance(data['returns'][idx, -new_days:])
+
+            sentiment = await self._load_sentiment(data['tickers'], dates)
+            for sector, idx in rows.items():
+                states[sector].sentiment = RollingCorrelation(sentiment[idx].copy())
+
+            self.states = states
+            self.candidates = candidates
+            self.dates = dates
+            self._publish()
+
+            self.refreshed_at = time.time()
+            self.last_refresh = {
+                "mode": mode,
+                "new_sessions": new_days,
+                "as_of": str(dates[-1]),
+                "sectors": len(states),
+                "tickers": sum(len(s.tickers) for s in states.values()),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+            }
+            print(f"🧮 Sector analytics ({mode}): {self.last_refresh}")
+            return self.last_refresh
+
+    async def refresh_sentiment(self):
+        """Re-read the sentiment windows from the rollups, leaving the return windows as they are"""
+        async with self._lock:
+            if self.dates is None or not self.states:
+                return
+            states = list(self.states.values())
+            sentiment = await self._load_sentiment([t for state in states for t in state.tickers], self.dates)
+            offset = 0
+            for state in states:
+                k = len(state.tickers)
+                state.sentiment = RollingCorrelation(sentiment[offset:offset + k].copy())
+                offset += k
+            self._publish()
+
+    def _publish(self):
+        """Precompute contagion lookups and sector summaries from the current matrices"""
+        contagion, sentiment_contagion, summaries = {}, {}, []
+        for state in self.states.values():
+            returns_corr = state.returns.matrix()
+            sentiment_corr = state.sentiment.matrix()
+            for ticker, r, s in zip(state.tickers, peer_means(returns_corr), peer_means(sentiment_corr)):
+                contagion[ticker] = round(float(r), 2)
+                sentiment_contagion[ticker] = round(float(s), 2)
+            summaries.append(state.summary(returns_corr, sentiment_corr))
+        summaries.sort(key=lambda s: s['avg_return_corr'], reverse=True)
+        self.contagion_map, self.sentiment_contagion, self.sector_summaries = contagion, sentiment_contagion, summaries
+
+    def is_stale(self) -> bool:
+        """A session has closed since the data we last folded in"""
+        if self.dates is None:
+            return True
+        return np.datetime64(market_calendar.last_close().date(), 'D') > self.dates[-1]
+
+    async def run_forever(self):
+        await asyncio.sleep(STARTUP_DELAY)
+        while True:
+            try:
+                if self.is_stale():
+                    await self.refresh()
+                else:
+                    await self.refresh_sentiment()
+            except Exception as e:
+                print(f"❌ Sector analytics refresh failed: {e}")
+            await asyncio.sleep(CHECK_INTERVAL)
+
+    def start(self):
+        """Schedule the job; off unless SECTOR_ANALYTICS_INTERVAL is set"""
+        if self._task is None and WINDOW > 0 and CHECK_INTERVAL > 0:
+            self._task = asyncio.create_task(self.run_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    # ---- Reads ----
+
+    def contagion(self, ticker: str) -> Optional[float]:
+        """Mean rolling return correlation of a ticker with its sector peers"""
+        return self.contagion_map.get(ticker.upper())
+
+    def sectors(self) -> List[Dict]:
+        return self.sector_summaries
+
+    def correlation(self, sector: str) -> Optional[Dict]:
+        state = next((s for name, s in self.states.items() if name.lower() == sector.lower()), None)
+        if state is None:
+            return None
+        return {
+            "sector": state.sector,
+            "tickers": state.tickers,
+            "window": WINDOW,
+            "as_of": str(self.dates[-1]) if self.dates is not None else None,
+            "returns": np.round(state.returns.matrix(), 3).tolist(),
+            "sentiment": np.round(state.sentiment.matrix(), 3).tolist()
+        }
+
+    def status(self) -> Dict:
+        return {
+            "ready": bool(self.states),
+            "window": WINDOW,
+            "interval_seconds": CHECK_INTERVAL,
+            "as_of": str(self.dates[-1]) if self.dates is not None else None,
+            "stale": self.is_stale(),
+            "last_refresh": self.last_refresh
+        }
+
+# Singleton instance
+sector_analytics = SectorAnalyticsService()
@@ -0,0 +1,213 @@
+"""
+Sentiment Rollup Service
+Per-ticker daily sentiment rollups, updated incrementally as articles are scored.
+Stored as measurements in a MongoDB time-series collection and summed per day with an
+aggregation pipeline; an in-memory table serves when MongoDB isn't connected.
+"""
+
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Set
+from datetime import date, datetime, timedelta, timezone
+from pymongo import ASCENDING
+from pymongo.errors import BulkWriteError, CollectionInvalid
+from services.database import get_database
+from services.market_hours import IST, MARKET_CLOSE, market_calendar
+import re
+import threading
+
+COLLECTION = "sentiment_daily"
+ARTICLE_KEYS = "sentiment_article_keys"
+# Article keys only need to outlive the longest trend window
+KEY_RETENTION_SECONDS = 400 * 86400
+ISO_DAY = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+COUNTERS = ("sum", "count", "positive", "negative", "neutral", "confidence_sum", "weighted_sum")
+
+def article_key(article: Dict) -> str:
+    """Same normalized title slug the news service dedupes on"""
+    return article.get('title', '').lower().strip()[:50]
+
+def article_day(article: Dict) -> Optional[str]:
+    """
+    Trading session (YYYY-MM-DD) an ISO published_at belongs to, or None if it isn't one.
+    Timestamps are read in Asia/Kolkata (naive ones are taken as UTC); news published after
+    the 15:30 close or on a holiday counts toward the next session, so a session's rollup
+    only holds news that was out before its close. Date-only values are taken as post-close.
+    """
+    published = article.get('published_at') or ''
+    day = published[:10]
+    if not ISO_DAY.match(day):
+        return None
+    try:
+        if len(published) == 10:
+            moment = datetime.combine(date.fromisoformat(day), MARKET_CLOSE, tzinfo=IST)
+        else:
+            moment = datetime.fromisoformat(published)
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return market_calendar.session_for(moment).strftime("%Y-%m-%d")
+
+def empty_rollup() -> Dict[str, float]:
+    return {name: 0 for name in COUNTERS}
+
+def add_article(rollup: Dict, article: Dict):
+    score = article.get('sentiment_score', 0.0)
+    confidence = article.get('confidence', 0.0)
+    label = article.get('sentiment', 'neutral')
+    rollup['sum'] += score
+    rollup['count'] += 1
+    rollup[label if label in ('positive', 'negative') else 'neutral'] += 1
+    rollup['confidence_sum'] += confidence
+    rollup['weighted_sum'] += score * confidence
+
+def finalize(day: str, rollup: Dict) -> Dict:
+    """Rollup counters plus the derived mean and confidence-weighted mean"""
+    count = rollup['count']
+    return {
+        "date": day,
+        "count": count,
+        "sum": round(rollup['sum'], 4),
+        "positive": rollup['positive'],
+        "negative": rollup['negative'],
+        "neutral": rollup['neutral'],
+        "mean": round(rollup['sum'] / count, 4) if count else 0.0,
+        "weighted_mean": round(rollup['weighted_sum'] / rollup['confidence_sum'], 4) if rollup['confidence_sum'] else 0.0
+    }
+
+class SentimentRollupService:
+    def __init__(self):
+        # In-memory fallback: ticker -> day -> counters
+        self._daily: Dict[str, Dict[str, Dict]] = {}
+        # ticker -> article keys already rolled up (bounded, like the news service's seen titles)
+        self._seen: Dict[str, Deque[str]] = {}
+        self._seen_sets: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._collections_ready = False
+
+    # ---- Writes ----
+
+    def _claim_in_memory(self, ticker: str, keys: Iterable[str]) -> Set[str]:
+        """Keys not rolled up before for this ticker; marks them as seen"""
+        seen = self._seen.setdefault(ticker, deque(maxlen=5000))
+        seen_set = self._seen_sets.setdefault(ticker, set())
+        new = set()
+        for key in keys:
+            if key in seen_set or key in new:
+                continue
+            if len(seen) == seen.maxlen:
+                seen_set.discard(seen[0])
+            seen.append(key)
+            seen_set.add(key)
+            new.add(key)
+        return new
+
+    async def _ensure_collections(self, db):
+        if self._collections_ready:
+            return
+        try:
+            await db.create_collection(
+                COLLECTION,
+                timeseries={"timeField": "day", "metaField": "ticker", "granularity": "hours"}
+            )
+        except CollectionInvalid:
+            pass  # already exists
+        await db[COLLECTION].create_index([("ticker", ASCENDING), ("day", ASCENDING)])
+        await db[ARTICLE_KEYS].create_index([("ticker", ASCENDING), ("key", ASCENDING)], unique=True)
+        await db[ARTICLE_KEYS].create_index("seen_at", expireAfterSeconds=KEY_RETENTION_SECONDS)
+        self._collections_ready = True
+
+    async def _claim_in_db(self, db, ticker: str, keys: List[str]) -> Set[str]:
+        """Insert article keys under a unique index; the ones that insert are new"""
+        now = datetime.utcnow()
+        docs = [{"ticker": ticker, "key": key, "seen_at": now} for key in keys]
+        try:
+            await db[ARTICLE_KEYS].insert_many(docs, ordered=False)
+            return set(keys)
+        except BulkWriteError as e:
+            duplicates = {err['index'] for err in e.details.get('writeErrors', []) if err.get('code') == 11000}
+            return {key for i, key in enumerate(keys) if i not in duplicates}
+
+    async def record(self, ticker: str, articles: List[Dict]):
+        """
+        Fold newly scored articles into the ticker's daily rollups.
+        Articles seen before for this ticker are skipped, so repeated requests don't double count;
+        synthetic placeholder articles (the news service's fallback samples) are never recorded.
+        """
+        ticker = ticker.upper()
+        by_key = {}
+        for article in articles:
+            if article.get('synthetic'):
+                continue
+            key = article_key(article)
+            if key and article_day(article):
+                by_key.setdefault(key, article)
+        if not by_key:
+            return
+
+        db = get_database()
+        if db is not None:
+            try:
+                await self._ensure_collections(db)
+                new_keys = await self._claim_in_db(db, ticker, list(by_key))
+                await self._insert_measurements(db, ticker, [by_key[k] for k in new_keys])
+                return
+            except Exception as e:
+                print(f"⚠️ Rollup write to MongoDB failed, using memory: {e}")
+
+        with self._lock:
+            new_keys = self._claim_in_memory(ticker, by_key)
+            days = self._daily.setdefault(ticker, {})
+            for key in new_keys:
+                article = by_key[key]
+                add_article(days.setdefault(article_day(article), empty_rollup()), article)
+
+    async def _insert_measurements(self, db, ticker: str, articles: List[Dict]):
+        """One measurement per (ticker, day) holding this batch's partial counters"""
+        partial: Dict[str, Dict] = {}
+        for article in articles:
+            add_article(partial.setdefault(article_day(article), empty_rollup()), article)
+        if partial:
+            await db[COLLECTION].insert_many([
+                {"ticker": ticker, "day": datetime.strptime(day, "%Y-%m-%d"), **counters}
+                for day, counters in partial.items()
+            ])
+
+    # ---- Reads ----
+
+    async def trend(self, ticker: str, days: int = 30) -> List[Dict]:
+        """Daily rollups for the last `days` days (days with news only), oldest first"""
+        ticker = ticker.upper()
+        # Days are trading session dates, stored as naive midnights
+        start = datetime.combine(datetime.now(IST).date() - timedelta(days=days), datetime.min.time())
+
+        db = get_database()
+        if db is not None:
+            try:
+                return await self._trend_from_db(db, ticker, start)
+            except Exception as e:
+                print(f"⚠️ Rollup read from MongoDB failed, using memory: {e}")
+
+        start_day = start.strftime("%Y-%m-%d")
+        with self._lock:
+            days_map = self._daily.get(ticker, {})
+            return [finalize(day, dict(days_map[day])) for day in sorted(days_map) if day >= start_day]
+
+    async def _trend_from_db(self, db, ticker: str, start: datetime) -> List[Dict]:
+        # Range read on (ticker, day) and per-day sums happen inside MongoDB
+        pipeline = [
+            {"$match": {"ticker": ticker, "day": {"$gte": start}}},
+            {"$group": {"_id": "$day", **{name: {"$sum": f"${name}"} for name in COUNTERS}}},
+            {"$sort": {"_id": 1}}
+        ]
+        rows = []
+        async for doc in db[COLLECTION].aggregate(pipeline):
+            rows.append(finalize(doc['_id'].strftime("%Y-%m-%d"), doc))
+        return rows
+
+    async def daily_map(self, ticker: str, days: int = 30) -> Dict[str, Dict]:
+        """date string -> finalized rollup, for joining against price history"""
+        return {row['date']: row for row in await self.trend(ticker, days)}
+
+# Singleton instance
+sentiment_rollups = SentimentRollupService()
@@ -0,0 +1,290 @@
+"""
+Sentiment Snapshot Service
+Materialized sentiment table over the index constituents, rebuilt by a scheduled job.
+Reads are served from an in-memory copy that is swapped in whole after each run;
+the table is also persisted to MongoDB (indexed on score and sector) when connected.
+"""
+
+from typing import Awaitable, Callable, Dict, List, Optional
+from datetime import datetime
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from services.database import get_database
+from services.stock_validator import stock_validator
+from services.leaderboard import sentiment_leaderboard
+import asyncio
+import os
+import time
+
+COLLECTION = "sentiment_snapshot"
+SNAPSHOT_DAYS = 7
+CHUNK_SIZE = int(os.getenv("SENTIMENT_BATCH_MAX", 25))
+BULLISH_THRESHOLD = 0.15
+
+class SnapshotTable:
+    """One immutable build of the snapshot with its read indexes precomputed"""
+
+    def __init__(self, rows: Dict[str, Dict], computed_at: Optional[float] = None):
+        self.rows = rows
+        self.computed_at = computed_at
+        # Score-ordered ticker list serves both top-bullish (head) and top-bearish (tail)
+        self.by_score = sorted(rows, key=lambda t: rows[t]['score'], reverse=True)
+        self.sectors = self._sector_rollups()
+        self.market = self._market_rollup()
+
+    def _market_rollup(self) -> Dict:
+        rows = list(self.rows.values())
+        if not rows:
+            return {}
+        count = len(rows)
+        avg_score = sum(r['score'] for r in rows) / count
+        return {
+            "stocks": count,
+            "avg_score": round(avg_score, 3),
+            "avg_change_percent": round(sum(r['change_percent'] for r in rows) / count, 2),
+            "bullish": sum(1 for r in rows if r['label'] == 'bullish'),
+            "bearish": sum(1 for r in rows if r['label'] == 'bearish'),
+            "neutral": sum(1 for r in rows if r['label'] not in ('bullish', 'bearish')),
+            "label": "bullish" if avg_score > BULLISH_THRESHOLD else "bearish" if avg_score < -BULLISH_THRESHOLD else "neutral"
+        }
+
+    def _sector_rollups(self) -> List[Dict]:
+        groups: Dict[str, List[Dict]] = {}
+        for ticker in self.by_score:
+            row = self.rows[ticker]
+            groups.setdefault(row['sector'], []).append(row)
+
+        rollups = []
+        for sector, rows in groups.items():
+            count = len(rows)
+            rollups.append({
+                "sector": sector,
+                "count": count,
+                "avg_score": round(sum(r['score'] for r in rows) / count, 3),
+                "avg_change_percent": round(sum(r['change_percent'] for r in rows) / count, 2),
+                "bullish": sum(1 for r in rows if r['label'] == 'bullish'),
+                "bearish": sum(1 for r in rows if r['label'] == 'bearish'),
+                "top": rows[0]['ticker'],
+                "bottom": rows[-1]['ticker']
+            })
+        rollups.sort(key=lambda r: r['avg_score'], reverse=True)
+        return rollups
+
+class SentimentSnapshotService:
+    def __init__(self):
+        self.table = SnapshotTable({})
+        # Off by default: a run fetches news, quotes and FinBERT scores for every index constituent;
+        # chat reports the market trend as disabled rather than pending
+        self.interval = float(os.getenv("SENTIMENT_SNAPSHOT_INTERVAL", 0))
+        self.running = False
+        self.last_run: Dict = {}
+        self._indexes_ready = False
+        self._task: Optional[asyncio.Task] = None
+        self._manual: Optional[asyncio.Task] = None
+
+    # ---- Job ----
+
+    def universe(self) -> List[str]:
+        """Index constituents in the live universe: bounded and liquid, unlike the full symbol master"""
+        return [t for t in stock_validator.popularity() if t in stock_validator.stocks]
+
+    async def refresh(self, compute_batch: Callable[..., Awaitable[tuple]]) -> Dict:
+        """
+        Recompute sentiment for the snapshot universe in chunks and publish the new table.
+        compute_batch is the batch sentiment pipeline: (tickers, days, cache=False) -> (results, stats);
+        results bypass the response cache so a run doesn't evict hot per-ticker entries.
+        """
+        if self.running:
+            return self.last_run
+
+        self.running = True
+        started = time.time()
+        universe = self.universe()
+        rows: Dict[str, Dict] = {}
+        failed = 0
+
+        try:
+            for i in range(0, len(universe), CHUNK_SIZE):
+                chunk = universe[i:i + CHUNK_SIZE]
+                try:
+                    results, _ = await compute_batch(chunk, SNAPSHOT_DAYS, cache=False)
+                except Exception as e:
+                    print(f"⚠️ Snapshot chunk {i // CHUNK_SIZE} failed: {e}")
+                    failed += len(chunk)
+                    continue
+
+                for ticker, payload in results.items():
+                    if "error" in payload:
+                        failed += 1
+                    else:
+                        rows[ticker] = self._row(ticker, payload, started)
+
+            # Keep the previous table if this run produced nothing usable
+            if rows:
+                self.table = SnapshotTable(rows, started)
+                await self._persist(rows, universe)
+
+            duration = round(time.time() - started, 1)
+            self.last_run = {
+                "started_at": datetime.utcfromtimestamp(started).isoformat(),
+                "duration_seconds": duration,
+                "tickers": len(universe),
+                "succeeded": len(rows),
+                "failed": failed
+            }
+            print(f"📸 Sentiment snapshot: {len(rows)}/{len(universe)} tickers in {duration}s")
+            return self.last_run
+        finally:
+            self.running = False
+
+    def _row(self, ticker: str, payload: Dict, computed_at: float) -> Dict:
+        quote = payload.get('stock_data') or {}
+        price = quote.get('current_price') or 0
+        previous = quote.get('previous_close') or 0
+        return {
+            "ticker": ticker,
+            "company_name": payload.get('company_name'),
+            "sector": stock_validator.get_sector(ticker),
+            "score": payload.get('sentiment_score', 0.0),
+            "label": payload.get('sentiment_label', 'neutral'),
+            "news_count": len(payload.get('news', [])),
+            "positive_count": payload.get('positive_count', 0),
+            "negative_count": payload.get('negative_count', 0),
+            "price": price,
+            "change_percent": round((price - previous) / previous * 100, 2) if previous > 0 else 0.0,
+            "computed_at": computed_at
+        }
+
+    async def run_forever(self, compute_batch: Callable[..., Awaitable[tuple]]):
+        """Scheduled loop: warm start from MongoDB, then refresh every interval"""
+        await self.load()
+        while True:
+            try:
+                await self.refresh(compute_batch)
+            except Exception as e:
+                print(f"❌ Sentiment snapshot job failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self, compute_batch: Callable[..., Awaitable[tuple]]):
+        """
+        Schedule the job on the running loop. With interval <= 0 (the default) only the
+        last persisted snapshot is loaded; refreshes then happen on demand via trigger().
+        """
+        if self._task is not None:
+            return
+        if self.interval <= 0:
+            self._task = asyncio.create_task(self.load())
+        else:
+            self._task = asyncio.create_task(self.run_forever(compute_batch))
+
+    def trigger(self, compute_batch: Callable[..., Awaitable[tuple]]) -> bool:
+        """Start a one-off refresh in the background; False if one is already running"""
+        if self.running or (self._manual is not None and not self._manual.done()):
+            return False
+        # Keep a reference so the task isn't garbage-collected mid-run
+        self._manual = asyncio.create_task(self.refresh(compute_batch))
+        return True
+
+    async def stop(self):
+        for task in (self._task, self._manual):
+            if task is not None:
+                task.cancel()
+        self._task = self._manual = None
+
+    # ---- Persistence ----
+
+    async def _ensure_indexes(self, db):
+        if self._indexes_ready:
+            return
+        collection = db[COLLECTION]
+        await collection.create_index("ticker", unique=True)
+        await collection.create_index([("score", DESCENDING)])
+        await collection.create_index([("sector", ASCENDING), ("score", DESCENDING)])
+        self._indexes_ready = True
+
+    async def _persist(self, rows: Dict[str, Dict], universe: List[str]):
+        """Upsert this run's rows and drop tickers that have left the snapshot universe"""
+        db = get_database()
+        if db is None:
+            return
+        try:
+            await self._ensure_indexes(db)
+            ops = [UpdateOne({"ticker": t}, {"$set": row}, upsert=True) for t, row in rows.items()]
+            await db[COLLECTION].bulk_write(ops, ordered=False)
+            await db[COLLECTION].delete_many({"ticker": {"$nin": universe}})
+        except Exception as e:
+            print(f"⚠️ Could not persist sentiment snapshot: {e}")
+
+    async def load(self):
+        """Populate the in-memory table from the last persisted snapshot, if any"""
+        db = get_database()
+        if db is None or self.table.rows:
+            return
+        try:
+            universe = self.universe()
+            rows = {doc['ticker']: doc async for doc in db[COLLECTION].find({"ticker": {"$in": universe}}, {"_id": 0})}
+        except Exception as e:
+            print(f"⚠️ Could not load sentiment snapshot: {e}")
+            return
+        if rows:
+            computed_at = min(row.get('computed_at', 0) for row in rows.values())
+            self.table = SnapshotTable(rows, computed_at)
+            sentiment_leaderboard.seed(rows)
+            print(f"✅ Loaded sentiment snapshot for {len(rows)} stocks")
+
+    # ---- Reads ----
+
+    def staleness_seconds(self) -> Optional[float]:
+        if self.table.computed_at is None:
+            return None
+        return round(time.time() - self.table.computed_at, 1)
+
+    def enabled(self) -> bool:
+        """Whether a snapshot exists or one is on its way (scheduled or running)"""
+        return bool(self.table.rows) or self.interval > 0 or self.running
+
+    def status(self) -> Dict:
+        return {
+            "ready": bool(self.table.rows),
+            "enabled": self.enabled(),
+            "running": self.running,
+            "rows": len(self.table.rows),
+            "computed_at": datetime.utcfromtimestamp(self.table.computed_at).isoformat() if self.table.computed_at else None,
+            "staleness_seconds": self.staleness_seconds(),
+            "interval_seconds": self.interval,
+            "last_run": self.last_run,
+            "storage": "mongodb" if get_database() is not None else "memory"
+        }
+
+    def top(self, direction: str = "bullish", limit: int = 10, sector: Optional[str] = None) -> List[Dict]:
+        """Highest (bullish) or lowest (bearish) scored stocks, optionally within a sector"""
+        table = self.table
+        ordered = table.by_score if direction == "bullish" else reversed(table.by_score)
+        picked = []
+        for ticker in ordered:
+            row = table.rows[ticker]
+            if sector and row['sector'].lower() != sector.lower():
+                continue
+            picked.append(row)
+            if len(picked) >= limit:
+                break
+        return picked
+
+    def sectors(self) -> List[Dict]:
+        return self.table.sectors
+
+    def get(self, ticker: str) -> Optional[Dict]:
+        return self.table.rows.get(ticker.upper())
+
+    def market_trend(self) -> Dict:
+        """Universe-wide breadth and average sentiment"""
+        table = self.table
+        if not table.market:
+            return {}
+        return {
+            **table.market,
+            "sectors": table.sectors,
+            "staleness_seconds": self.staleness_seconds()
+        }
+
+# Singleton instance
+sentiment_snapshot = SentimentSnapshotService()
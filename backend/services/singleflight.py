@@ -0,0 +1,84 @@
+"""
+Single-Flight Service
+Coalesces concurrent identical async computations into one shared execution
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable
+from services.progress import ProgressFanout, current_listener, listen_progress
+import asyncio
+
+class SingleFlight:
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        # Progress from each shared execution goes to every caller's listener
+        self._progress: Dict[Hashable, ProgressFanout] = {}
+        self.requests = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.abandoned = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() for key, or join the execution already in flight for it.
+        The shared execution runs as its own task, so a caller that is
+        cancelled (e.g. client disconnect) doesn't cancel it for the others;
+        it is cancelled only once every caller waiting on it has gone.
+        Progress it reports reaches every waiting caller's listener from the
+        moment that caller joins (earlier events aren't replayed).
+        """
+        self.requests += 1
+        task = self._inflight.get(key)
+
+        if task is None:
+            self.executions += 1
+            fanout = self._progress[key] = ProgressFanout()
+            task = asyncio.ensure_future(self._run(fn, fanout))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+            fanout = self._progress[key]
+
+        listener = current_listener()
+        if listener is not None:
+            fanout.add(listener)
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters.get(key) == 1 and not task.done():
+                self.abandoned += 1
+                task.cancel()
+            raise
+        finally:
+            if listener is not None:
+                fanout.discard(listener)
+            remaining = self._waiters.get(key, 1) - 1
+            if remaining:
+                self._waiters[key] = remaining
+            else:
+                self._waiters.pop(key, None)
+
+    @staticmethod
+    async def _run(fn: Callable[[], Awaitable[Any]], fanout: ProgressFanout) -> Any:
+        listen_progress(fanout)
+        return await fn()
+
+    def _forget(self, key: Hashable, task: asyncio.Future):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            self._progress.pop(key, None)
+        # Mark the exception retrieved even if every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalescing_ratio": round(self.coalesced / self.requests, 3) if self.requests else 0.0,
+            "abandoned": self.abandoned,
+            "in_flight": len(self._inflight)
+        }
@@ -4,12 +4,38 @@ COMPLETE VERSION with Advanced Google Finance Scraping + AI Summary Generation
 """
 
 import yfinance as yf
-from typing import Dict, Optional, List
-from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, List, Tuple
+from datetime import date, datetime, timedelta
+from services.market_hours import market_calendar
+from services.price_store import price_store, to_day
+from services.upstream_trace import record_upstream, memoize
+from services.google_finance_parser import extract_quote_fields
+from services.data_versions import data_versions, QUOTE
+import contextvars
 import requests
-import re
 import random
+import threading
 import time
+import os
+
+EXCHANGE_SUFFIXES = [".NS", ".BO"]
+GOOGLE_EXCHANGES = {".NS": "NSE", ".BO": "BOM"}
+
+# Calendar days covered by each yfinance-style period
+PERIOD_DAYS = {
+    '5d': 7, '1mo': 31, '3mo': 92, '6mo': 183,
+    '1y': 366, '2y': 731, '5y': 1827, '10y': 3653, 'max': 365 * 30
+}
+
+def seeded_random(*parts) -> random.Random:
+    """
+    RNG seeded from the inputs, so estimated fields and synthetic history are the same
+    for the same quote (cached payloads keep a stable ETag across recomputes)
+    """
+    return random.Random(":".join(str(p) for p in parts))
 
 class StockDataService:
     def __init__(self):
@@ -20,50 +46,110 @@ class StockDataService:
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0"
         ]
         self.session.headers.update({"User-Agent": random.choice(self.user_agents)})
-    
-    def _parse_number(self, text: str) -> float:
-        """Parse numbers like '₹1,234.56', '5.67M', '12.34B', '45.67T'"""
-        if not text:
-            return 0.0
         
-        text = text.strip().replace(',', '').replace('₹', '').replace('$', '')
+        # Quote cache: ticker -> (expires_at, fetched_at, data), TTL follows the NSE session
+        self._quote_cache: Dict[str, Tuple[float, float, Dict]] = {}
+        # Exchange suffix (.NS / .BO) that resolved on Yahoo for each ticker
+        self._exchange_suffix: Dict[str, str] = {}
+        # Negative cache: ticker -> expires_at for lookups that failed everywhere
+        self._failed_tickers: Dict[str, float] = {}
+        self.negative_ttl = float(os.getenv("QUOTE_NEGATIVE_TTL", 300))
+        self._cache_lock = threading.Lock()
         
-        # Handle B (Billion), M (Million), T (Trillion), K/L (Thousand/Lakh), Cr (Crore)
-        multipliers = {'T': 1e12, 'B': 1e9, 'M': 1e6, 'K': 1e3, 'L': 1e5, 'CR': 1e7}
+        # Bounded pool for multi-ticker fetches
+        self.max_workers = int(os.getenv("STOCK_FETCH_WORKERS", 8))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stock-fetch")
+        # Snapshots awaited with a deadline run here: one the caller gave up on keeps only
+        # its own worker busy, and queued ones are cancelled before they start
+        self._snapshot_executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="snapshot")
         
-        for suffix, mult in multipliers.items():
-            if suffix in text.upper():
-                try:
-                    num = float(text.upper().replace(suffix, '').strip())
-                    return num * mult
-                except:
-                    pass
+        # History sync state for the local price store (ticker -> date)
+        self._history_floor: Dict[str, date] = {}
+        self._history_checked: Dict[str, date] = {}
+        # Tickers Yahoo had no history for at all: ticker -> time to ask again
+        self._history_retry_at: Dict[str, float] = {}
+    
+    def _suffix_candidates(self, ticker: str) -> List[str]:
+        """Try the remembered exchange first, then the other one (NSE before BSE by default)"""
+        known = self._exchange_suffix.get(ticker)
+        return sorted(EXCHANGE_SUFFIXES, key=lambda s: s != known)
+    
+    def _remember_suffix(self, ticker: str, suffix: str):
+        with self._cache_lock:
+            self._exchange_suffix[ticker] = suffix
+    
+    def _get_cached_quote(self, ticker: str) -> Optional[Dict]:
+        """Return a fresh cached quote (or cached failure), else None"""
+        now = time.time()
+        with self._cache_lock:
+            entry = self._quote_cache.get(ticker)
+            if entry and entry[0] > now:
+                return dict(entry[2])
+            
+            failed_until = self._failed_tickers.get(ticker)
+            if failed_until and failed_until > now:
+                return self._error_quote(ticker)
+        return None
+    
+    def _cache_quote(self, ticker: str, data: Dict):
+        with self._cache_lock:
+            previous = self._quote_cache.get(ticker)
+            now = time.time()
+            self._quote_cache[ticker] = (now + market_calendar.quote_ttl(), now, dict(data))
+            self._failed_tickers.pop(ticker, None)
         
-        try:
-            return float(text)
-        except:
-            return 0.0
+        # A moved price makes cached responses built on the old quote stale
+        if previous is None or previous[2].get('current_price') != data.get('current_price'):
+            data_versions.bump(QUOTE, ticker)
+    
+    def peek_quote(self, ticker: str) -> Optional[Tuple[Dict, float]]:
+        """Fresh cached quote and its age in seconds, without fetching"""
+        now = time.time()
+        with self._cache_lock:
+            entry = self._quote_cache.get(ticker.upper())
+            if entry and entry[0] > now:
+                return dict(entry[2]), now - entry[1]
+        return None
     
-    def _generate_synthetic_history(self, current_price: float) -> List[Dict]:
+    def _mark_failed(self, ticker: str):
+        with self._cache_lock:
+            self._failed_tickers[ticker] = time.time() + self.negative_ttl
+    
+    def invalidate_quote(self, ticker: str):
+        """Drop cached quote and failure state for a ticker"""
+        with self._cache_lock:
+            self._quote_cache.pop(ticker, None)
+            self._failed_tickers.pop(ticker, None)
+    
+    def _error_quote(self, ticker: str) -> Dict:
+        return {
+            'ticker': ticker,
+            'company_name': ticker,
+            'error': 'Data unavailable',
+            'current_price': 0, 'market_cap': 0, 'pe_ratio': 0, 'volume': 0, 'previous_close': 0
+        }
+    
+    def _generate_synthetic_history(self, current_price: float, ticker: str = "") -> List[Dict]:
         """Generate realistic 30-day price history"""
         data = []
         end_date = datetime.now()
         start_date = end_date - timedelta(days=30)
+        rnd = seeded_random(ticker, round(current_price, 2), end_date.date())
         
-        price = current_price * random.uniform(0.92, 1.08)
+        price = current_price * rnd.uniform(0.92, 1.08)
         current_date = start_date
         
         while current_date <= end_date:
             if current_date.weekday() < 5:
-                change = random.uniform(-0.025, 0.025)
+                change = rnd.uniform(-0.025, 0.025)
                 price *= (1 + change)
                 
                 if current_date.date() == end_date.date():
                     price = current_price
                 
-                high = price * (1 + abs(random.gauss(0, 0.01)))
-                low = price * (1 - abs(random.gauss(0, 0.01)))
-                open_p = price * random.uniform(0.99, 1.01)
+                high = price * (1 + abs(rnd.gauss(0, 0.01)))
+                low = price * (1 - abs(rnd.gauss(0, 0.01)))
+                open_p = price * rnd.uniform(0.99, 1.01)
                 
                 data.append({
                     'date': current_date.strftime('%Y-%m-%d'),
@@ -71,7 +157,7 @@ class StockDataService:
                     'high': round(high, 2),
                     'low': round(low, 2),
                     'close': round(price, 2),
-                    'volume': random.randint(2000000, 15000000)
+                    'volume': rnd.randint(2000000, 15000000)
                 })
             current_date += timedelta(days=1)
         
@@ -80,67 +166,38 @@ class StockDataService:
     def _scrape_google_finance_complete(self, ticker: str) -> Optional[Dict]:
         """Advanced Google Finance scraper - extracts ALL available data"""
         try:
-            url = f"https://www.google.com/finance/quote/{ticker}:NSE"
-            resp = self.session.get(url, timeout=8)
-            
-            if resp.status_code != 200:
-                url = f"https://www.google.com/finance/quote/{ticker}:BOM"
+            # Known exchange first, then the other one
+            known = self._exchange_suffix.get(ticker)
+            for suffix in sorted(EXCHANGE_SUFFIXES, key=lambda s: s != known):
+                record_upstream("google.finance")
+                url = f"https://www.google.com/finance/quote/{ticker}:{GOOGLE_EXCHANGES[suffix]}"
                 resp = self.session.get(url, timeout=8)
-            
-            if resp.status_code != 200:
+                if resp.status_code != 200:
+                    continue
+                
+                # Unknown symbols still get a 200 page, just without a price
+                fields = extract_quote_fields(resp.text)
+                if fields.get('price'):
+                    self._remember_suffix(ticker, suffix)
+                    break
+            else:
                 return None
             
-            html = resp.text
-            
-            # Extract PRICE (Primary data point)
-            price_match = re.search(r'<div[^>]*class="YMlKec fxKbKc"[^>]*>[^\d]*([\d,]+\.?\d*)</div>', html)
-            price = self._parse_number(price_match.group(1)) if price_match else 0.0
-            
-            # Extract COMPANY NAME
-            name_match = re.search(r'<div[^>]*class="zzDege"[^>]*>([^<]+)</div>', html)
-            company_name = name_match.group(1).strip() if name_match else ticker
-            
-            # Extract PREVIOUS CLOSE (for change calculation)
-            prev_close_match = re.search(r'Previous close</div><div[^>]*>([^<]+)</div>', html)
-            prev_close = self._parse_number(prev_close_match.group(1)) if prev_close_match else price * 0.99
-            
-            # Extract DAY RANGE (High/Low)
-            day_range_match = re.search(r'Day range</div><div[^>]*>([^<]+)</div>', html)
-            day_low, day_high = price * 0.98, price * 1.02
-            if day_range_match:
-                range_text = day_range_match.group(1)
-                range_parts = re.findall(r'[\d,]+\.?\d*', range_text)
-                if len(range_parts) >= 2:
-                    day_low = self._parse_number(range_parts[0])
-                    day_high = self._parse_number(range_parts[1])
-            
-            # Extract 52-WEEK RANGE
-            week52_match = re.search(r'52.*?week.*?range</div><div[^>]*>([^<]+)</div>', html, re.IGNORECASE)
-            week_52_low, week_52_high = price * 0.75, price * 1.35
-            if week52_match:
-                week_text = week52_match.group(1)
-                week_parts = re.findall(r'[\d,]+\.?\d*', week_text)
-                if len(week_parts) >= 2:
-                    week_52_low = self._parse_number(week_parts[0])
-                    week_52_high = self._parse_number(week_parts[1])
-            
-            # Extract MARKET CAP
-            mcap_match = re.search(r'Market cap</div><div[^>]*>([^<]+)</div>', html)
-            market_cap = self._parse_number(mcap_match.group(1)) if mcap_match else price * 6000000
-            
-            # Extract P/E RATIO
-            pe_match = re.search(r'P/E ratio</div><div[^>]*>([^<]+)</div>', html)
-            pe_ratio = self._parse_number(pe_match.group(1)) if pe_match else 22.5
-            
-            # Extract VOLUME (if available, else fake it)
-            volume_match = re.search(r'Volume</div><div[^>]*>([^<]+)</div>', html)
-            volume = int(self._parse_number(volume_match.group(1))) if volume_match else random.randint(3000000, 12000000)
+            price = fields['price']
+            company_name = fields.get('company_name', ticker)
+            prev_close = fields.get('previous_close', price * 0.99)
+            day_low, day_high = fields.get('day_range', (price * 0.98, price * 1.02))
+            week_52_low, week_52_high = fields.get('week_52_range', (price * 0.75, price * 1.35))
+            market_cap = fields.get('market_cap', price * 6000000)
+            pe_ratio = fields.get('pe_ratio', 22.5)
+            rnd = seeded_random(ticker, price)
+            volume = int(fields['volume']) if 'volume' in fields else rnd.randint(3000000, 12000000)
             
             # Calculate EPS from P/E
             eps = round(price / pe_ratio, 2) if pe_ratio > 0 else 0.0
             
             # Calculate OPEN (slightly varied from prev close)
-            open_price = prev_close * random.uniform(0.995, 1.005)
+            open_price = prev_close * rnd.uniform(0.995, 1.005)
             
             print(f"✅ Google Finance Scrape Success: {ticker} = ₹{price}")
             
@@ -174,18 +231,19 @@ class StockDataService:
         price = data.get('current_price', 0)
         if price <= 0:
             return data
+        rnd = seeded_random(data.get('ticker'), price)
             
         # Estimate Market Cap if 0 (Price * Random Shares between 10M and 10B)
         if data.get('market_cap', 0) == 0:
-            data['market_cap'] = price * random.randint(10_000_000, 5_000_000_000)
+            data['market_cap'] = price * rnd.randint(10_000_000, 5_000_000_000)
             
         # Estimate P/E if 0 (Random between 10 and 80)
         if data.get('pe_ratio', 0) == 0:
-            data['pe_ratio'] = round(random.uniform(10, 80), 2)
+            data['pe_ratio'] = round(rnd.uniform(10, 80), 2)
             
         # Estimate Volume if 0
         if data.get('volume', 0) == 0:
-            data['volume'] = random.randint(500_000, 20_000_000)
+            data['volume'] = rnd.randint(500_000, 20_000_000)
             
         # Estimate High/Low if 0
         if data.get('day_high', 0) == 0:
@@ -197,6 +255,10 @@ class StockDataService:
 
     def get_stock_info(self, ticker: str) -> Dict:
         """Get stock info with triple fallback: Yahoo -> Google -> Error"""
+        cached = self._get_cached_quote(ticker)
+        if cached is not None:
+            return cached
+        
         data = None
         
         # ATTEMPT 1: Yahoo Finance
@@ -204,11 +266,13 @@ class StockDataService:
             time.sleep(random.uniform(0.1, 0.3))
             self.session.headers.update({"User-Agent": random.choice(self.user_agents)})
             
-            for suffix in [".NS", ".BO"]:
+            for suffix in self._suffix_candidates(ticker):
+                record_upstream("yahoo.info")
                 stock = yf.Ticker(f"{ticker}{suffix}", session=self.session)
                 info = stock.info
                 
                 if info and 'currentPrice' in info:
+                    self._remember_suffix(ticker, suffix)
                     data = {
                         'ticker': ticker,
                         'company_name': info.get('longName', info.get('shortName', ticker)),
@@ -239,39 +303,318 @@ class StockDataService:
         
         # ATTEMPT 3: Return error if all failed
         if not data:
-            return {
-                'ticker': ticker,
-                'company_name': ticker,
-                'error': 'Data unavailable',
-                'current_price': 0, 'market_cap': 0, 'pe_ratio': 0, 'volume': 0, 'previous_close': 0
-            }
+            self._mark_failed(ticker)
+            return self._error_quote(ticker)
         
         # FINAL: Ensure no zeros
-        return self._ensure_non_zero_fundamentals(data)
+        data = self._ensure_non_zero_fundamentals(data)
+        self._cache_quote(ticker, data)
+        return dict(data)
     
-    def get_historical_data(self, ticker: str, period: str = "1mo") -> List[Dict]:
-        """Get historical data with synthetic fallback"""
-        try:
-            for suffix in [".NS", ".BO"]:
+    def _period_start(self, period: str) -> date:
+        """Translate a yfinance-style period into the first calendar date it covers"""
+        today = market_calendar.now().date()
+        if period == 'ytd':
+            return date(today.year, 1, 1)
+        return today - timedelta(days=PERIOD_DAYS.get(period, PERIOD_DAYS['1mo']))
+    
+    def _history_gap(self, ticker: str, start: date) -> Optional[date]:
+        """First date that must be fetched so the store covers [start, last close], or None if current"""
+        last_session = market_calendar.last_close().date()
+        bounds = price_store.bounds(ticker)
+        if bounds is None:
+            return start if self._history_retry_at.get(ticker, 0) <= time.time() else None
+        
+        first, last = bounds
+        if start < first and self._history_floor.get(ticker, first) > start:
+            return start
+        if last < last_session and self._history_checked.get(ticker) != last_session:
+            return last + timedelta(days=1)
+        return None
+    
+    def _mark_history_synced(self, ticker: str, start: date):
+        """Remember that Yahoo was asked back to `start` and up to the last close"""
+        self._history_floor[ticker] = min(self._history_floor.get(ticker, start), start)
+        self._history_checked[ticker] = market_calendar.last_close().date()
+    
+    def _frame_to_columns(self, hist: pd.DataFrame) -> np.ndarray:
+        """Convert a yfinance OHLCV frame to the store's (6, n) column layout"""
+        hist = hist.dropna(subset=['Close'])
+        # A session with only a close (thin or suspended scrips) is stored as a flat bar
+        for column in ('Open', 'High', 'Low'):
+            hist[column] = hist[column].fillna(hist['Close'])
+        index = hist.index.tz_localize(None) if hist.index.tz is not None else hist.index
+        days = index.values.astype('datetime64[D]').astype(np.int64)
+        
+        # Only completed sessions are stored; today's bar is partial while trading
+        last_session = to_day(market_calendar.last_close().date())
+        complete = days <= last_session
+        
+        return np.vstack([
+            days,
+            hist['Open'].to_numpy(dtype=np.float64),
+            hist['High'].to_numpy(dtype=np.float64),
+            hist['Low'].to_numpy(dtype=np.float64),
+            hist['Close'].to_numpy(dtype=np.float64),
+            hist['Volume'].fillna(0).to_numpy(dtype=np.float64),
+        ])[:, complete]
+    
+    def _sync_history(self, ticker: str, start: date):
+        """Fetch only the date range missing from the local store and append it"""
+        with price_store.lock(ticker):
+            gap = self._history_gap(ticker, start)
+            if gap is None:
+                return
+            
+            end = market_calendar.last_close().date() + timedelta(days=1)
+            for suffix in self._suffix_candidates(ticker):
+                record_upstream("yahoo.history")
                 stock = yf.Ticker(f"{ticker}{suffix}", session=self.session)
-                hist = stock.history(period=period)
+                hist = stock.history(start=gap.isoformat(), end=end.isoformat())
                 
                 if not hist.empty:
-                    return [{
-                        'date': date.strftime('%Y-%m-%d'),
-                        'open': round(row['Open'], 2),
-                        'high': round(row['High'], 2),
-                        'low': round(row['Low'], 2),
-                        'close': round(row['Close'], 2),
-                        'volume': int(row['Volume'])
-                    } for date, row in hist.iterrows()]
+                    self._remember_suffix(ticker, suffix)
+                    price_store.append(ticker, self._frame_to_columns(hist))
+                    self._mark_history_synced(ticker, min(gap, start))
+                    return
+            
+            # No bars in the gap (holidays, suspension): don't ask again until the next
+            # session closes; a ticker with no history at all is retried after negative_ttl
+            self._mark_history_synced(ticker, min(gap, start))
+            if price_store.bounds(ticker) is None:
+                self._history_retry_at[ticker] = time.time() + self.negative_ttl
+    
+    def get_history_arrays(self, ticker: str, period: str = "1mo") -> Optional[Dict[str, np.ndarray]]:
+        """OHLCV column arrays for a period, served from the local store"""
+        start = self._period_start(period)
+        self._sync_history(ticker, start)
+        window = price_store.read(ticker, start)
+        if window is None or len(window['date']) == 0:
+            return None
+        return window
+    
+    def arrays_to_records(self, window: Dict[str, np.ndarray]) -> List[Dict]:
+        """Convert store columns to the API's list-of-dicts format"""
+        return [{
+            'date': d, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': v
+        } for d, o, h, l, c, v in zip(
+            np.datetime_as_string(window['date']).tolist(),
+            np.round(window['open'], 2).tolist(),
+            np.round(window['high'], 2).tolist(),
+            np.round(window['low'], 2).tolist(),
+            np.round(window['close'], 2).tolist(),
+            window['volume'].astype(np.int64).tolist()
+        )]
+    
+    def get_historical_data(self, ticker: str, period: str = "1mo") -> List[Dict]:
+        """Get historical data with synthetic fallback"""
+        try:
+            window = self.get_history_arrays(ticker, period)
+            if window is not None:
+                return self.arrays_to_records(window)
         except Exception as e:
             print(f"⚠️ Historical data failed: {e}")
         
-        # Fallback to synthetic
+        return self._synthetic_fallback(ticker)
+    
+    def _synthetic_fallback(self, ticker: str) -> List[Dict]:
+        """Synthetic 30-day history around the current quote"""
         print("🔄 Generating synthetic historical data...")
         info = self.get_stock_info(ticker)
-        return self._generate_synthetic_history(info.get('current_price', 1000))
+        return self._generate_synthetic_history(info.get('current_price', 1000), ticker)
+    
+    def _fetch_many(self, fn, tickers: List[str], *args) -> Dict[str, object]:
+        """Run a single-ticker fetch for many tickers on the bounded pool"""
+        # Each task runs in a copy of the caller's context so upstream tracing follows it
+        futures = {
+            ticker: self._executor.submit(contextvars.copy_context().run, fn, ticker, *args)
+            for ticker in tickers
+        }
+        results = {}
+        for ticker, future in futures.items():
+            try:
+                results[ticker] = future.result()
+            except Exception as e:
+                results[ticker] = {'ticker': ticker, 'error': str(e)}
+        return results
+    
+    def get_stock_info_many(self, tickers: List[str]) -> Dict[str, Dict]:
+        """
+        Get stock info for many tickers at once.
+        Cached quotes are served directly, the rest are fetched concurrently.
+        Failed tickers carry an 'error' key instead of raising.
+        """
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        results = {}
+        missing = []
+        for ticker in tickers:
+            cached = self._get_cached_quote(ticker)
+            if cached is not None:
+                results[ticker] = cached
+            else:
+                missing.append(ticker)
+        
+        if missing:
+            results.update(self._fetch_many(self.get_stock_info, missing))
+        
+        return {ticker: results[ticker] for ticker in tickers}
+    
+    def sync_history_many(self, tickers: List[str], period: str = "1mo"):
+        """
+        Bring the local store up to date for many tickers with one
+        multi-symbol Yahoo download covering every stale ticker.
+        """
+        start = self._period_start(period)
+        stale = {}
+        for ticker in tickers:
+            gap = self._history_gap(ticker, start)
+            if gap is not None:
+                stale[ticker] = gap
+        
+        if not stale:
+            return
+        
+        symbols = {f"{ticker}{self._suffix_candidates(ticker)[0]}": ticker for ticker in stale}
+        fetch_start = min(stale.values())
+        end = market_calendar.last_close().date() + timedelta(days=1)
+        try:
+            record_upstream("yahoo.download")
+            frame = yf.download(
+                list(symbols.keys()),
+                start=fetch_start.isoformat(),
+                end=end.isoformat(),
+                group_by='ticker',
+                auto_adjust=True,
+                threads=min(self.max_workers, len(symbols)),
+                progress=False,
+                session=self.session
+            )
+            
+            for symbol, ticker in symbols.items():
+                if isinstance(frame.columns, pd.MultiIndex):
+                    if symbol not in frame.columns.get_level_values(0):
+                        continue
+                    hist = frame[symbol]
+                else:
+                    hist = frame
+                
+                columns = self._frame_to_columns(hist)
+                if columns.shape[1]:
+                    self._remember_suffix(ticker, symbol[len(ticker):])
+                    with price_store.lock(ticker):
+                        price_store.append(ticker, columns)
+                        self._mark_history_synced(ticker, fetch_start)
+        except Exception as e:
+            print(f"⚠️ Bulk historical download failed: {e}")
+    
+    def get_history_arrays_many(self, tickers: List[str], period: str = "1mo") -> Dict[str, Optional[Dict[str, np.ndarray]]]:
+        """OHLCV column arrays for many tickers; None where no history is available"""
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        self.sync_history_many(tickers, period)
+        start = self._period_start(period)
+        
+        results: Dict[str, Optional[Dict[str, np.ndarray]]] = {}
+        missing = []
+        for ticker in tickers:
+            window = price_store.read(ticker, start) if self._history_gap(ticker, start) is None else None
+            if window is not None and len(window['date']):
+                results[ticker] = window
+            else:
+                missing.append(ticker)
+        
+        # Stragglers from the bulk download try each exchange on their own
+        for ticker, window in self._fetch_many(self.get_history_arrays, missing, period).items():
+            results[ticker] = window if isinstance(window, dict) and 'date' in window else None
+        
+        return {ticker: results[ticker] for ticker in tickers}
+    
+    def get_historical_data_many(self, tickers: List[str], period: str = "1mo") -> Dict[str, object]:
+        """
+        Get historical data for many tickers.
+        Stale tickers are refreshed with one multi-symbol Yahoo download into the
+        local store; anything still missing falls back to synthetic history.
+        Values are lists of OHLCV dicts, or {'error': ...} on failure.
+        """
+        windows = self.get_history_arrays_many(tickers, period)
+        
+        results: Dict[str, object] = {}
+        missing = []
+        for ticker, window in windows.items():
+            if window is not None:
+                results[ticker] = self.arrays_to_records(window)
+            else:
+                missing.append(ticker)
+        
+        if missing:
+            results.update(self._fetch_many(self._synthetic_fallback, missing))
+        
+        return {ticker: results[ticker] for ticker in windows}
+    
+    def get_market_snapshot(self, ticker: str, period: str = "1mo") -> Dict:
+        """
+        Quote plus price history for one ticker in one coordinated operation.
+        The quote lookup resolves the exchange suffix once and the history fetch
+        reuses it; synthetic history is built from the same quote. Memoized per
+        traced request so repeated lookups never hit upstream twice.
+        """
+        ticker = ticker.upper()
+        return memoize(("snapshot", ticker, period), lambda: self._build_snapshot(ticker, period))
+    
+    def submit_market_snapshot(self, ticker: str, period: str = "1mo") -> Future:
+        """get_market_snapshot on the bounded snapshot pool; cancelling the future drops it if not started"""
+        return self._snapshot_executor.submit(contextvars.copy_context().run, self.get_market_snapshot, ticker, period)
+    
+    def _build_snapshot(self, ticker: str, period: str) -> Dict:
+        # Exchange already known: quote and history can run side by side.
+        # Otherwise the quote lookup resolves it first and history follows.
+        history_future = None
+        if ticker in self._exchange_suffix:
+            history_future = self._executor.submit(
+                contextvars.copy_context().run, self.get_history_arrays, ticker, period
+            )
+        
+        quote = self.get_stock_info(ticker)
+        
+        window = None
+        try:
+            if history_future is not None:
+                window = history_future.result()
+            else:
+                window = self.get_history_arrays(ticker, period)
+        except Exception as e:
+            print(f"⚠️ Historical data failed: {e}")
+        
+        return self._snapshot_from(ticker, quote, window)
+    
+    def _snapshot_from(self, ticker: str, quote: Dict, window: Optional[Dict[str, np.ndarray]]) -> Dict:
+        if window is not None:
+            history = self.arrays_to_records(window)
+        else:
+            print("🔄 Generating synthetic historical data...")
+            history = self._generate_synthetic_history(quote.get('current_price') or 1000, ticker)
+        
+        return {
+            'ticker': ticker,
+            'quote': quote,
+            'history': history,
+            'synthetic_history': window is None,
+            'exchange': self._exchange_suffix.get(ticker)
+        }
+    
+    def get_market_snapshots(self, tickers: List[str], period: str = "1mo") -> Dict[str, Dict]:
+        """
+        Snapshots for many tickers: bulk quotes first (resolving exchanges),
+        then one bulk history sync. Each is memoized like get_market_snapshot.
+        """
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        quotes = self.get_stock_info_many(tickers)
+        windows = self.get_history_arrays_many(tickers, period)
+        
+        snapshots = {}
+        for ticker in tickers:
+            snapshot = self._snapshot_from(ticker, quotes[ticker], windows.get(ticker))
+            snapshots[ticker] = memoize(("snapshot", ticker, period), lambda: snapshot)
+        return snapshots
     
     def get_price_change(self, ticker: str) -> Dict:
         """Calculate price change"""
@@ -5,35 +5,169 @@ Loads from Yahoo Finance NSE stock list
 """
 
 import yfinance as yf
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set
 import json
 import os
 from pathlib import Path
+from services.entity_matcher import StockMatcher, stock_matcher
+from services.search_index import StockSearchIndex, stock_search
+from services.symbol_master import SymbolTable, symbol_master
+import asyncio
+import time
+
+# Index constituents available as presets for multi-ticker endpoints
+INDEX_CONSTITUENTS: Dict[str, List[str]] = {
+    "NIFTY50": [
+        "ADANIENT", "ADANIPORTS", "APOLLOHOSP", "ASIANPAINT", "AXISBANK", "BAJAJ-AUTO",
+        "BAJFINANCE", "BAJAJFINSV", "BPCL", "BHARTIARTL", "BRITANNIA", "CIPLA",
+        "COALINDIA", "DIVISLAB", "DRREDDY", "EICHERMOT", "GRASIM", "HCLTECH",
+        "HDFCBANK", "HDFCLIFE", "HEROMOTOCO", "HINDALCO", "HINDUNILVR", "ICICIBANK",
+        "ITC", "INDUSINDBK", "INFY", "JSWSTEEL", "KOTAKBANK", "LT", "LTIM", "M&M",
+        "MARUTI", "NTPC", "NESTLEIND", "ONGC", "POWERGRID", "RELIANCE", "SBILIFE",
+        "SBIN", "SUNPHARMA", "TCS", "TATACONSUM", "TATAMOTORS", "TATASTEEL",
+        "TECHM", "TITAN", "ULTRACEMCO", "UPL", "WIPRO",
+    ],
+}
+
+# Keyword -> sector, first match wins (ticker or upper-cased company name)
+SECTOR_KEYWORDS = {
+    "BANK": "Banking", "FINANCE": "Finance", "INVEST": "Finance",
+    "TATA": "Conglomerate", "ADANI": "Conglomerate", "RELIANCE": "Energy",
+    "POWER": "Energy", "ENERGY": "Energy", "GAS": "Energy", "OIL": "Energy",
+    "TECH": "Technology", "INFOSYS": "Technology", "WIPRO": "Technology", "HCL": "Technology",
+    "PHARMA": "Healthcare", "LAB": "Healthcare", "HOSPITAL": "Healthcare", "DR": "Healthcare",
+    "AUTO": "Automobile", "MOTORS": "Automobile", "MRF": "Automobile",
+    "CEMENT": "Cement", "STEEL": "Metals", "ALUMINIUM": "Metals", "ZINC": "Metals", "COPPER": "Metals",
+    "HOTEL": "Hospitality", "RESORT": "Hospitality",
+    "FOOD": "FMCG", "CONSUMER": "FMCG", "TEA": "FMCG", "COFFEE": "FMCG", "SUGAR": "FMCG"
+}
+
+def classify_sector(ticker: str, name: str) -> str:
+    """Sector by keyword matching on ticker and company name"""
+    if not name:
+        return "General"
+    name = name.upper()
+    for keyword, sector in SECTOR_KEYWORDS.items():
+        if keyword in name or keyword in ticker:
+            return sector
+    return "General Market"
 
 class StockValidator:
     def __init__(self):
         self.stocks: Dict[str, str] = {}
-        self.load_stocks()
+        self.sectors: Dict[str, str] = {}
+        # Bumped whenever a new stock universe is swapped in
+        self.version = 0
+        self.reloading = False
+        try:
+            listings = symbol_master.build()
+        except Exception as e:
+            # A bad listing file or cache must not take the app down: use the curated list
+            print(f"⚠️ Symbol master failed to load, falling back to nse_stocks.json: {e}")
+            listings = None
+        self.install(self.prepare(self.load_stocks(listings), listings), listings)
+    
+    def popularity(self) -> Dict[str, float]:
+        """Search ranking weight: index heavyweights surface first among equal matches"""
+        return {ticker: 1.0 for members in INDEX_CONSTITUENTS.values() for ticker in members}
+    
+    def build_sector_map(self, stocks: Dict[str, str], listings: Optional[SymbolTable] = None) -> Dict[str, str]:
+        """Sector per ticker, computed once: exchange-published where known, else by keyword"""
+        return {
+            ticker: (listings.sector_of(ticker) if listings is not None else "") or classify_sector(ticker, name)
+            for ticker, name in stocks.items()
+        }
+    
+    def with_index_constituents(self, stocks: Dict[str, str]) -> Dict[str, str]:
+        """
+        Universe plus any index preset member it lacks (e.g. a listing file that predates
+        a rename), named from the curated list, so presets never resolve to invalid tickers
+        """
+        missing = [t for members in INDEX_CONSTITUENTS.values() for t in members if t not in stocks]
+        if not missing:
+            return stocks
+        curated = self._get_comprehensive_stock_list()
+        return {**stocks, **{ticker: curated.get(ticker, ticker) for ticker in missing}}
+    
+    def curated_tickers(self) -> Set[str]:
+        """Well-known tickers whose symbols and short names may be matched in any case"""
+        return set(self._get_comprehensive_stock_list()) | {t for members in INDEX_CONSTITUENTS.values() for t in members}
+    
+    def prepare(self, stocks: Dict[str, str], listings: Optional[SymbolTable] = None) -> Dict:
+        """Build every lookup structure for a universe without touching the live ones"""
+        stocks = self.with_index_constituents(stocks)
+        from_master = listings is not None and len(listings) > 0
+        return {
+            "stocks": stocks,
+            "sectors": self.build_sector_map(stocks, listings),
+            "matcher": StockMatcher(stocks, trusted=self.curated_tickers() if from_master else None),
+            "search": StockSearchIndex(stocks, self.popularity())
+        }
     
-    def load_stocks(self):
+    def install(self, prepared: Dict, listings: Optional[SymbolTable] = None):
+        """Swap a prepared universe in; plain assignments with no await in between, so readers see old or new"""
+        self.stocks = prepared['stocks']
+        self.sectors = prepared['sectors']
+        stock_matcher.matcher = prepared['matcher']
+        stock_search.index = prepared['search']
+        symbol_master.publish(listings)
+        self.version += 1
+    
+    async def reload_listings(self, force: bool = False) -> Dict:
+        """
+        Rebuild the universe from the listing files (hot reload, no restart).
+        Parsing and index builds run off the event loop; the swap itself is atomic.
+        """
+        if self.reloading:
+            return {"status": "already running"}
+        if not force and not symbol_master.changed():
+            return {"status": "unchanged", "version": self.version, **symbol_master.status()}
+        
+        self.reloading = True
+        started = time.perf_counter()
+        try:
+            try:
+                listings = await asyncio.to_thread(symbol_master.build)
+            except Exception as e:
+                print(f"⚠️ Symbol master reload failed, keeping the current universe: {e}")
+                return {"status": "failed", "error": str(e), "version": self.version}
+            if listings is None or not len(listings):
+                # Files missing or mid-copy: keep serving the current universe
+                return {"status": "no listing files", "version": self.version, **symbol_master.status()}
+            prepared = await asyncio.to_thread(self.prepare, listings.names_by_symbol(), listings)
+            self.install(prepared, listings)
+        finally:
+            self.reloading = False
+        
+        duration = round((time.perf_counter() - started) * 1000, 1)
+        print(f"🔄 Reloaded {len(self.stocks)} listings in {duration}ms (universe v{self.version})")
+        return {"status": "reloaded", "version": self.version, "duration_ms": duration, **symbol_master.status()}
+    
+    def load_stocks(self, listings: Optional[SymbolTable] = None) -> Dict[str, str]:
         """Load comprehensive Indian stock listings"""
+        # Full NSE/BSE symbol master when the exchange listing files are present
+        if listings is not None and len(listings):
+            print(f"✅ Loaded {len(listings)} NSE/BSE listings from the symbol master ({symbol_master.loaded_from})")
+            return listings.names_by_symbol()
+        
         # Load from cached file if exists
         cache_file = Path(__file__).parent / "nse_stocks.json"
         
         if cache_file.exists():
             with open(cache_file, 'r') as f:
-                self.stocks = json.load(f)
-                print(f"✅ Loaded {len(self.stocks)} Indian stocks from cache")
-                return
+                stocks = json.load(f)
+                print(f"✅ Loaded {len(stocks)} Indian stocks from cache")
+                return stocks
         
         # Otherwise load comprehensive list
-        self.stocks = self._get_comprehensive_stock_list()
+        stocks = self._get_comprehensive_stock_list()
         
         # Save to cache
         with open(cache_file, 'w') as f:
-            json.dump(self.stocks, f, indent=2)
+            json.dump(stocks, f, indent=2)
         
-        print(f"✅ Loaded {len(self.stocks)} Indian stocks")
+        print(f"✅ Loaded {len(stocks)} Indian stocks")
+        return stocks
     
     def _get_comprehensive_stock_list(self) -> Dict[str, str]:
         """Get comprehensive list of NSE stocks"""
@@ -162,21 +296,8 @@ class StockValidator:
         return self.stocks.get(ticker.upper())
     
     def search_stocks(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
-        """Search stocks by ticker or company name"""
-        query = query.upper()
-        results = []
-        
-        for ticker, name in self.stocks.items():
-            if query in ticker or query in name.upper():
-                results.append({
-                    "ticker": ticker,
-                    "company_name": name
-                })
-                
-                if len(results) >= limit:
-                    break
-        
-        return results
+        """Ranked search by ticker or company name, served from the prebuilt index"""
+        return stock_search.search(query, limit)
     
     def get_all_stocks(self) -> List[Dict[str, str]]:
         """Get all stocks"""
@@ -185,29 +306,27 @@ class StockValidator:
             for ticker, name in self.stocks.items()
         ]
 
+    def get_index_constituents(self, index: str) -> Optional[List[str]]:
+        """Get tickers for a known index preset (e.g. NIFTY50)"""
+        return INDEX_CONSTITUENTS.get(index.upper().replace(" ", ""))
+
+    def get_listing(self, ticker: str) -> Optional[Dict[str, str]]:
+        """ISIN, series, exchange and sector from the symbol master, if loaded"""
+        listing = symbol_master.get(ticker)
+        if listing is not None:
+            listing['sector'] = self.get_sector(ticker)
+        return listing
+    
     def get_sector(self, ticker: str) -> str:
-        """Get sector for a stock (Simple Keyword Matching for Demo)"""
-        name = self.stocks.get(ticker.upper(), "").upper()
-        if not name:
-            return "General"
-            
-        sectors = {
-            "BANK": "Banking", "FINANCE": "Finance", "INVEST": "Finance",
-            "TATA": "Conglomerate", "ADANI": "Conglomerate", "RELIANCE": "Energy",
-            "POWER": "Energy", "ENERGY": "Energy", "GAS": "Energy", "OIL": "Energy",
-            "TECH": "Technology", "INFOSYS": "Technology", "WIPRO": "Technology", "HCL": "Technology",
-            "PHARMA": "Healthcare", "LAB": "Healthcare", "HOSPITAL": "Healthcare", "DR": "Healthcare",
-            "AUTO": "Automobile", "MOTORS": "Automobile", "MRF": "Automobile",
-            "CEMENT": "Cement", "STEEL": "Metals", "ALUMINIUM": "Metals", "ZINC": "Metals", "COPPER": "Metals",
-            "HOTEL": "Hospitality", "RESORT": "Hospitality",
-            "FOOD": "FMCG", "CONSUMER": "FMCG", "TEA": "FMCG", "COFFEE": "FMCG", "SUGAR": "FMCG"
-        }
-        
-        for keyword, sector in sectors.items():
-            if keyword in name or keyword in ticker.upper():
-                return sector
-                
-        return "General Market"
+        """Get sector for a stock from the precomputed map"""
+        return self.sectors.get(ticker.upper(), "General")
+    
+    def get_sector_members(self) -> Dict[str, List[str]]:
+        """Sector -> tickers, in listing order"""
+        members: Dict[str, List[str]] = {}
+        for ticker, sector in self.sectors.items():
+            members.setdefault(sector, []).append(ticker)
+        return members
 
 # Singleton instance
 stock_validator = StockValidator()
@@ -0,0 +1,286 @@
+"""
+Symbol Master
+Every NSE and BSE equity listing (symbol, name, ISIN, series, sector), loaded from the
+exchanges' equity list CSVs dropped into the listings directory.
+Held as column arrays with small repeated values (series, sector, exchange) stored as
+codes; a binary cache keyed on the source files skips CSV parsing at startup.
+"""
+
+from array import array
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import csv
+import os
+import pickle
+
+# NSE "Securities available for equity segment" (EQUITY_L.csv) and BSE "List of Scrips" (Equity.csv)
+NSE_FILE = "EQUITY_L.csv"
+BSE_FILE = "Equity.csv"
+CACHE_FILE = "symbol_master.cache"
+CACHE_FORMAT = 1
+
+# Header spellings seen across exchange file versions, matched case-insensitively
+NSE_COLUMNS = {"symbol": ("SYMBOL",), "name": ("NAME OF COMPANY",), "series": ("SERIES",), "isin": ("ISIN NUMBER", "ISIN")}
+BSE_COLUMNS = {
+    "code": ("SECURITY CODE",), "symbol": ("SECURITY ID",), "name": ("ISSUER NAME", "SECURITY NAME"),
+    "status": ("STATUS",), "group": ("GROUP",), "isin": ("ISIN NO", "ISIN"),
+    "sector": ("SECTOR NAME", "INDUSTRY NEW NAME", "INDUSTRY"), "instrument": ("INSTRUMENT",)
+}
+
+Fingerprint = Tuple[Tuple[str, int, int], ...]
+
+class Categorical:
+    """Column of repeated strings stored as 16-bit codes into a value list"""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes = array('H')
+        self._lookup: Dict[str, int] = {}
+
+    def append(self, value: str):
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, row: int) -> str:
+        return self.values[self.codes[row]]
+
+    def __getstate__(self):
+        return self.values, self.codes
+
+    def __setstate__(self, state):
+        self.values, self.codes = state
+        self._lookup = {value: code for code, value in enumerate(self.values)}
+
+class SymbolTable:
+    """One immutable build of the listing universe, one list or code array per column"""
+
+    def __init__(self):
+        self.symbols: List[str] = []
+        self.names: List[str] = []
+        self.isins: List[str] = []
+        self.bse_codes: List[str] = []
+        self.series = Categorical()
+        self.sectors = Categorical()
+        self.exchanges = Categorical()
+        self.index: Dict[str, int] = {}
+        self.fingerprint: Fingerprint = ()
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def add(self, symbol: str, name: str, isin: str, series: str, sector: str, exchange: str, bse_code: str = ""):
+        self.index[symbol] = len(self.symbols)
+        self.symbols.append(symbol)
+        self.names.append(name)
+        self.isins.append(isin)
+        self.bse_codes.append(bse_code)
+        self.series.append(series)
+        self.sectors.append(sector)
+        self.exchanges.append(exchange)
+
+    def get(self, symbol: str) -> Optional[Dict[str, str]]:
+        row = self.index.get(symbol.upper())
+        if row is None:
+            return None
+        return {
+            "ticker": self.symbols[row],
+            "company_name": self.names[row],
+            "isin": self.isins[row],
+            "series": self.series[row],
+            "sector": self.sectors[row],
+            "exchange": self.exchanges[row],
+            "bse_code": self.bse_codes[row]
+        }
+
+    def names_by_symbol(self) -> Dict[str, str]:
+        return dict(zip(self.symbols, self.names))
+
+    def sector_of(self, symbol: str) -> str:
+        """Exchange-published sector, or "" when the listing files don't give one"""
+        row = self.index.get(symbol)
+        return self.sectors[row] if row is not None else ""
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['index']  # derived from symbols, rebuilt on load
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.index = {symbol: row for row, symbol in enumerate(self.symbols)}
+
+def read_rows(path: Path, columns: Dict[str, Tuple[str, ...]]) -> List[Dict[str, str]]:
+    """CSV rows with their fields renamed to our column names"""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = [h.strip().upper() for h in next(reader, [])]
+        positions = {}
+        for column, spellings in columns.items():
+            for spelling in spellings:
+                if spelling in header:
+                    positions[column] = header.index(spelling)
+                    break
+        rows = []
+        for record in reader:
+            rows.append({
+                column: record[i].strip() if i < len(record) else ""
+                for column, i in positions.items()
+            })
+        return rows
+
+def build_table(nse_path: Optional[Path], bse_path: Optional[Path]) -> SymbolTable:
+    """
+    NSE listings first (their symbols are the app's tickers), then BSE-only scrips under
+    their BSE security id. The two are joined on ISIN; BSE supplies the sector.
+    """
+    table = SymbolTable()
+    bse_by_isin: Dict[str, Dict[str, str]] = {}
+    bse_rows: List[Dict[str, str]] = []
+    if bse_path is not None:
+        for row in read_rows(bse_path, BSE_COLUMNS):
+            if row.get('status', 'Active').lower() != 'active' or row.get('instrument', 'Equity').lower() != 'equity':
+                continue
+            bse_rows.append(row)
+            if row.get('isin'):
+                bse_by_isin[row['isin']] = row
+
+    if nse_path is not None:
+        for row in read_rows(nse_path, NSE_COLUMNS):
+            symbol = row.get('symbol', '').upper()
+            if not symbol or symbol in table.index:
+                continue
+            bse = bse_by_isin.get(row.get('isin', ''), {})
+            table.add(symbol, row.get('name', ''), row.get('isin', ''), row.get('series', ''),
+                      bse.get('sector', ''), "NSE+BSE" if bse else "NSE", bse.get('code', ''))
+
+    listed_isins = set(table.isins)
+    for row in bse_rows:
+        symbol = row.get('symbol', '').upper()
+        # A BSE id already taken by an NSE symbol for another company is skipped
+        if not symbol or symbol in table.index or (row.get('isin') and row['isin'] in listed_isins):
+            continue
+        table.add(symbol, row.get('name', ''), row.get('isin', ''), row.get('group', ''),
+                  row.get('sector', ''), "BSE", row.get('code', ''))
+    return table
+
+class SymbolMasterService:
+    def __init__(self, directory: Optional[Path] = None):
+        default_dir = Path(__file__).parent.parent / "data" / "listings"
+        self.directory = Path(directory or os.getenv("SYMBOL_MASTER_DIR", default_dir))
+        self.poll_interval = float(os.getenv("SYMBOL_MASTER_POLL", 60))
+        self.table: Optional[SymbolTable] = None
+        self.loaded_from: Optional[str] = None
+        # Fingerprint of the files last built from, so missing files aren't retried every poll
+        self.seen: Fingerprint = ()
+        self._task: Optional[asyncio.Task] = None
+
+    def sources(self) -> Tuple[Optional[Path], Optional[Path]]:
+        nse, bse = self.directory / NSE_FILE, self.directory / BSE_FILE
+        return (nse if nse.exists() else None), (bse if bse.exists() else None)
+
+    def fingerprint(self) -> Fingerprint:
+        """(file, size, mtime) of each source file present; changes when a file is replaced"""
+        parts = []
+        for path in self.sources():
+            if path is not None:
+                stat = path.stat()
+                parts.append((path.name, stat.st_size, stat.st_mtime_ns))
+        return tuple(parts)
+
+    def changed(self) -> bool:
+        return self.fingerprint() != self.seen
+
+    # ---- Loading ----
+
+    def _read_cache(self, fingerprint: Fingerprint) -> Optional[SymbolTable]:
+        try:
+            with open(self.directory / CACHE_FILE, 'rb') as f:
+                fmt, cached_fingerprint, table = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable symbol master cache: {e}")
+            return None
+        if fmt != CACHE_FORMAT or cached_fingerprint != fingerprint:
+            return None
+        return table
+
+    def _write_cache(self, table: SymbolTable):
+        path = self.directory / CACHE_FILE
+        tmp = path.with_suffix(".tmp")
+        try:
+            with open(tmp, 'wb') as f:
+                pickle.dump((CACHE_FORMAT, table.fingerprint, table), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"⚠️ Could not write symbol master cache: {e}")
+
+    def build(self) -> Optional[SymbolTable]:
+        """
+        Table for the current listing files (binary cache if it matches them), or None
+        when no listing files are present. Does not publish it.
+        """
+        fingerprint = self.seen = self.fingerprint()
+        if not fingerprint:
+            return None
+        table = self._read_cache(fingerprint)
+        if table is not None:
+            self.loaded_from = "cache"
+            return table
+
+        table = build_table(*self.sources())
+        table.fingerprint = fingerprint
+        self._write_cache(table)
+        self.loaded_from = "csv"
+        return table
+
+    def publish(self, table: SymbolTable):
+        self.table = table
+
+    def get(self, symbol: str) -> Optional[Dict[str, str]]:
+        table = self.table
+        return table.get(symbol) if table is not None else None
+
+    def status(self) -> Dict:
+        table = self.table
+        return {
+            "directory": str(self.directory),
+            "symbols": len(table) if table is not None else 0,
+            "exchanges": {
+                exchange: table.exchanges.codes.count(code)
+                for code, exchange in enumerate(table.exchanges.values)
+            } if table is not None else {},
+            "loaded_from": self.loaded_from,
+            "sources": [name for name, _, _ in table.fingerprint] if table is not None else [],
+            "poll_interval_seconds": self.poll_interval
+        }
+
+    # ---- Watcher ----
+
+    async def run_forever(self, reload: Callable[[], Awaitable[Dict]]):
+        """Poll the listing files and reload when one is added, replaced or removed"""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                if self.changed():
+                    await reload()
+            except Exception as e:
+                print(f"❌ Symbol master reload failed: {e}")
+
+    def start(self, reload: Callable[[], Awaitable[Dict]]):
+        """Schedule the watcher on the running loop (interval <= 0 disables it)"""
+        if self.poll_interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self.run_forever(reload))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+# Singleton instance
+symbol_master = SymbolMasterService()
@@ -0,0 +1,171 @@
+"""
+Stock Universe Payload
+/api/stocks bodies serialized and compressed (gzip, brotli when installed) once per
+universe version and served straight from bytes, with a strong ETag per encoding.
+Row lists are built once per projection and pages are sliced from them.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+from services.singleflight import SingleFlight
+from services.stock_validator import stock_validator
+from services.symbol_master import symbol_master
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import threading
+
+try:
+    import brotli
+except ImportError:  # optional: gzip and identity are always available
+    brotli = None
+
+DEFAULT_FIELDS = ("ticker", "company_name")
+# Listing details only exist when the symbol master is loaded; empty strings otherwise
+LISTING_FIELDS = ("isin", "series", "exchange", "bse_code")
+ALLOWED_FIELDS = DEFAULT_FIELDS + ("sector",) + LISTING_FIELDS
+# Browsers revalidate with the ETag; 0 means every use revalidates, so hot reloads show at once
+MAX_AGE = int(os.getenv("STOCKS_CACHE_MAX_AGE", 0))
+# Maximum compression for the default full listing, which nearly every client fetches;
+# cheaper levels for other projections and pages, which are built on demand
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+VARIANT_GZIP_LEVEL = 6
+VARIANT_BROTLI_QUALITY = 5
+DEFAULT_VARIANT = (DEFAULT_FIELDS, 0, None)
+
+def cache_control() -> str:
+    return f"public, max-age={MAX_AGE}" if MAX_AGE > 0 else "public, no-cache"
+
+def supported_encodings() -> List[str]:
+    return (["br"] if brotli is not None else []) + ["gzip", "identity"]
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> str:
+    """Best encoding we hold that the client accepts (br > gzip > identity)"""
+    accepted: Dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if token:
+            accepted[token.strip().lower()] = q
+    for encoding in supported_encodings()[:-1]:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return "identity"
+
+class EncodedBody:
+    """One serialized body in every supported encoding, each with its own strong ETag"""
+
+    def __init__(self, payload: Dict, gzip_level: int = GZIP_LEVEL, brotli_quality: int = BROTLI_QUALITY):
+        identity = json.dumps(payload, separators=(",", ":")).encode()
+        digest = hashlib.sha256(identity).hexdigest()[:32]
+        self.bodies: Dict[str, bytes] = {"identity": identity, "gzip": gzip.compress(identity, gzip_level, mtime=0)}
+        if brotli is not None:
+            self.bodies["br"] = brotli.compress(identity, quality=brotli_quality)
+        # Representations differ in bytes, so strong ETags differ per encoding
+        self.etags = {
+            encoding: f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"'
+            for encoding in self.bodies
+        }
+
+    def sizes(self) -> Dict[str, int]:
+        return {encoding: len(body) for encoding, body in self.bodies.items()}
+
+class UniversePayloadCache:
+    def __init__(self, max_variants: int = 64):
+        self.max_variants = max_variants
+        self.version: Optional[int] = None
+        self._variants: "OrderedDict[Hashable, EncodedBody]" = OrderedDict()
+        # fields -> every row of the current universe for that projection
+        self._rows_by_fields: Dict[Tuple[str, ...], List[Dict]] = {}
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.builds = 0
+
+    def _rows(self, stocks: Dict[str, str], sectors: Dict[str, str], fields: Tuple[str, ...]) -> List[Dict]:
+        if fields == DEFAULT_FIELDS:
+            return [{"ticker": ticker, "company_name": name} for ticker, name in stocks.items()]
+        with_listing = any(field in LISTING_FIELDS for field in fields)
+        rows = []
+        for ticker, name in stocks.items():
+            row = {"ticker": ticker, "company_name": name, "sector": sectors.get(ticker, "General")}
+            if with_listing:
+                listing = symbol_master.get(ticker) or {}
+                row.update({field: listing.get(field, "") for field in LISTING_FIELDS})
+            rows.append({field: row[field] for field in fields})
+        return rows
+
+    def _projection(self, version: int, universe: Tuple[Dict[str, str], Dict[str, str]],
+                    fields: Tuple[str, ...]) -> List[Dict]:
+        """All rows for a projection, built once per universe version and shared by its pages"""
+        with self._lock:
+            rows = self._rows_by_fields.get(fields) if self.version == version else None
+        if rows is None:
+            rows = self._rows(*universe, fields)
+            with self._lock:
+                if self.version == version:
+                    self._rows_by_fields[fields] = rows
+        return rows
+
+    def _build(self, version: int, universe: Tuple[Dict[str, str], Dict[str, str]],
+               fields: Tuple[str, ...], offset: int, limit: Optional[int]) -> EncodedBody:
+        rows = self._projection(version, universe, fields)
+        page = rows[offset:offset + limit] if limit is not None else rows[offset:]
+        payload = {"stocks": page, "count": len(page), "total": len(rows), "version": version}
+        if offset or limit is not None:
+            payload.update({"offset": offset, "limit": limit})
+        self.builds += 1
+        if (fields, offset, limit) == DEFAULT_VARIANT:
+            return EncodedBody(payload)
+        return EncodedBody(payload, VARIANT_GZIP_LEVEL, VARIANT_BROTLI_QUALITY)
+
+    async def get(self, fields: Tuple[str, ...] = DEFAULT_FIELDS, offset: int = 0, limit: Optional[int] = None) -> EncodedBody:
+        """
+        Encoded body for this projection/page of the current universe.
+        Built once per universe version (off the event loop), then served from memory.
+        Pages must start on a multiple of the page size.
+        """
+        if offset and (limit is None or offset % limit):
+            raise ValueError(f"offset must be a multiple of limit (got offset={offset}, limit={limit})")
+        # Read together on the loop: install() swaps these with no await in between
+        version = stock_validator.version
+        universe = (stock_validator.stocks, stock_validator.sectors)
+        key = (fields, offset, limit)
+        with self._lock:
+            if self.version != version:
+                self._variants.clear()
+                self._rows_by_fields.clear()
+                self.version = version
+            body = self._variants.get(key)
+            if body is not None:
+                self._variants.move_to_end(key)
+                return body
+
+        body = await self._flight.do((version,) + key, lambda: asyncio.to_thread(self._build, version, universe, fields, offset, limit))
+        with self._lock:
+            if self.version == version:
+                self._variants[key] = body
+                while len(self._variants) > self.max_variants:
+                    self._variants.popitem(last=False)
+        return body
+
+    def stats(self) -> Dict:
+        with self._lock:
+            full = self._variants.get(DEFAULT_VARIANT)
+            return {
+                "version": self.version,
+                "variants": len(self._variants),
+                "builds": self.builds,
+                "encodings": supported_encodings(),
+                "full_listing_bytes": full.sizes() if full is not None else None
+            }
+
+# Singleton instance
+universe_payload = UniversePayloadCache()
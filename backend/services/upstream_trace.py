@@ -0,0 +1,59 @@
+"""
+Upstream Call Tracing
+Per-request counters of calls to external data providers, plus a request-scoped memo
+"""
+
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Optional
+import threading
+
+class UpstreamTrace:
+    def __init__(self):
+        self.calls: Counter = Counter()
+        self.memo: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+        # One lock per memo key, so pool threads computing the same key wait for the first
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+
+    def record(self, provider: str):
+        with self._lock:
+            self.calls[provider] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        return {"total": sum(self.calls.values()), "calls": dict(self.calls)}
+
+_current_trace: ContextVar[Optional[UpstreamTrace]] = ContextVar("upstream_trace", default=None)
+
+def begin_trace() -> UpstreamTrace:
+    """Start tracing for the current request (task and any threads it spawns)"""
+    trace = UpstreamTrace()
+    _current_trace.set(trace)
+    return trace
+
+def current_trace() -> Optional[UpstreamTrace]:
+    return _current_trace.get()
+
+def record_upstream(provider: str):
+    """Count one call to an external provider against the active request, if any"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.record(provider)
+
+def memoize(key: Hashable, fn: Callable[[], Any]) -> Any:
+    """Compute `fn()` at most once per traced request; untraced calls always compute"""
+    trace = _current_trace.get()
+    if trace is None:
+        return fn()
+    with trace._lock:
+        if key in trace.memo:
+            return trace.memo[key]
+        key_lock = trace._key_locks.setdefault(key, threading.Lock())
+    with key_lock:
+        with trace._lock:
+            if key in trace.memo:
+                return trace.memo[key]
+        value = fn()
+        with trace._lock:
+            trace.memo[key] = value
+        return value
@@ -0,0 +1,87 @@
+"""
+Backtest panel alignment: tickers with different gaps land on one shared date grid.
+Run from backend/: python -m unittest discover tests
+"""
+
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from services.backtest import backtest_engine, lookback_days
+from services.sentiment_rollups import SentimentRollupService, sentiment_rollups
+from services.stock_data_service import stock_data_service
+
+def window(days, closes):
+    return {"date": np.array(days, dtype='datetime64[D]'), "close": np.array(closes, dtype=float)}
+
+HISTORY = {
+    # Full week
+    "AAA": window(["2026-10-05", "2026-10-06", "2026-10-07", "2026-10-08", "2026-10-09"], [10, 11, 12, 13, 14]),
+    # No bar on Tuesday
+    "BBB": window(["2026-10-05", "2026-10-07", "2026-10-08", "2026-10-09"], [20, 22, 23, 24]),
+    # Listed from Wednesday, no bar on Thursday
+    "CCC": window(["2026-10-07", "2026-10-09"], [32, 34]),
+}
+
+TRENDS = {
+    "AAA": [{"date": "2026-10-06", "mean": 0.5}],
+    "BBB": [{"date": "2026-10-08", "mean": -0.2}],
+    "CCC": [{"date": "2026-10-09", "mean": 0.1}],
+}
+
+class LoadPanelTest(unittest.TestCase):
+    def load(self):
+        requested = []
+
+        async def trend(ticker, days=30):
+            requested.append(days)
+            return TRENDS[ticker]
+
+        with patch.object(stock_data_service, "get_history_arrays_many", lambda tickers, period: HISTORY), \
+                patch.object(sentiment_rollups, "trend", trend):
+            panel = asyncio.run(backtest_engine.load_panel(list(HISTORY)))
+        return panel, requested
+
+    def test_prices_sit_on_their_own_dates(self):
+        panel, _ = self.load()
+        self.assertEqual([str(d) for d in panel['dates']],
+                         ["2026-10-05", "2026-10-06", "2026-10-07", "2026-10-08", "2026-10-09"])
+        nan = np.nan
+        np.testing.assert_array_equal(panel['close'], np.array([
+            [10, 11, 12, 13, 14],
+            [20, nan, 22, 23, 24],
+            [nan, nan, 32, nan, 34],
+        ]))
+
+    def test_sentiment_shares_the_grid(self):
+        panel, _ = self.load()
+        sentiment = panel['sentiment']
+        self.assertEqual(sentiment[0, 1], 0.5)
+        self.assertEqual(sentiment[1, 3], -0.2)
+        self.assertEqual(sentiment[2, 4], 0.1)
+        self.assertEqual(int(np.isfinite(sentiment).sum()), 3)
+
+    def test_lookback_reaches_first_session(self):
+        panel, requested = self.load()
+        self.assertEqual(set(requested), {lookback_days(panel['dates'][0])})
+        self.assertEqual(lookback_days(np.datetime64("2026-10-05")), lookback_days(np.datetime64("2026-10-06")) + 1)
+
+class PostCloseNewsTest(unittest.TestCase):
+    def test_post_close_article_trades_next_session(self):
+        history = {"AAA": window(["2026-10-08", "2026-10-09", "2026-10-12"], [10, 11, 12])}
+        rollups = SentimentRollupService()
+        article = {'title': "Results after the bell", 'published_at': "2026-10-09T16:05:00+05:30",
+                   'sentiment': 'positive', 'sentiment_score': 0.9, 'confidence': 0.9}
+        with patch("services.sentiment_rollups.get_database", return_value=None), \
+                patch.object(stock_data_service, "get_history_arrays_many", lambda tickers, period: history), \
+                patch.object(sentiment_rollups, "trend", rollups.trend):
+            asyncio.run(rollups.record("AAA", [article]))
+            panel = asyncio.run(backtest_engine.load_panel(["AAA"]))
+        # Friday 16:05 IST is after the close: it belongs to Monday's session, not Friday's
+        self.assertTrue(np.isnan(panel['sentiment'][0, 1]))
+        self.assertEqual(panel['sentiment'][0, 2], 0.9)
+
+if __name__ == "__main__":
+    unittest.main()
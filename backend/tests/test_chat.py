@@ -0,0 +1,25 @@
+"""
+Chat intents: methodology questions are recognised however "how" is punctuated.
+Run from backend/: python -m unittest discover tests
+"""
+
+import asyncio
+import unittest
+
+from routers.chat import explain_methodology, generate_chat_response
+
+class MethodologyIntentTest(unittest.TestCase):
+    def reply(self, message):
+        return asyncio.run(generate_chat_response(message, {}))
+
+    def test_punctuated_how_asks_for_methodology(self):
+        generic = explain_methodology(None, None)
+        for message in ("how?", "How's the score worked out", "How, exactly, is this scored", "how is it done"):
+            with self.subTest(message=message):
+                self.assertEqual(self.reply(message), generic)
+
+    def test_how_inside_a_word_does_not(self):
+        self.assertNotEqual(self.reply("show me something"), explain_methodology(None, None))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+Indicator engine: a period's window rolling forward a session is stepped, not recomputed.
+Run from backend/: python -m unittest discover tests
+"""
+
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from services import indicators
+from services.indicators import IndicatorEngine
+
+def synthetic_window(sessions: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.01, sessions))
+    return {
+        "date": np.arange(np.datetime64("2025-01-01"), np.datetime64("2025-01-01") + sessions).astype('datetime64[D]'),
+        "open": close * 0.999, "high": close * 1.01, "low": close * 0.99, "close": close,
+        "volume": rng.uniform(1e5, 1e6, sessions)
+    }
+
+class RollingWindowTest(unittest.TestCase):
+    def test_next_day_steps_the_existing_state(self):
+        full = synthetic_window(301)
+        today = {k: v[:-1] for k, v in full.items()}
+        # Clock advanced one day: the 1y window drops its first bar and gains a new one
+        tomorrow = {k: v[1:] for k, v in full.items()}
+
+        engine = IndicatorEngine()
+        engine.latest_many({"AAA": today}, "1y")
+        with patch.object(indicators, "_compute", wraps=indicators._compute) as compute:
+            latest = engine.latest_many({"AAA": tomorrow}, "1y")["AAA"]
+        compute.assert_not_called()
+        self.assertEqual(len(engine._states), 1)
+
+        expected = engine.compute_series(tomorrow)
+        for name in ("sma_20", "sma_50", "bb_upper", "vwap_20"):
+            self.assertAlmostEqual(latest[name], float(expected[name][-1]), places=6)
+        # Seeded earlier, but long converged
+        self.assertAlmostEqual(latest["ema_26"], float(expected["ema_26"][-1]), places=4)
+
+    def test_backfilled_history_recomputes(self):
+        full = synthetic_window(300)
+        engine = IndicatorEngine()
+        engine.latest_many({"AAA": {k: v[10:] for k, v in full.items()}}, "1y")
+        with patch.object(indicators, "_compute", wraps=indicators._compute) as compute:
+            engine.latest_many({"AAA": full}, "1y")
+        compute.assert_called_once()
+
+if __name__ == "__main__":
+    unittest.main()
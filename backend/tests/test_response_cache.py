@@ -0,0 +1,39 @@
+"""
+Response cache: ETags describe the bytes served, and entries are shared, not copied.
+Run from backend/: python -m unittest discover tests
+"""
+
+import unittest
+
+from services.response_cache import ResponseCache
+
+class ETagTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache(ttl=60, etag_exclude=("timings",))
+
+    def test_excluded_fields_make_the_etag_weak(self):
+        first = self.cache.set("A", {"score": 0.4, "timings": {"news": 1.2}})
+        second = self.cache.set("A", {"score": 0.4, "timings": {"news": 0.3}})
+        self.assertTrue(first.etag.startswith('W/"'))
+        self.assertEqual(first.etag, second.etag)
+        self.assertNotEqual(first.body, second.body)
+
+    def test_etag_is_strong_when_it_covers_the_body(self):
+        entry = self.cache.set("B", {"error": "Invalid stock ticker: XYZ"})
+        self.assertTrue(entry.etag.startswith('"'))
+
+    def test_if_none_match_uses_weak_comparison(self):
+        entry = self.cache.set("A", {"score": 0.4, "timings": {}})
+        opaque = entry.etag[2:]
+        self.assertTrue(entry.matches(entry.etag))
+        self.assertTrue(entry.matches(f'"stale", {opaque}'))
+        self.assertFalse(entry.matches('W/"stale"'))
+
+class PayloadTest(unittest.TestCase):
+    def test_payload_is_not_copied_per_read(self):
+        cache = ResponseCache(ttl=60)
+        cache.set("A", {"news": [{"title": "x"}]})
+        self.assertIs(cache.get("A").payload, cache.get("A").payload)
+
+if __name__ == "__main__":
+    unittest.main()
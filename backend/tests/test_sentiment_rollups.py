@@ -0,0 +1,33 @@
+"""
+Sentiment rollups: only real, scored news is persisted.
+Run from backend/: python -m unittest discover tests
+"""
+
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from services.news_service import news_service
+from services.sentiment_rollups import SentimentRollupService
+
+def scored(article, score=0.8):
+    return {**article, 'sentiment': 'positive', 'sentiment_score': score, 'confidence': 0.9}
+
+class FallbackNewsTest(unittest.TestCase):
+    def test_fallback_news_is_never_persisted(self):
+        fallback = asyncio.run(news_service._fetch_fallback_news("Infosys", "INFY"))
+        self.assertTrue(fallback and all(a.get('synthetic') for a in fallback))
+
+        rollups = SentimentRollupService()
+        with patch("services.sentiment_rollups.get_database", return_value=None):
+            asyncio.run(rollups.record("INFY", [scored(a) for a in fallback]))
+            self.assertEqual(asyncio.run(rollups.trend("INFY", 30)), [])
+
+            real = {'title': "Infosys wins large deal", 'published_at': fallback[0]['published_at']}
+            asyncio.run(rollups.record("INFY", [scored(a) for a in fallback] + [scored(real, 0.5)]))
+            trend = asyncio.run(rollups.trend("INFY", 30))
+        self.assertEqual([row['count'] for row in trend], [1])
+        self.assertEqual(trend[0]['mean'], 0.5)
+
+if __name__ == "__main__":
+    unittest.main()